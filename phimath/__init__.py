@@ -1,14 +1,31 @@
 from .math.constants import E, PI, TWO_PI, HALF_PI, DEG_TO_RAD, RAD_TO_DEG
-from .control.numeric import is_close, has_converged, iteration_limit, is_close_relative as is_close_rel, is_zero, EPSILON, MAX_ITERATIONS as MAX_ITER, DELTA
+from .control.numeric import CallCounter, is_close, has_converged, iteration_limit, is_close_relative as is_close_rel, is_zero, EPSILON, MAX_ITERATIONS as MAX_ITER, DELTA
 from .math.trigo import normalize_angle, sin, cos, sin_deg, cos_deg, tan, tan_deg, sinh, cosh, asin, acos, atan, atan2
 from .math.exp_log import exp, ln, log
 from .math.func import sqrt, cbrt, pow, make_function
-from .linalg.vectors import vector
+from .math.dual import Dual, HyperDual
+from .linalg.vectors import vector, VectorArray
 from .linalg.matrix import matrix
+from .linalg.lu import LU
+from .linalg.qr import QR, Cholesky, lstsq, LstsqResult
+from .linalg.sparse import COO, CSR, CSC
+from .linalg.banded import Banded, BandedLU, Tridiagonal, CyclicTridiagonal
 from .linalg.solvers import solve_linear_system, gaussian_eleminator, quadratic_solver
-from .calculas.differentiate import differentiate, fdifferentiate, bdifferentiate, second_derivative, nth_derivative
+from .linalg.solvers import cg, bicgstab, gmres, KrylovResult
+from .linalg.preconditioners import Jacobi, SSOR, ILU
+from .linalg.eigen import eigh, eigvalsh, lanczos, EigenResult
+from .linalg.parallel import parallel_matmul, parallel_lu, parallel_solve
+from .linalg.rotations import Mat3, Quaternion
+from .calculas.differentiate import differentiate, fdifferentiate, bdifferentiate, complex_step, second_derivative, nth_derivative
+from .calculas.autodiff import derivative, jacobian, sparsity_pattern
 from .calculas.integrate import integrate, reimann_sum, simpsons_rule, trapezoidal_rule, boole_rule, romberg_integration
-from .calculas.ode_solvers import ode_solver, rk2, rk4, rkf45, euler
+from .calculas.ode_solvers import ode_solver, rk2, rk4, rkf45, euler, dopri5, Trajectory, DenseSolution
+from .calculas.ode_solvers import ode_stream, euler_stream, rk2_stream, rk4_stream, Event
+from .calculas.stiff import bdf, StiffSolution
+from .calculas.symplectic import symplectic
+from .calculas.ensemble import ensemble, Ensemble
+from .calculas.storage import TrajectoryFile, Checkpoint, solve_to_file
+from .roots import brent, newton, batch_roots, RootResult, newton_system, broyden
 from .control.symbols import symbols, Symbol, Expression, VectorSymbol, VectorSymbolComponents
 from .physics.constants import G, C, H_BAR, K_B, Q_E, EPSILON_0, MU_0, G_EARTH, AU, M_E, M_P, M_SOLAR
 from .physics.mechanics import Particle, RigidBody, Force, SpringForce, System, Newtonian, Lagrangian
@@ -17,7 +34,7 @@ __all__ = [
     #contants
     "E","PI","TWO_PI","HALF_PI","DEG_TO_RAD","RAD_TO_DEG",
     #numerical control
-    "is_close","has_converged","iteration_limit","is_close_rel","is_zero","EPSILON","MAX_ITER","DELTA",
+    "is_close","has_converged","iteration_limit","is_close_rel","is_zero","EPSILON","MAX_ITER","DELTA","CallCounter",
     #symobols and expressions
     "Symbol","symbols","Expression","VectorSymbol","VectorSymbolComponents",
     #core-trigonometric functions
@@ -30,14 +47,24 @@ __all__ = [
     "exp","ln","log",
     #other math functions
     "sqrt","cbrt","pow", "make_function",
+    #automatic differentiation
+    "Dual", "HyperDual", "derivative", "jacobian", "sparsity_pattern",
     #linear algebra
-    "vector","matrix", "solve_linear_system", "gaussian_eleminator", "quadratic_solver",
+    "vector", "VectorArray", "matrix", "LU", "QR", "Cholesky", "lstsq", "LstsqResult", "COO", "CSR", "CSC", "Banded", "BandedLU", "Tridiagonal", "CyclicTridiagonal",
+    "solve_linear_system", "gaussian_eleminator", "quadratic_solver",
+    "cg", "bicgstab", "gmres", "KrylovResult", "Jacobi", "SSOR", "ILU",
+    "eigh", "eigvalsh", "lanczos", "EigenResult",
+    "parallel_matmul", "parallel_lu", "parallel_solve", "Mat3", "Quaternion",
     #differentiation
-    "differentiate", "fdifferentiate", "bdifferentiate", "second_derivative", "nth_derivative",
+    "differentiate", "fdifferentiate", "bdifferentiate", "complex_step", "second_derivative", "nth_derivative",
     #integration
     "integrate", "reimann_sum", "simpsons_rule", "trapezoidal_rule", "boole_rule", "romberg_integration",
     #ODE solvers
-    "ode_solver", "rk2", "rk4", "rkf45", "euler",
+    "ode_solver", "rk2", "rk4", "rkf45", "euler", "dopri5", "Trajectory", "DenseSolution",
+    "ode_stream", "euler_stream", "rk2_stream", "rk4_stream", "Event", "bdf", "StiffSolution", "symplectic",
+    "ensemble", "Ensemble", "TrajectoryFile", "Checkpoint", "solve_to_file",
+    #root finding
+    "brent", "newton", "batch_roots", "RootResult", "newton_system", "broyden",
     #physical constants
     "G", "C", "H_BAR", "K_B", "Q_E", "EPSILON_0", "MU_0", "G_EARTH", "AU", "M_E", "M_P", "M_SOLAR",
     #mechanics
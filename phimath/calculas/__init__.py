@@ -1,11 +1,28 @@
-from .differentiate import differentiate, fdifferentiate, bdifferentiate, second_derivative, nth_derivative
+from .differentiate import differentiate, fdifferentiate, bdifferentiate, complex_step, second_derivative, nth_derivative
 from .integrate import integrate, simpsons_rule, trapezoidal_rule , boole_rule, romberg_integration, reimann_sum
-from .ode_solvers import ode_solver, rk2, rk4, rkf45, euler
+from .autodiff import derivative, jacobian, sparsity_pattern
+from .ode_solvers import ode_solver, rk2, rk4, rkf45, euler, dopri5, Trajectory, DenseSolution
+from .ode_solvers import ode_stream, euler_stream, rk2_stream, rk4_stream, Event
+from .stiff import bdf, StiffSolution
+from .symplectic import symplectic
+from .ensemble import ensemble, Ensemble
+from .storage import TrajectoryFile, Checkpoint, solve_to_file
 __all__ = [
     #differentiation
-    'differentiate', 'fdifferentiate', 'bdifferentiate', 'second_derivative', 'nth_derivative',
+    'differentiate', 'fdifferentiate', 'bdifferentiate', 'complex_step', 'second_derivative', 'nth_derivative',
+    #automatic differentiation
+    'derivative', 'jacobian', 'sparsity_pattern',
     #integration
     'integrate', 'reimann_sum', 'simpsons_rule', 'trapezoidal_rule', 'boole_rule', 'romberg_integration',
     #ODE solvers
-    'ode_solver', 'rk2', 'rk4', 'rkf45', 'euler'
+    'ode_solver', 'rk2', 'rk4', 'rkf45', 'euler', 'dopri5', 'Trajectory', 'DenseSolution',
+    'ode_stream', 'euler_stream', 'rk2_stream', 'rk4_stream', 'Event',
+    #stiff ODE solvers
+    'bdf', 'StiffSolution',
+    #symplectic integrators
+    'symplectic',
+    #ensemble integration
+    'ensemble', 'Ensemble',
+    #trajectory storage and checkpoints
+    'TrajectoryFile', 'Checkpoint', 'solve_to_file'
 ]
\ No newline at end of file
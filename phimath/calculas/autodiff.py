@@ -0,0 +1,191 @@
+import random
+from phimath.math.dual import Dual, HyperDual
+from phimath.linalg.matrix import matrix
+from phimath.linalg.sparse import COO
+from phimath.linalg.vectors import vector
+
+def _components(value):
+    """Returns the components of a vector-valued result as a list."""
+    if isinstance(value, vector):
+        return [value.x, value.y, value.z]
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if hasattr(value, '__len__') and hasattr(value, '__getitem__'):
+        return [value[i] for i in range(len(value))]
+    return [value]
+
+def derivative(f: callable, x: float, order: int = 1) -> float:
+    """
+    Exact derivative of f at x using forward-mode automatic differentiation.
+    f must be built from arithmetic and phimath.math functions.
+
+    f: function to differentiate
+    x: point at which to differentiate
+    order: 1 (dual numbers) or 2 (hyper-dual numbers)
+    """
+    if order == 1:
+        y = f(Dual(x, 1.0))
+        return y.eps[0] if isinstance(y, Dual) else 0.0
+    if order == 2:
+        y = f(HyperDual(x, 1.0, 1.0, 0.0))
+        return y.e12 if isinstance(y, HyperDual) else 0.0
+    raise ValueError("derivative supports order 1 or 2 only.")
+
+def jacobian(F: callable, x, sparsity=None, method: str = 'dual', h: float = 1e-7):
+    """
+    Jacobian of F at x.
+
+    Without sparsity the Jacobian is exact and dense, computed in a single
+    evaluation by seeding one dual direction per input component.
+    With a sparsity pattern, structurally orthogonal columns (no shared row)
+    are grouped by a greedy coloring and differentiated together, so the cost
+    depends on the number of colors instead of the number of inputs.
+
+    F: function taking a sequence (list, array or vector) and returning a sequence or vector
+    x: point at which to differentiate
+    sparsity: None, or a sequence where sparsity[i] lists the columns j with dF_i/dx_j != 0
+        (build it once with sparsity_pattern(F, x) and reuse it across calls)
+    method: 'dual' (exact, one evaluation), 'forward' (colors + 1 evaluations) or 'central' (2 * colors)
+    h: relative finite-difference step for the 'forward' and 'central' methods
+    Returns: matrix, or a CSR matrix storing every pattern entry when sparsity is given
+    """
+    xs = _components(x)
+    n = len(xs)
+    if sparsity is None:
+        return matrix(_dual_jacobian_rows(F, x, xs, n))
+
+    if isinstance(sparsity, str):
+        raise ValueError("sparsity must be a pattern; detect one once with sparsity_pattern(F, x) and reuse it.")
+    pattern = [sorted(set(cols)) for cols in sparsity]
+    colors, n_colors = _color_columns(pattern, n)
+
+    if method == 'dual':
+        seeds = []
+        for j in range(n):
+            eps = [0.0] * n_colors
+            eps[colors[j]] = 1.0
+            seeds.append(Dual(xs[j], eps))
+        if isinstance(x, vector):
+            seeds = vector(*seeds)
+        out = _components(F(seeds))
+        result = {}
+        for i, cols in enumerate(pattern):
+            yi = out[i]
+            for j in cols:
+                result[(i, j)] = yi.eps[colors[j]] if isinstance(yi, Dual) else 0.0
+        return COO.from_dict(result, (len(pattern), n)).tocsr()
+
+    if method not in ('forward', 'central'):
+        raise ValueError(f"Unknown method: {method}")
+
+    steps = [h * max(1.0, abs(v)) for v in xs]
+    f0 = _components(F(_rebuild(x, xs))) if method == 'forward' else None
+    groups = [[] for _ in range(n_colors)]
+    for j in range(n):
+        groups[colors[j]].append(j)
+
+    result = {}
+    column_of = [dict() for _ in pattern]
+    for i, cols in enumerate(pattern):
+        for j in cols:
+            column_of[i][colors[j]] = j
+
+    for c, group in enumerate(groups):
+        xp = list(xs)
+        for j in group:
+            xp[j] += steps[j]
+        fp = _components(F(_rebuild(x, xp)))
+        if method == 'central':
+            xm = list(xs)
+            for j in group:
+                xm[j] -= steps[j]
+            fm = _components(F(_rebuild(x, xm)))
+        for i in range(len(pattern)):
+            j = column_of[i].get(c)
+            if j is None:
+                continue
+            if method == 'central':
+                result[(i, j)] = (fp[i] - fm[i]) / (2 * steps[j])
+            else:
+                result[(i, j)] = (fp[i] - f0[i]) / steps[j]
+    return COO.from_dict(result, (len(pattern), n)).tocsr()
+
+def sparsity_pattern(F: callable, x, probes: int = 2, seed: int = 0) -> list:
+    """
+    Detects the sparsity pattern of the Jacobian of F near x, for reuse in
+    every later jacobian(F, ..., sparsity=pattern) call.
+
+    Each probe is one dense dual evaluation (the cost of sparsity=None), so
+    detect once and reuse the pattern. Besides x itself, F is evaluated at
+    `probes` randomly perturbed points and the nonzeros are merged, so
+    entries that merely happen to vanish at x (dF_i/dx_j = x_k with
+    x_k = 0, say) are still kept. Perturbations are up to 10% of
+    1 + |x_j|; F must be defined there.
+
+    F: function taking a sequence (list, array or vector) and returning a sequence or vector
+    x: point around which to probe
+    probes: number of perturbed points in addition to x
+    seed: seed for the perturbations, so the pattern is reproducible
+    Returns: list where pattern[i] lists the columns j with dF_i/dx_j != 0
+    """
+    xs = _components(x)
+    n = len(xs)
+    rng = random.Random(seed)
+    points = [xs] + [[v + 0.1 * rng.uniform(-1.0, 1.0) * (1.0 + abs(v)) for v in xs] for _ in range(probes)]
+    pattern = None
+    for p in points:
+        rows = _dual_jacobian_rows(F, x, p, n)
+        if pattern is None:
+            pattern = [set() for _ in rows]
+        for cols, row in zip(pattern, rows):
+            cols.update(j for j in range(n) if row[j] != 0.0)
+    return [sorted(cols) for cols in pattern]
+
+def _dual_jacobian_rows(F, x, xs, n):
+    seeds = []
+    for j in range(n):
+        eps = [0.0] * n
+        eps[j] = 1.0
+        seeds.append(Dual(xs[j], eps))
+    if isinstance(x, vector):
+        seeds = vector(*seeds)
+
+    out = _components(F(seeds))
+    rows = []
+    for yi in out:
+        rows.append(list(yi.eps) if isinstance(yi, Dual) else [0.0] * n)
+    return rows
+
+def _rebuild(x, values):
+    """Returns values in the same container kind as x, so F sees what it expects."""
+    if isinstance(x, vector):
+        return vector(*values)
+    return values
+
+def _color_columns(pattern, n):
+    """
+    Greedy largest-first coloring of the column intersection graph.
+    Two columns conflict when they both appear in some row of the pattern.
+    Returns (colors, number_of_colors).
+    """
+    rows_of = [[] for _ in range(n)]
+    for i, cols in enumerate(pattern):
+        for j in cols:
+            rows_of[j].append(i)
+
+    order = sorted(range(n), key=lambda j: -len(rows_of[j]))
+    colors = [-1] * n
+    n_colors = 0
+    for j in order:
+        used = set()
+        for i in rows_of[j]:
+            for k in pattern[i]:
+                if colors[k] >= 0:
+                    used.add(colors[k])
+        c = 0
+        while c in used:
+            c += 1
+        colors[j] = c
+        if c + 1 > n_colors:
+            n_colors = c + 1
+    return colors, n_colors
@@ -1,11 +1,44 @@
-def differentiate(f, x, h=1e-5):
+from phimath.math.func import _analytic_abs
+
+def differentiate(f, x, h=None, method='central'):
     """
-    Numerically differentiates the function f at point x using central difference.
+    Numerically differentiates the function f at point x.
     f: function to differentiate
     x: point at which to differentiate
-    h: small step size
+    h: small step size (default 1e-5, or 1e-20 for the complex step)
+    method: 'central', 'forward', 'backward' or 'complex'
+        'complex' evaluates f once at x + ih and returns Im(f)/h. It needs f to be
+        analytic and built from phimath.math functions, but has no subtractive
+        cancellation, so the result is accurate to machine precision.
+    """
+    if method == 'complex':
+        return complex_step(f, x, h if h is not None else 1e-20)
+    if h is None:
+        h = 1e-5
+    if method == 'central':
+        return (f(x + h) - f(x - h)) / (2 * h)
+    elif method == 'forward':
+        return fdifferentiate(f, x, h)
+    elif method == 'backward':
+        return bdifferentiate(f, x, h)
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+def complex_step(f, x, h=1e-20):
+    """
+    Complex-step derivative of an analytic function f at point x.
+    f: function to differentiate
+    x: point at which to differentiate
+    h: imaginary step size
+
+    Inside f, phimath.math.abs follows the sign of the real part instead of
+    returning the modulus, so |x| differentiates like on the real axis.
     """
-    return (f(x + h) - f(x - h)) / (2 * h)
+    token = _analytic_abs.set(True)
+    try:
+        return f(complex(x, h)).imag / h
+    finally:
+        _analytic_abs.reset(token)
 
 def fdifferentiate(f, x, h=1e-5):
     """
@@ -0,0 +1,179 @@
+"""
+Lockstep integration of one ODE from many initial conditions.
+
+All members of the ensemble are stored in one component-major buffer:
+component j of member m lives at index j * M + m. The right-hand side is
+called once per stage for the whole batch with zero-copy column views,
+so the Python call overhead is paid per batch instead of per trajectory.
+"""
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from phimath.calculas.ode_solvers import Trajectory, _zeros
+
+class Ensemble(Trajectory):
+    """
+    Trajectory of an ensemble solve. Row i holds every member's state
+    after the i-th saved step in component-major order, so y[i, j * M + m]
+    is component j of member m.
+    """
+    __slots__ = ['members', 'components']
+
+    def __init__(self, t, y, components, members):
+        super().__init__(t, y, components * members)
+        self.components = components
+        self.members = members
+
+    def state(self, i: int, m: int) -> array:
+        """State of member m at saved row i."""
+        if i < 0:
+            i += len(self.t)
+        base = i * self.dim
+        M = self.members
+        return array('d', (self.y[base + j * M + m] for j in range(self.components)))
+
+    def final(self, m: int) -> array:
+        """Final state of member m."""
+        return self.state(-1, m)
+
+    def __repr__(self):
+        return f"Ensemble(n_saved={len(self.t)}, members={self.members}, dim={self.components})"
+
+# Batch steppers: every stage update is one comprehension over the whole
+# buffer, written back in place so the column views stay valid.
+
+def _euler_batch(f, size):
+    k1 = _zeros(size)
+    def step(x, y, h):
+        f(x, y, k1)
+        y[:] = array('d', [a + h * b for a, b in zip(y, k1)])
+    return step
+
+def _rk2_batch(f, size):
+    k1, k2, tmp = _zeros(size), _zeros(size), _zeros(size)
+    def step(x, y, h):
+        f(x, y, k1)
+        tmp[:] = array('d', [a + h * b for a, b in zip(y, k1)])
+        f(x + h, tmp, k2)
+        half = h / 2
+        y[:] = array('d', [a + half * (b + c) for a, b, c in zip(y, k1, k2)])
+    return step
+
+def _rk4_batch(f, size):
+    k1, k2, k3, k4, tmp = _zeros(size), _zeros(size), _zeros(size), _zeros(size), _zeros(size)
+    def step(x, y, h):
+        half = h / 2
+        f(x, y, k1)
+        tmp[:] = array('d', [a + half * b for a, b in zip(y, k1)])
+        f(x + half, tmp, k2)
+        tmp[:] = array('d', [a + half * b for a, b in zip(y, k2)])
+        f(x + half, tmp, k3)
+        tmp[:] = array('d', [a + h * b for a, b in zip(y, k3)])
+        f(x + h, tmp, k4)
+        sixth = h / 6
+        y[:] = array('d', [a + sixth * (b + 2 * (c + d) + e) for a, b, c, d, e in zip(y, k1, k2, k3, k4)])
+    return step
+
+_BATCH_STEPPERS = {'euler': _euler_batch, 'rk2': _rk2_batch, 'rk4': _rk4_batch}
+
+def _column_rhs(f, dim, M):
+    """Adapts f(x, Y, dYdx) on column lists to the flat-buffer stepper form."""
+    views = {}
+    def columns(buf):
+        cols = views.get(id(buf))
+        if cols is None:
+            mv = memoryview(buf)
+            cols = [mv[j * M:(j + 1) * M] for j in range(dim)]
+            views[id(buf)] = cols
+        return cols
+    def f_flat(x, y, dydx):
+        f(x, columns(y), columns(dydx))
+    return f_flat
+
+def _solve_chunk(f, x0, Y0, h, n, method, every):
+    M = len(Y0)
+    dim = len(Y0[0])
+    y = _zeros(dim * M)
+    for m, state in enumerate(Y0):
+        if len(state) != dim:
+            raise ValueError("All initial states must have the same length.")
+        for j in range(dim):
+            y[j * M + m] = state[j]
+    step = _BATCH_STEPPERS[method](_column_rhs(f, dim, M), dim * M)
+
+    n_saved = n // every
+    ti = _zeros(n_saved)
+    yi = _zeros(n_saved * dim * M)
+    width = dim * M
+    x = x0
+    saved = 0
+    for i in range(1, n + 1):
+        step(x, y, h)
+        x += h
+        if i % every == 0:
+            ti[saved] = x
+            yi[saved * width:(saved + 1) * width] = y
+            saved += 1
+    return ti, yi
+
+def ensemble(f: callable, x0: float, Y0, h: float, n: int, method: str = 'rk4',
+             every: int = 1, processes: int = None, chunk_size: int = None) -> Ensemble:
+    """
+    Integrates dy/dx = f(x, y) from every initial state in Y0 in lockstep.
+
+    Parameters:
+    f : function
+        f(x, Y, dYdx) where Y and dYdx are lists of dim columns, each a
+        buffer of length M holding one component for every member.
+        f must write the derivatives into dYdx. With processes set, f must
+        be picklable (a module-level function).
+    x0 : float
+        The initial x value shared by all members.
+    Y0 : sequence of sequences
+        The M initial states, each of length dim.
+    h : float
+        The step size.
+    n : int
+        The number of steps to perform.
+    method : str
+        'euler', 'rk2' or 'rk4'.
+    every : int
+        Save every k-th step (every=n keeps only the final states).
+    processes : int
+        Fan chunks out to a process pool of this size. None runs serially.
+    chunk_size : int
+        Members per chunk when processes is set (default: an even split).
+    Returns: Ensemble
+        Members appear in the same order as Y0 regardless of chunking.
+    """
+    if method not in _BATCH_STEPPERS:
+        raise ValueError(f"Unknown method: {method}")
+    if every < 1:
+        raise ValueError("every must be a positive integer.")
+    Y0 = [list(state) for state in Y0]
+    M = len(Y0)
+    dim = len(Y0[0])
+
+    if not processes or processes <= 1 or M < 2:
+        ti, yi = _solve_chunk(f, x0, Y0, h, n, method, every)
+        return Ensemble(ti, yi, dim, M)
+
+    if chunk_size is None:
+        chunk_size = -(-M // processes)
+    bounds = [(lo, min(lo + chunk_size, M)) for lo in range(0, M, chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_solve_chunk, f, x0, Y0[lo:hi], h, n, method, every) for lo, hi in bounds]
+        results = [fut.result() for fut in futures]
+
+    # Reassemble the chunks into the component-major layout of the full ensemble
+    ti = results[0][0]
+    n_saved = len(ti)
+    width = dim * M
+    yi = _zeros(n_saved * width)
+    for (lo, hi), (_, chunk) in zip(bounds, results):
+        Mc = hi - lo
+        for i in range(n_saved):
+            for j in range(dim):
+                src = i * dim * Mc + j * Mc
+                dst = i * width + j * M + lo
+                yi[dst:dst + Mc] = chunk[src:src + Mc]
+    return Ensemble(ti, yi, dim, M)
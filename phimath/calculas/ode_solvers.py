@@ -1,7 +1,178 @@
 from array import array
 from phimath.math.func import make_function
+from phimath.control.numeric import iteration_limit, MAX_ITERATIONS
+from phimath.roots.scalar import _brent_bracket
 
-def rk2(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
+class Trajectory:
+    """
+    Array-backed solution of an ODE system.
+
+    t : array('d') of length n_steps
+        The x values after each step.
+    y : array('d') of length n_steps * dim
+        Row-major state history, row i holds the state after step i.
+    dim : int
+        The number of state components.
+    """
+    __slots__ = ['t', 'y', 'dim']
+
+    def __init__(self, t, y, dim):
+        self.t = t
+        self.y = y
+        self.dim = dim
+
+    def shape(self):
+        return len(self.t), self.dim
+
+    def __len__(self):
+        return len(self.t)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, tuple):
+            i, j = idx
+            return self.y[i * self.dim + j]
+        # Zero-copy view of one state row
+        if idx < 0:
+            idx += len(self.t)
+        return memoryview(self.y)[idx * self.dim:(idx + 1) * self.dim]
+
+    def column(self, j: int) -> array:
+        """Returns the history of state component j."""
+        return self.y[j::self.dim]
+
+    def to_function(self, j: int = 0) -> callable:
+        """Interpolates component j with make_function."""
+        return make_function(self.t, self.column(j))
+
+    def __repr__(self):
+        return f"Trajectory(n_steps={len(self.t)}, dim={self.dim})"
+
+def _is_system(y0) -> bool:
+    return isinstance(y0, (array, list, tuple))
+
+def _finish(xi, yi, dim, as_function):
+    if as_function:
+        return make_function(xi, yi) if dim == 1 else Trajectory(xi, yi, dim).to_function()
+    return Trajectory(xi, yi, dim)
+
+def _zeros(n: int) -> array:
+    return array('d', bytes(8 * n))
+
+def _euler_stepper(f, dim):
+    """Returns step(x, y, h) advancing y in place by one Euler step."""
+    k1 = _zeros(dim)
+    def step(x, y, h):
+        f(x, y, k1)
+        for j in range(dim):
+            y[j] += h * k1[j]
+    return step
+
+def _rk2_stepper(f, dim):
+    """Returns step(x, y, h) advancing y in place by one Heun step."""
+    k1, k2, tmp = _zeros(dim), _zeros(dim), _zeros(dim)
+    def step(x, y, h):
+        f(x, y, k1)
+        for j in range(dim):
+            tmp[j] = y[j] + h * k1[j]
+        f(x + h, tmp, k2)
+        half = h / 2
+        for j in range(dim):
+            y[j] += half * (k1[j] + k2[j])
+    return step
+
+def _rk4_stepper(f, dim):
+    """Returns step(x, y, h) advancing y in place by one classical RK4 step."""
+    k1, k2, k3, k4, tmp = _zeros(dim), _zeros(dim), _zeros(dim), _zeros(dim), _zeros(dim)
+    def step(x, y, h):
+        half = h / 2
+        f(x, y, k1)
+        for j in range(dim):
+            tmp[j] = y[j] + half * k1[j]
+        f(x + half, tmp, k2)
+        for j in range(dim):
+            tmp[j] = y[j] + half * k2[j]
+        f(x + half, tmp, k3)
+        for j in range(dim):
+            tmp[j] = y[j] + h * k3[j]
+        f(x + h, tmp, k4)
+        sixth = h / 6
+        for j in range(dim):
+            y[j] += sixth * (k1[j] + 2 * k2[j] + 2 * k3[j] + k4[j])
+    return step
+
+_STEPPERS = {'euler': _euler_stepper, 'rk2': _rk2_stepper, 'rk4': _rk4_stepper}
+
+def _fixed_step_system(stepper, f, x0, y0, h, n, as_function):
+    dim = len(y0)
+    y = array('d', y0)
+    step = stepper(f, dim)
+    xi = _zeros(n)
+    yi = _zeros(n * dim)
+    x = x0
+    for i in range(n):
+        step(x, y, h)
+        x += h
+        xi[i] = x
+        yi[i * dim:(i + 1) * dim] = y
+    return _finish(xi, yi, dim, as_function)
+
+def _euler_system(f, x0, y0, h, n, as_function):
+    return _fixed_step_system(_euler_stepper, f, x0, y0, h, n, as_function)
+
+def _rk2_system(f, x0, y0, h, n, as_function):
+    return _fixed_step_system(_rk2_stepper, f, x0, y0, h, n, as_function)
+
+def _rk4_system(f, x0, y0, h, n, as_function):
+    return _fixed_step_system(_rk4_stepper, f, x0, y0, h, n, as_function)
+
+def _rkf45_system(f, x0, y0, h, n, as_function):
+    dim = len(y0)
+    y = array('d', y0)
+    k1, k2, k3, k4, k5, k6, tmp = (_zeros(dim) for _ in range(7))
+    xi = _zeros(n)
+    yi = _zeros(n * dim)
+    x = x0
+    accepted = 0
+    for _ in range(n):
+        f(x, y, k1)
+        for j in range(dim):
+            tmp[j] = y[j] + h * k1[j] / 4
+        f(x + h / 4, tmp, k2)
+        for j in range(dim):
+            tmp[j] = y[j] + h * (3 * k1[j] / 32 + 9 * k2[j] / 32)
+        f(x + 3 * h / 8, tmp, k3)
+        for j in range(dim):
+            tmp[j] = y[j] + h * (1932 * k1[j] / 2197 - 7200 * k2[j] / 2197 + 7296 * k3[j] / 2197)
+        f(x + 12 * h / 13, tmp, k4)
+        for j in range(dim):
+            tmp[j] = y[j] + h * (439 * k1[j] / 216 - 8 * k2[j] + 3680 * k3[j] / 513 - 845 * k4[j] / 4104)
+        f(x + h, tmp, k5)
+        for j in range(dim):
+            tmp[j] = y[j] + h * (-8 * k1[j] / 27 + 2 * k2[j] - 3544 * k3[j] / 2565 + 1859 * k4[j] / 4104 - 11 * k5[j] / 40)
+        f(x + h / 2, tmp, k6)
+
+        # Estimate the error as the largest component difference between the 4th and 5th order solutions
+        error = 0.0
+        for j in range(dim):
+            e = abs(h * (k1[j] / 360 - 128 * k3[j] / 4275 - 2197 * k4[j] / 75240 + k5[j] / 50 + 2 * k6[j] / 55))
+            if e > error:
+                error = e
+        if error < 1e-6:
+            for j in range(dim):
+                y[j] += h * (16 * k1[j] / 135 + 6656 * k3[j] / 12825 + 28561 * k4[j] / 56430 - 9 * k5[j] / 50 + 2 * k6[j] / 55)
+            x += h
+            h *= 1.5
+            xi[accepted] = x
+            yi[accepted * dim:(accepted + 1) * dim] = y
+            accepted += 1
+        else:
+            h *= 0.5
+    # Only accepted steps are recorded, so the trajectory is trimmed to them
+    del xi[accepted:]
+    del yi[accepted * dim:]
+    return _finish(xi, yi, dim, as_function)
+
+def rk2(f: callable, x0: float, y0: float, h: float, n: int, as_function: bool = None)-> callable:
     """
     Second-order Runge-Kutta method (Heun's method) for solving ODEs.
 
@@ -16,9 +187,17 @@ def rk2(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
         The step size.
     n : int
         The number of steps to perform.
+    as_function : bool
+        Wrap the result in make_function. Defaults to True for scalar y0 and
+        False for systems, which return a Trajectory.
     Returns: 
         list of values      
+
+    For systems, y0 is a sequence (ideally array('d')) and f has the form
+    f(x, y, dydx), writing the derivative into the preallocated buffer dydx.
     """
+    if _is_system(y0):
+        return _rk2_system(f, x0, y0, h, n, as_function)
     x, y = x0, y0
     xi=array('d',[0.0]*n)
     yi=array('d',[0.0]*n)
@@ -29,9 +208,9 @@ def rk2(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
         x += h
         xi[i] = x
         yi[i] = y
-    return make_function(xi,yi)
+    return _finish(xi, yi, 1, as_function is None or as_function)
 
-def rk4(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
+def rk4(f: callable, x0: float, y0: float, h: float, n: int, as_function: bool = None)-> callable:
     """
     Fourth-order Runge-Kutta method for solving ODEs.
 
@@ -46,9 +225,17 @@ def rk4(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
         The step size.  
     n : int
         The number of steps to perform.
+    as_function : bool
+        Wrap the result in make_function. Defaults to True for scalar y0 and
+        False for systems, which return a Trajectory.
     Returns: function
         returns the function f.       
+
+    For systems, y0 is a sequence (ideally array('d')) and f has the form
+    f(x, y, dydx), writing the derivative into the preallocated buffer dydx.
     """
+    if _is_system(y0):
+        return _rk4_system(f, x0, y0, h, n, as_function)
     x, y = x0, y0
     xi=array('d',[0.0]*n)
     yi=array('d',[0.0]*n)
@@ -61,9 +248,9 @@ def rk4(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
         x += h
         xi[i] = x
         yi[i] = y
-    return make_function(xi,yi)
+    return _finish(xi, yi, 1, as_function is None or as_function)
 
-def rkf45(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
+def rkf45(f: callable, x0: float, y0: float, h: float, n: int, as_function: bool = None)-> callable:
     """
     Runge-Kutta-Fehlberg method (RKF45) for solving ODEs with adaptive step size.
 
@@ -78,13 +265,22 @@ def rkf45(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
         The initial step size.
     n : int
         The number of steps to perform.
+    as_function : bool
+        Wrap the result in make_function. Defaults to True for scalar y0 and
+        False for systems, which return a Trajectory.
     Returns: function
         returns the function f.        
+
+    For systems, y0 is a sequence (ideally array('d')) and f has the form
+    f(x, y, dydx), writing the derivative into the preallocated buffer dydx.
     """
+    if _is_system(y0):
+        return _rkf45_system(f, x0, y0, h, n, as_function)
     x, y = x0, y0
     xi=array('d',[0.0]*n)
     yi=array('d',[0.0]*n)
-    for i in range(n):
+    accepted = 0
+    for _ in range(n):
         k1 = h * f(x, y)
         k2 = h * f(x + h / 4, y + k1 / 4)
         k3 = h * f(x + 3 * h / 8, y + 3 * k1 / 32 + 9 * k2 / 32)
@@ -102,13 +298,18 @@ def rkf45(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
             x += h
             y = y5th
             h *= 1.5  # Increase step size
-            xi[i] = x
-            yi[i] = y
+            xi[accepted] = x
+            yi[accepted] = y
+            accepted += 1
         else:
             h *= 0.5  # Decrease step size
-        
-    return make_function(xi,yi)
-def euler(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
+
+    # Rejected steps leave no sample, so trim the unused slots
+    del xi[accepted:]
+    del yi[accepted:]
+    return _finish(xi, yi, 1, as_function is None or as_function)
+
+def euler(f: callable, x0: float, y0: float, h: float, n: int, as_function: bool = None)-> callable:
     """
     Euler's method for solving ODEs.
 
@@ -123,9 +324,17 @@ def euler(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
         The step size.
     n : int
         The number of steps to perform.
+    as_function : bool
+        Wrap the result in make_function. Defaults to True for scalar y0 and
+        False for systems, which return a Trajectory.
     Returns: function
         returns the function f.
+
+    For systems, y0 is a sequence (ideally array('d')) and f has the form
+    f(x, y, dydx), writing the derivative into the preallocated buffer dydx.
     """
+    if _is_system(y0):
+        return _euler_system(f, x0, y0, h, n, as_function)
     x, y = x0, y0
     xi=array('d',[0.0]*n)
     yi=array('d',[0.0]*n)
@@ -134,15 +343,466 @@ def euler(f: callable, x0: float, y0: float, h: float, n: int)-> callable:
         x += h
         xi[i] = x
         yi[i] = y
-    return make_function(xi,yi)
+    return _finish(xi, yi, 1, as_function is None or as_function)
+
+# -------------------------------------------------
+# Dormand-Prince 5(4) coefficients
+# -------------------------------------------------
+_C2, _C3, _C4, _C5 = 1 / 5, 3 / 10, 4 / 5, 8 / 9
+_A21 = 1 / 5
+_A31, _A32 = 3 / 40, 9 / 40
+_A41, _A42, _A43 = 44 / 45, -56 / 15, 32 / 9
+_A51, _A52, _A53, _A54 = 19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729
+_A61, _A62, _A63, _A64, _A65 = 9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656
+_A71, _A73, _A74, _A75, _A76 = 35 / 384, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84
+# Difference between the 5th and embedded 4th order weights
+_E1, _E3, _E4, _E5, _E6, _E7 = 71 / 57600, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40
+# Continuous extension (Hairer & Wanner, DOPRI5)
+_D1, _D3, _D4 = -12715105075 / 11282082432, 87487479700 / 32700410799, -10690763975 / 1880347072
+_D5, _D6, _D7 = 701980252875 / 199316789632, -1453857185 / 822651844, 69997945 / 29380423
+
+class DenseSolution(Trajectory):
+    """
+    Trajectory of an adaptive solve that also stores the method's
+    interpolant on every accepted step, so it can be evaluated at any t.
+
+    Calling the solution with a time returns a float for scalar problems
+    and an array('d') for systems. nfev, n_accepted and n_rejected report
+    the cost of the solve. When events are given, t_events[k] and
+    y_events[k] hold the located times and (row-major) states of event k.
+    """
+    __slots__ = ['cont', 'steps', 'scalar', 'nfev', 'n_accepted', 'n_rejected', 't_events', 'y_events']
+
+    def __init__(self, t, y, dim, cont, scalar, steps=None):
+        super().__init__(t, y, dim)
+        self.cont = cont
+        self.steps = steps
+        self.scalar = scalar
+        self.nfev = 0
+        self.n_accepted = 0
+        self.n_rejected = 0
+        self.t_events = []
+        self.y_events = []
+
+    def _step_index(self, x):
+        t = self.t
+        n = len(t) - 1
+        forward = t[-1] >= t[0]
+        low, high = 0, n - 1
+        while low < high:
+            mid = (low + high) // 2
+            if (t[mid + 1] < x) if forward else (t[mid + 1] > x):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def __call__(self, x):
+        if self.cont is None or len(self.t) < 2:
+            raise ValueError("Dense output was not stored for this solution.")
+        i = self._step_index(x)
+        # A step cut short by a terminal event keeps its full-step interpolant
+        h = self.steps[i] if self.steps is not None else self.t[i + 1] - self.t[i]
+        out = _dense_eval(self.cont, 5 * self.dim * i, self.dim, (x - self.t[i]) / h)
+        return out[0] if self.scalar else out
+
+    def __repr__(self):
+        return f"DenseSolution(n_steps={len(self.t)}, dim={self.dim}, nfev={self.nfev})"
+
+def _dense_eval(c, base, dim, theta):
+    """Evaluates the Dormand-Prince continuous extension stored at c[base:]."""
+    theta1 = 1 - theta
+    out = _zeros(dim)
+    for j in range(dim):
+        r1, r2, r3, r4, r5 = c[base + j], c[base + dim + j], c[base + 2 * dim + j], c[base + 3 * dim + j], c[base + 4 * dim + j]
+        out[j] = r1 + theta * (r2 + theta1 * (r3 + theta * (r4 + theta1 * r5)))
+    return out
+
+class Event:
+    """
+    Event function g(x, y) for adaptive solvers. An event occurs where g
+    changes sign; the crossing is located on the dense output.
+
+    terminal : bool
+        Stop the integration at the first occurrence.
+    direction : int
+        +1 triggers only on - to + crossings, -1 only on + to -, 0 on both.
+    """
+    __slots__ = ['g', 'terminal', 'direction']
+
+    def __init__(self, g: callable, terminal: bool = False, direction: int = 0):
+        self.g = g
+        self.terminal = terminal
+        self.direction = direction
+
+    def __call__(self, x, y):
+        return self.g(x, y)
+
+    def crossed(self, g_old: float, g_new: float) -> bool:
+        up = g_old < 0 <= g_new
+        down = g_old > 0 >= g_new
+        if self.direction > 0:
+            return up
+        if self.direction < 0:
+            return down
+        return up or down
+
+def _as_event(e) -> Event:
+    if isinstance(e, Event):
+        return e
+    return Event(e, getattr(e, 'terminal', False), getattr(e, 'direction', 0))
+
+def _error_norm(values, sk, dim):
+    total = 0.0
+    for j in range(dim):
+        e = values[j] / sk[j]
+        total += e * e
+    return (total / dim) ** 0.5
+
+def _as_system(f, y0):
+    """Returns (f_sys, y, scalar) with f_sys writing into a derivative buffer."""
+    if _is_system(y0):
+        return f, array('d', y0), False
+    def f_sys(x, y, dydx):
+        dydx[0] = f(x, y[0])
+    return f_sys, array('d', [y0]), True
+
+def _initial_step(f, t0, y0, f0, t_end, order, rtol, atol):
+    """
+    Hairer's starting step heuristic for a method of the given order.
+    Costs one evaluation of f; returns a positive step size (0 when
+    t_end == t0, without evaluating f).
+    """
+    dim = len(y0)
+    direction = 1.0 if t_end >= t0 else -1.0
+    sk, tmp, f1 = _zeros(dim), _zeros(dim), _zeros(dim)
+    for j in range(dim):
+        sk[j] = atol + rtol * abs(y0[j])
+    d0 = _error_norm(y0, sk, dim)
+    d1 = _error_norm(f0, sk, dim)
+    h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    h = min(h, abs(t_end - t0))
+    if h == 0:
+        return 0.0
+    for j in range(dim):
+        tmp[j] = y0[j] + direction * h * f0[j]
+    f(t0 + direction * h, tmp, f1)
+    for j in range(dim):
+        tmp[j] = f1[j] - f0[j]
+    d2 = _error_norm(tmp, sk, dim) / h
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / (order + 1))
+    return min(100 * h, h1)
+
+def dopri5(f: callable, t0: float, y0, t_end: float, rtol: float = 1e-6, atol: float = 1e-9,
+           h0: float = None, max_steps: int = None, dense_output: bool = True,
+           events=None, sink=None, checkpoint=None) -> DenseSolution:
+    """
+    Adaptive Dormand-Prince 5(4) integrator with FSAL stage reuse,
+    a PI step-size controller and 4th-order dense output.
+
+    Parameters:
+    f : function
+        The function defining the ODE. f(x, y) for scalar y0, or
+        f(x, y, dydx) writing into the buffer dydx for array-backed systems.
+    t0 : float
+        The initial x value.
+    y0 : float or sequence of float
+        The initial state.
+    t_end : float
+        The x value to integrate to (may be less than t0).
+    rtol, atol : float
+        Relative and absolute error tolerances per component.
+    h0 : float
+        Initial step size. Chosen automatically when None.
+    max_steps : int
+        Maximum number of attempted steps (of this call, when resuming) before
+        a RuntimeError. Defaults to MAX_ITERATIONS, or no limit when writing
+        to a sink or checkpoint, since those runs are meant to be long.
+    dense_output : bool
+        Store the interpolant so the solution can be evaluated at any t.
+    events : Event or list of Event
+        Functions g(x, y) whose sign changes are located with Brent's method
+        on the interpolant. A terminal event ends the solve at the crossing.
+    sink : TrajectoryFile
+        Write the accepted steps to this file instead of memory. Dense output
+        is not stored and the returned solution holds only the final state.
+    checkpoint : Checkpoint
+        Resume from an existing checkpoint and save the state, step size and
+        controller history every checkpoint.every accepted steps.
+    Returns: DenseSolution
+        The accepted steps (including t0) and the dense interpolant.
+    """
+    f, y, scalar = _as_system(f, y0)
+    dim = len(y)
+    direction = 1.0 if t_end >= t0 else -1.0
+    k1, k2, k3, k4, k5, k6, k7 = (_zeros(dim) for _ in range(7))
+    tmp, ynew, sk, err = _zeros(dim), _zeros(dim), _zeros(dim), _zeros(dim)
+    if sink is not None:
+        dense_output = False
+    if max_steps is None:
+        max_steps = MAX_ITERATIONS if sink is None and checkpoint is None else float('inf')
+    if events is None:
+        events = []
+    elif callable(events):
+        events = [events]
+    events = [_as_event(e) for e in events]
+    if t_end == t0:
+        # Empty interval: the solution is the initial point alone
+        if sink is not None:
+            sink.append(t0, y)
+            sink.flush()
+        sol = DenseSolution(array('d', [t0]), array('d', y), dim, None, scalar)
+        sol.t_events = [array('d') for _ in events]
+        sol.y_events = [array('d') for _ in events]
+        return sol
+    rc = _zeros(5 * dim)
+    terminated = False
+
+    safe, beta = 0.9, 0.04
+    expo1 = 0.2 - 0.75 * beta
+    state = checkpoint.load() if checkpoint is not None else None
+    if state is None:
+        t = t0
+        f(t, y, k1)
+        nfev = 1
+        if h0 is None:
+            h = _initial_step(f, t, y, k1, t_end, 5, rtol, atol)
+            nfev += 1
+        else:
+            h = abs(h0)
+        h = direction * min(h, abs(t_end - t0))
+        facold = 1e-4
+        last_rejected = False
+        accepted = rejected = 0
+        attempts = 0
+        g_old = [e(t, y[0] if scalar else array('d', y)) for e in events]
+        t_events = [array('d') for _ in events]
+        y_events = [array('d') for _ in events]
+        if sink is not None:
+            sink.append(t0, y)
+    else:
+        # Resume exactly where the checkpointed run left off
+        if state['solver'] != 'dopri5':
+            raise ValueError(f"Checkpoint {checkpoint.path} was written by {state['solver']}, not dopri5.")
+        t, h, facold, last_rejected = state['t'], state['h'], state['facold'], state['last_rejected']
+        y[:] = array('d', state['y'])
+        k1[:] = array('d', state['k1'])
+        nfev, accepted, rejected = state['nfev'], state['accepted'], state['rejected']
+        # The step budget applies to this call, not to the whole run
+        attempts = 0
+        g_old = state['g_old']
+        # A run stopped by a terminal event stays stopped
+        terminated = state.get('terminated', False)
+        t_events = [array('d', v) for v in state['t_events']]
+        y_events = [array('d', v) for v in state['y_events']]
+        if sink is not None:
+            sink.truncate(state['rows'])
+
+    ti = array('d', [t])
+    yi = array('d', y)
+    cont = array('d') if dense_output else None
+    steps = array('d') if dense_output else None
+
+    while not terminated and direction * (t_end - t) > 0:
+        iteration_limit(attempts, max_steps)
+        attempts += 1
+        final = direction * (t + h - t_end) >= 0
+        if final:
+            h = t_end - t
+
+        for j in range(dim):
+            tmp[j] = y[j] + h * _A21 * k1[j]
+        f(t + _C2 * h, tmp, k2)
+        for j in range(dim):
+            tmp[j] = y[j] + h * (_A31 * k1[j] + _A32 * k2[j])
+        f(t + _C3 * h, tmp, k3)
+        for j in range(dim):
+            tmp[j] = y[j] + h * (_A41 * k1[j] + _A42 * k2[j] + _A43 * k3[j])
+        f(t + _C4 * h, tmp, k4)
+        for j in range(dim):
+            tmp[j] = y[j] + h * (_A51 * k1[j] + _A52 * k2[j] + _A53 * k3[j] + _A54 * k4[j])
+        f(t + _C5 * h, tmp, k5)
+        for j in range(dim):
+            tmp[j] = y[j] + h * (_A61 * k1[j] + _A62 * k2[j] + _A63 * k3[j] + _A64 * k4[j] + _A65 * k5[j])
+        f(t + h, tmp, k6)
+        for j in range(dim):
+            ynew[j] = y[j] + h * (_A71 * k1[j] + _A73 * k3[j] + _A74 * k4[j] + _A75 * k5[j] + _A76 * k6[j])
+        f(t + h, ynew, k7)
+        nfev += 6
+
+        for j in range(dim):
+            err[j] = h * (_E1 * k1[j] + _E3 * k3[j] + _E4 * k4[j] + _E5 * k5[j] + _E6 * k6[j] + _E7 * k7[j])
+            sk[j] = atol + rtol * max(abs(y[j]), abs(ynew[j]))
+        error = _error_norm(err, sk, dim)
+
+        # PI step-size control
+        fac11 = error ** expo1 if error > 0 else 0.0
+        if error <= 1.0:
+            fac = fac11 / facold ** beta
+            fac = max(0.1, min(5.0, fac / safe))
+            h_next = h / fac
+            facold = max(error, 1e-4)
+            if last_rejected:
+                h_next = direction * min(abs(h_next), abs(h))
+
+            if dense_output or events:
+                for j in range(dim):
+                    ydiff = ynew[j] - y[j]
+                    bspl = h * k1[j] - ydiff
+                    rc[j] = y[j]
+                    rc[dim + j] = ydiff
+                    rc[2 * dim + j] = bspl
+                    rc[3 * dim + j] = ydiff - h * k7[j] - bspl
+                    rc[4 * dim + j] = h * (_D1 * k1[j] + _D3 * k3[j] + _D4 * k4[j] + _D5 * k5[j] + _D6 * k6[j] + _D7 * k7[j])
+                if dense_output:
+                    cont.extend(rc)
+                    steps.append(h)
+
+            t_new = t_end if final else t + h
+            if events:
+                hits = []
+                for k, e in enumerate(events):
+                    g_new = e(t_new, ynew[0] if scalar else array('d', ynew))
+                    if e.crossed(g_old[k], g_new):
+                        t_step, h_step = t, h
+                        def g_at(x, e=e, t_step=t_step, h_step=h_step):
+                            ye = _dense_eval(rc, 0, dim, (x - t_step) / h_step)
+                            return e(x, ye[0] if scalar else ye)
+                        hits.append((_brent_bracket(g_at, t, t_new, g_old[k], g_new, xtol=1e-12)[0], k))
+                    g_old[k] = g_new
+                hits.sort(key=lambda hit: direction * hit[0])
+                for t_hit, k in hits:
+                    y_hit = _dense_eval(rc, 0, dim, (t_hit - t) / h)
+                    t_events[k].append(t_hit)
+                    y_events[k].extend(y_hit)
+                    if events[k].terminal:
+                        terminated = True
+                        t_new = t_hit
+                        for j in range(dim):
+                            ynew[j] = y_hit[j]
+                        # k7 belongs to the full step: re-evaluate so the FSAL
+                        # stage (and any checkpoint) matches the stopping state
+                        f(t_new, ynew, k7)
+                        nfev += 1
+                        break
+
+            t = t_new
+            for j in range(dim):
+                y[j] = ynew[j]
+            # FSAL: the last stage of this step is the first stage of the next
+            k1, k7 = k7, k1
+            if sink is None:
+                ti.append(t)
+                yi.extend(y)
+            else:
+                sink.append(t, y)
+            accepted += 1
+            last_rejected = False
+            h = h_next
+            if checkpoint is not None and (checkpoint.due(accepted) or terminated):
+                if sink is not None:
+                    sink.flush()
+                checkpoint.save({
+                    'solver': 'dopri5', 't': t, 'h': h, 'facold': facold, 'last_rejected': False,
+                    'terminated': terminated,
+                    'y': list(y), 'k1': list(k1), 'nfev': nfev, 'accepted': accepted,
+                    'rejected': rejected, 'g_old': g_old,
+                    't_events': [list(v) for v in t_events], 'y_events': [list(v) for v in y_events],
+                    'rows': len(sink) if sink is not None else accepted + 1,
+                })
+            if terminated:
+                break
+        else:
+            h = h / min(5.0, fac11 / safe)
+            rejected += 1
+            last_rejected = True
+
+    if sink is not None:
+        sink.flush()
+        ti, yi = array('d', [t]), array('d', y)
+    sol = DenseSolution(ti, yi, dim, cont, scalar, steps)
+    sol.nfev = nfev
+    sol.n_accepted = accepted
+    sol.n_rejected = rejected
+    sol.t_events = t_events
+    sol.y_events = y_events
+    return sol
+
+def ode_stream(f: callable, x0: float, y0, h: float, n: int = None, method: str = 'rk4',
+               every: int = 1, callback: callable = None, copy: bool = True):
+    """
+    Lazily integrates an ODE with a fixed-step method, yielding (x, y) pairs.
+    Nothing but the current state is kept, so arbitrarily long runs stream
+    in constant memory.
+
+    Parameters:
+    f : function
+        f(x, y) for scalar y0, or f(x, y, dydx) writing into dydx for systems.
+    x0 : float
+        The initial x value.
+    y0 : float or sequence of float
+        The initial state.
+    h : float
+        The step size.
+    n : int
+        The number of steps to perform; None streams until the consumer stops.
+    method : str
+        'euler', 'rk2' or 'rk4'.
+    every : int
+        Yield only every k-th step (decimation); stepping itself is unaffected.
+    callback : function
+        Called as callback(x, y) after every step; returning True ends the stream.
+    copy : bool
+        Yield a fresh array('d') per sample. With copy=False the solver's own
+        state buffer is yielded and is overwritten by the next step.
+    Yields: (float, float or array('d'))
+    """
+    if method not in _STEPPERS:
+        raise ValueError(f"Unknown method: {method}")
+    if every < 1:
+        raise ValueError("every must be a positive integer.")
+    f, y, scalar = _as_system(f, y0)
+    step = _STEPPERS[method](f, len(y))
+    x = x0
+    i = 0
+    while n is None or i < n:
+        step(x, y, h)
+        i += 1
+        x += h
+        stop = callback(x, y[0] if scalar else y) if callback is not None else False
+        if i % every == 0 or stop:
+            if scalar:
+                yield x, y[0]
+            else:
+                yield x, (array('d', y) if copy else y)
+        if stop:
+            return
+
+def euler_stream(f: callable, x0: float, y0, h: float, n: int = None, every: int = 1,
+                 callback: callable = None, copy: bool = True):
+    """Streaming Euler integration; see ode_stream."""
+    return ode_stream(f, x0, y0, h, n, 'euler', every, callback, copy)
+
+def rk2_stream(f: callable, x0: float, y0, h: float, n: int = None, every: int = 1,
+               callback: callable = None, copy: bool = True):
+    """Streaming Heun (RK2) integration; see ode_stream."""
+    return ode_stream(f, x0, y0, h, n, 'rk2', every, callback, copy)
+
+def rk4_stream(f: callable, x0: float, y0, h: float, n: int = None, every: int = 1,
+               callback: callable = None, copy: bool = True):
+    """Streaming RK4 integration; see ode_stream."""
+    return ode_stream(f, x0, y0, h, n, 'rk4', every, callback, copy)
 
-def ode_solver(f: callable, x0: float, y0: float, h: float, n: int, method: str='rk4')-> callable:
+def ode_solver(f: callable, x0: float, y0: float, h: float, n: int, method: str='rk4', as_function: bool = None)-> callable:
     """
     General ODE solver that selects the method based on the input string.
 
     Parameters:
     method : str
-        The method to use ('euler', 'rk2', 'rk4', 'rkf45').
+        The method to use ('euler', 'rk2', 'rk4', 'rkf45', 'dopri5').
     f : function
         The function defining the ODE (dy/dx = f(x, y)).
     x0 : float
@@ -153,16 +813,21 @@ def ode_solver(f: callable, x0: float, y0: float, h: float, n: int, method: str=
         The step size.
     n : int
         The number of steps to perform.
+    as_function : bool
+        Wrap the result in make_function (default for scalar y0) or return a Trajectory (default for systems).
     Returns: function
         returns the function f.
     """
     if method == 'euler':
-        return euler(f, x0, y0, h, n)
+        return euler(f, x0, y0, h, n, as_function)
     elif method == 'rk2':
-        return rk2(f, x0, y0, h, n)
+        return rk2(f, x0, y0, h, n, as_function)
     elif method == 'rk4':
-        return rk4(f, x0, y0, h, n)
+        return rk4(f, x0, y0, h, n, as_function)
     elif method == 'rkf45':
-        return rkf45(f, x0, y0, h, n)
+        return rkf45(f, x0, y0, h, n, as_function)
+    elif method == 'dopri5':
+        # Adaptive: integrates to x0 + n*h using h as the initial step; the result is callable
+        return dopri5(f, x0, y0, x0 + n * h, h0=h)
     else:
         raise ValueError(f"Unknown method: {method}")
\ No newline at end of file
@@ -0,0 +1,336 @@
+"""
+Implicit solver for stiff ODE systems.
+
+bdf is a variable-order (1-5), quasi-constant step size BDF method in the
+backward-difference formulation used by Shampine & Reichelt. The Newton
+iteration matrix I - c*J is LU-factored once and reused for as long as the
+step size and order stay unchanged; the Jacobian itself is only refreshed
+when the Newton iteration fails to converge.
+"""
+from array import array
+from phimath.control.numeric import iteration_limit, MAX_ITERATIONS
+from phimath.calculas.ode_solvers import Trajectory, _as_system, _initial_step, _zeros
+from phimath.linalg.lu import LU
+
+MAX_ORDER = 5
+NEWTON_MAXITER = 4
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+
+# Klopfenstein-Shampine NDF coefficients; kappa = 0 gives the classical BDF
+_KAPPA = (0.0, -0.1850, -1 / 9, -0.0823, -0.0415, 0.0)
+_GAMMA = (0.0, 1.0, 1.5, 11 / 6, 25 / 12, 137 / 60)
+_ALPHA = tuple((1 - k) * g for k, g in zip(_KAPPA, _GAMMA))
+_ERROR_CONST = tuple(k * g + 1 / (i + 1) for i, (k, g) in enumerate(zip(_KAPPA, _GAMMA)))
+
+class StiffSolution(Trajectory):
+    """
+    Trajectory of a stiff solve with its cost counters: nfev (right-hand side
+    evaluations), njev (Jacobian evaluations), nlu (LU factorizations) and
+    n_accepted / n_rejected steps.
+    """
+    __slots__ = ['nfev', 'njev', 'nlu', 'n_accepted', 'n_rejected']
+
+    def __init__(self, t, y, dim):
+        super().__init__(t, y, dim)
+        self.nfev = 0
+        self.njev = 0
+        self.nlu = 0
+        self.n_accepted = 0
+        self.n_rejected = 0
+
+    def __repr__(self):
+        return f"StiffSolution(n_steps={len(self.t)}, dim={self.dim}, nfev={self.nfev}, njev={self.njev}, nlu={self.nlu})"
+
+# -------------------------------------------------
+# Backward-difference bookkeeping
+# -------------------------------------------------
+
+def _compute_R(order, factor):
+    """Matrix that rescales the difference array when h changes by factor."""
+    M = [[0.0] * (order + 1) for _ in range(order + 1)]
+    for j in range(order + 1):
+        M[0][j] = 1.0
+    for i in range(1, order + 1):
+        for j in range(1, order + 1):
+            M[i][j] = (i - 1 - factor * j) / i
+    # Cumulative product down the columns
+    for i in range(1, order + 1):
+        for j in range(order + 1):
+            M[i][j] *= M[i - 1][j]
+    return M
+
+def _change_D(D, order, factor, dim):
+    R = _compute_R(order, factor)
+    U = _compute_R(order, 1.0)
+    m = order + 1
+    RU = [[sum(R[i][k] * U[k][j] for k in range(m)) for j in range(m)] for i in range(m)]
+    new_rows = []
+    for i in range(m):
+        row = _zeros(dim)
+        for k in range(m):
+            c = RU[k][i]
+            if c != 0.0:
+                Dk = D[k]
+                for j in range(dim):
+                    row[j] += c * Dk[j]
+        new_rows.append(row)
+    for i in range(m):
+        D[i] = new_rows[i]
+
+def _rms(values, scale):
+    total = 0.0
+    for v, s in zip(values, scale):
+        e = v / s
+        total += e * e
+    return (total / len(values)) ** 0.5
+
+def _fd_jacobian(f, t, y, f0, dim):
+    """Forward-difference Jacobian as list-of-lists rows."""
+    J = [[0.0] * dim for _ in range(dim)]
+    yp = array('d', y)
+    fp = _zeros(dim)
+    for j in range(dim):
+        step = 1.5e-8 * max(1.0, abs(y[j]))
+        yp[j] = y[j] + step
+        f(t, yp, fp)
+        for i in range(dim):
+            J[i][j] = (fp[i] - f0[i]) / step
+        yp[j] = y[j]
+    return J
+
+def bdf(f: callable, t0: float, y0, t_end: float, rtol: float = 1e-3, atol: float = 1e-6,
+        jac: callable = None, h0: float = None, max_order: int = MAX_ORDER,
+        max_steps: int = None) -> StiffSolution:
+    """
+    Variable-order BDF integrator for stiff problems.
+
+    Parameters:
+    f : function
+        The function defining the ODE. f(x, y) for scalar y0, or
+        f(x, y, dydx) writing into the buffer dydx for array-backed systems.
+    t0 : float
+        The initial x value.
+    y0 : float or sequence of float
+        The initial state.
+    t_end : float
+        The x value to integrate to.
+    rtol, atol : float
+        Relative and absolute error tolerances per component.
+    jac : function
+        Optional Jacobian jac(x, y) returning a matrix or a list of rows
+        (a float for scalar problems). Forward differences are used when None.
+    h0 : float
+        Initial step size. Chosen automatically when None.
+    max_order : int
+        Highest BDF order to use (1 to 5).
+    max_steps : int
+        Maximum number of attempted steps before a RuntimeError
+        (default MAX_ITERATIONS; pass float('inf') for no limit).
+    Returns: StiffSolution
+        The accepted steps (including t0) and cost counters.
+    """
+    f, y, scalar = _as_system(f, y0)
+    dim = len(y)
+    max_order = max(1, min(MAX_ORDER, max_order))
+    if max_steps is None:
+        max_steps = MAX_ITERATIONS
+    direction = 1.0 if t_end >= t0 else -1.0
+    newton_tol = max(10 * 2.220446049250313e-16 / rtol, min(0.03, rtol ** 0.5))
+    if t_end == t0:
+        # Empty interval: the solution is the initial point alone
+        return StiffSolution(array('d', [t0]), array('d', y), dim)
+
+    fbuf = _zeros(dim)
+    t = t0
+    f(t, y, fbuf)
+    nfev = 1
+    njev = nlu = 0
+
+    def evaluate_jacobian(t_j, y_j, f_j):
+        nonlocal nfev, njev
+        njev += 1
+        if jac is None:
+            nfev += dim
+            return _fd_jacobian(f, t_j, y_j, f_j, dim)
+        J = jac(t_j, y_j[0] if scalar else y_j)
+        if scalar and isinstance(J, (int, float)):
+            return [[float(J)]]
+        rows = J.tolist() if hasattr(J, 'tolist') else J
+        return [[float(v) for v in row] for row in rows]
+
+    if h0 is None:
+        h = _initial_step(f, t, y, fbuf, t_end, 1, rtol, atol)
+        nfev += 1
+    else:
+        h = abs(h0)
+    h = direction * min(h, abs(t_end - t0))
+
+    J = evaluate_jacobian(t, y, fbuf)
+    current_jac = True
+    lu = None
+
+    D = [_zeros(dim) for _ in range(MAX_ORDER + 3)]
+    D[0] = array('d', y)
+    for j in range(dim):
+        D[1][j] = fbuf[j] * h
+    order = 1
+    n_equal_steps = 0
+
+    ti = array('d', [t0])
+    yi = array('d', y)
+    accepted = rejected = 0
+    attempts = 0
+
+    y_predict, scale, psi, d, y_new = _zeros(dim), _zeros(dim), _zeros(dim), _zeros(dim), _zeros(dim)
+    rhs = _zeros(dim)
+
+    while direction * (t_end - t) > 0:
+        step_accepted = False
+        while not step_accepted:
+            iteration_limit(attempts, max_steps)
+            attempts += 1
+            if abs(h) < 1e-14 * max(1.0, abs(t)):
+                raise RuntimeError("Step size became too small.")
+
+            # Never step past t_end
+            t_new = t + h
+            if direction * (t_new - t_end) > 0:
+                t_new = t_end
+                _change_D(D, order, (t_new - t) / h, dim)
+                n_equal_steps = 0
+                lu = None
+            h = t_new - t
+
+            for j in range(dim):
+                s = 0.0
+                for i in range(order + 1):
+                    s += D[i][j]
+                y_predict[j] = s
+                scale[j] = atol + rtol * abs(s)
+                p = 0.0
+                for i in range(1, order + 1):
+                    p += D[i][j] * _GAMMA[i]
+                psi[j] = p / _ALPHA[order]
+            c = h / _ALPHA[order]
+
+            converged = False
+            while not converged:
+                if lu is None:
+                    A = [[(1.0 if i == j else 0.0) - c * J[i][j] for j in range(dim)] for i in range(dim)]
+                    lu = LU(A)
+                    nlu += 1
+
+                # Simplified Newton iteration reusing the factorization
+                for j in range(dim):
+                    d[j] = 0.0
+                    y_new[j] = y_predict[j]
+                dy_norm_old = None
+                n_iter = 0
+                for k in range(NEWTON_MAXITER):
+                    n_iter = k + 1
+                    f(t_new, y_new, fbuf)
+                    nfev += 1
+                    if any(v != v or v in (float('inf'), float('-inf')) for v in fbuf):
+                        break
+                    for j in range(dim):
+                        rhs[j] = c * fbuf[j] - psi[j] - d[j]
+                    dy = lu.solve(rhs)
+                    dy_norm = _rms(dy, scale)
+                    rate = None if dy_norm_old is None else dy_norm / dy_norm_old
+                    if rate is not None and (rate >= 1 or rate ** (NEWTON_MAXITER - k) / (1 - rate) * dy_norm > newton_tol):
+                        break
+                    for j in range(dim):
+                        y_new[j] += dy[j]
+                        d[j] += dy[j]
+                    if dy_norm == 0 or (rate is not None and rate / (1 - rate) * dy_norm < newton_tol):
+                        converged = True
+                        break
+                    dy_norm_old = dy_norm
+
+                if converged or current_jac:
+                    break
+                # Convergence degraded with a stale Jacobian: refresh it and retry
+                f(t_new, y_predict, fbuf)
+                nfev += 1
+                J = evaluate_jacobian(t_new, y_predict, fbuf)
+                current_jac = True
+                lu = None
+
+            if not converged:
+                _change_D(D, order, 0.5, dim)
+                n_equal_steps = 0
+                h *= 0.5
+                lu = None
+                rejected += 1
+                continue
+
+            safety = 0.9 * (2 * NEWTON_MAXITER + 1) / (2 * NEWTON_MAXITER + n_iter)
+            for j in range(dim):
+                scale[j] = atol + rtol * abs(y_new[j])
+            error_norm = _rms([_ERROR_CONST[order] * v for v in d], scale)
+
+            if error_norm > 1:
+                factor = max(MIN_FACTOR, safety * error_norm ** (-1 / (order + 1)))
+                _change_D(D, order, factor, dim)
+                n_equal_steps = 0
+                h *= factor
+                lu = None
+                rejected += 1
+            else:
+                step_accepted = True
+
+        # Accept the step and update the difference array
+        n_equal_steps += 1
+        t = t_new
+        for j in range(dim):
+            y[j] = y_new[j]
+            D[order + 2][j] = d[j] - D[order + 1][j]
+            D[order + 1][j] = d[j]
+        for i in range(order, -1, -1):
+            Di, Di1 = D[i], D[i + 1]
+            for j in range(dim):
+                Di[j] += Di1[j]
+        # The Jacobian is kept until Newton convergence degrades
+        current_jac = False
+        ti.append(t)
+        yi.extend(y)
+        accepted += 1
+
+        if n_equal_steps < order + 1:
+            continue
+
+        # Order and step-size selection
+        if order > 1:
+            error_m_norm = _rms([_ERROR_CONST[order - 1] * v for v in D[order]], scale)
+        else:
+            error_m_norm = float('inf')
+        if order < max_order:
+            error_p_norm = _rms([_ERROR_CONST[order + 1] * v for v in D[order + 2]], scale)
+        else:
+            error_p_norm = float('inf')
+
+        candidates = []
+        for delta, norm in ((-1, error_m_norm), (0, error_norm), (1, error_p_norm)):
+            q = order + delta
+            if norm == float('inf'):
+                candidates.append(0.0)
+            elif norm == 0:
+                candidates.append(float('inf'))
+            else:
+                candidates.append(norm ** (-1 / (q + 1)))
+        best = max(range(3), key=lambda i: candidates[i])
+        order += best - 1
+        factor = min(MAX_FACTOR, safety * candidates[best])
+        _change_D(D, order, factor, dim)
+        n_equal_steps = 0
+        h *= factor
+        lu = None
+
+    sol = StiffSolution(ti, yi, dim)
+    sol.nfev = nfev
+    sol.njev = njev
+    sol.nlu = nlu
+    sol.n_accepted = accepted
+    sol.n_rejected = rejected
+    return sol
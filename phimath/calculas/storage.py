@@ -0,0 +1,267 @@
+"""
+Out-of-core trajectory storage and solver checkpoints.
+
+TrajectoryFile keeps an ODE trajectory in a memory-mapped binary file:
+a 64-byte header followed by rows of native doubles (t, y_0, ..., y_dim-1).
+Reopening the file maps it back without copying, so runs larger than RAM
+can be written and analysed. Checkpoint stores the full solver state at
+regular intervals so an interrupted run resumes bit-for-bit.
+"""
+import json
+import mmap
+import os
+from array import array
+from phimath.calculas.ode_solvers import Trajectory, _STEPPERS, _as_system
+
+_MAGIC = b'PHITRJ01'
+_HEADER = 64
+# Header words after the magic: dim, count, capacity
+_DIM, _COUNT, _CAPACITY = 1, 2, 3
+# Rows added when a full file grows from (near) empty; it doubles after that
+_GROW_MIN = 64
+
+class TrajectoryFile:
+    """
+    Memory-mapped trajectory file.
+
+    Parameters:
+    path : str
+        The file to open or create.
+    dim : int
+        The number of state components; required when creating a file.
+    mode : str
+        'r' maps an existing file read-only, 'w' creates (or overwrites) a
+        file, 'a' appends to an existing file.
+    capacity : int
+        Rows to preallocate when creating; the file doubles when full.
+
+    t, column(j) and rows are zero-copy memoryviews into the mapping. In
+    write modes they stay valid only until the file next grows or closes.
+    """
+    def __init__(self, path: str, dim: int = None, mode: str = 'r', capacity: int = 1024):
+        if mode not in ('r', 'w', 'a'):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.path = path
+        self.mode = mode
+        if mode == 'w':
+            if dim is None or dim < 1:
+                raise ValueError("dim must be a positive integer when creating a file.")
+            capacity = max(1, capacity)
+            self._file = open(path, 'w+b')
+            self._file.truncate(_HEADER + capacity * (dim + 1) * 8)
+            self._file.write(_MAGIC + array('Q', [dim, 0, capacity]).tobytes())
+            self._file.flush()
+        else:
+            self._file = open(path, 'rb' if mode == 'r' else 'r+b')
+            if self._file.read(8) != _MAGIC:
+                self._file.close()
+                raise ValueError(f"{path} is not a trajectory file.")
+        self._map()
+        if dim is not None and dim != self.dim:
+            self.close()
+            raise ValueError(f"{path} holds dim={self.dim}, not {dim}.")
+
+    def _map(self):
+        access = mmap.ACCESS_READ if self.mode == 'r' else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+        self._header = memoryview(self._mm)[:32].cast('Q')
+        self.dim = self._header[_DIM]
+        self._width = self.dim + 1
+        self._data = memoryview(self._mm)[_HEADER:].cast('d')
+
+    def _unmap(self):
+        self._data.release()
+        self._header.release()
+        self._mm.close()
+
+    def __len__(self):
+        return self._header[_COUNT]
+
+    def shape(self):
+        return len(self), self.dim
+
+    @property
+    def t(self) -> memoryview:
+        """The x value of every row (strided view)."""
+        return self._data[0:len(self) * self._width:self._width]
+
+    def column(self, j: int) -> memoryview:
+        """The history of state component j (strided view)."""
+        return self._data[j + 1:len(self) * self._width:self._width]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, tuple):
+            i, j = idx
+            return self._data[i * self._width + j + 1]
+        if idx < 0:
+            idx += len(self)
+        base = idx * self._width + 1
+        return self._data[base:base + self.dim]
+
+    def append(self, x: float, y):
+        """Writes one row. y is any sequence of dim floats."""
+        count = self._header[_COUNT]
+        if count == self._header[_CAPACITY]:
+            # close() trims capacity to count, which may be 0
+            self._grow(max(_GROW_MIN, 2 * count))
+        base = count * self._width
+        self._data[base] = x
+        if isinstance(y, array):
+            self._data[base + 1:base + self._width] = y
+        else:
+            for j in range(self.dim):
+                self._data[base + 1 + j] = y[j]
+        self._header[_COUNT] = count + 1
+
+    def _grow(self, capacity):
+        self._unmap()
+        self._file.truncate(_HEADER + capacity * self._width * 8)
+        self._map()
+        self._header[_CAPACITY] = capacity
+
+    def truncate(self, count: int):
+        """Discards every row after the first count (used when resuming)."""
+        if count > len(self):
+            raise ValueError("Cannot truncate beyond the stored rows.")
+        self._header[_COUNT] = count
+
+    def flush(self):
+        """Pushes the rows written so far (and the row count) to disk."""
+        if self.mode != 'r':
+            self._mm.flush()
+
+    def to_trajectory(self) -> Trajectory:
+        """Copies the stored rows into an in-memory Trajectory."""
+        n = len(self)
+        w = self._width
+        flat = array('d', self._data[:n * w].tobytes())
+        y = array('d')
+        for i in range(n):
+            y.extend(flat[i * w + 1:(i + 1) * w])
+        return Trajectory(flat[0::w], y, self.dim)
+
+    def close(self):
+        """Trims unused capacity and releases the mapping."""
+        if self._mm.closed:
+            return
+        count = len(self)
+        self.flush()
+        self._unmap()
+        if self.mode != 'r':
+            self._file.truncate(_HEADER + count * self._width * 8)
+            self._file.seek(0)
+            self._file.write(_MAGIC + array('Q', [self.dim, count, count]).tobytes())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"TrajectoryFile({self.path!r}, n_steps={len(self) if not self._mm.closed else '?'}, dim={self.dim})"
+
+class Checkpoint:
+    """
+    Periodic snapshot of a solver's complete state.
+
+    Parameters:
+    path : str
+        The checkpoint file. It is replaced atomically on every save, so a
+        crash during a save leaves the previous checkpoint intact.
+    every : int
+        Save after every k-th accepted step.
+
+    Floats are written with repr, which round-trips exactly, so resuming
+    from a checkpoint reproduces the uninterrupted run bit-for-bit.
+    """
+    def __init__(self, path: str, every: int = 1000):
+        if every < 1:
+            raise ValueError("every must be a positive integer.")
+        self.path = path
+        self.every = every
+
+    def due(self, step: int) -> bool:
+        return step % self.every == 0
+
+    def save(self, state: dict):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as fh:
+            json.dump(state, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+
+    def load(self) -> dict:
+        """Returns the saved state, or None when no checkpoint exists."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as fh:
+            return json.load(fh)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def _resume(checkpoint, solver, sink):
+    """Loads a checkpoint written by solver and rewinds sink to match it."""
+    state = checkpoint.load() if checkpoint is not None else None
+    if state is None:
+        return None
+    if state['solver'] != solver:
+        raise ValueError(f"Checkpoint {checkpoint.path} was written by {state['solver']}, not {solver}.")
+    if sink is not None:
+        sink.truncate(state['rows'])
+    return state
+
+def solve_to_file(f: callable, x0: float, y0, h: float, n: int, sink: TrajectoryFile,
+                  method: str = 'rk4', every: int = 1, checkpoint: Checkpoint = None) -> TrajectoryFile:
+    """
+    Integrates with a fixed-step method, writing rows to a TrajectoryFile
+    instead of memory.
+
+    Parameters:
+    f : function
+        f(x, y) for scalar y0, or f(x, y, dydx) writing into dydx for systems.
+    x0 : float
+        The initial x value.
+    y0 : float or sequence of float
+        The initial state.
+    h : float
+        The step size.
+    n : int
+        The total number of steps.
+    sink : TrajectoryFile
+        Open in mode 'w' or 'a'.
+    method : str
+        'euler', 'rk2' or 'rk4'.
+    every : int
+        Write every k-th step.
+    checkpoint : Checkpoint
+        When given, an existing checkpoint is resumed and a new one is saved
+        every checkpoint.every steps.
+    Returns: TrajectoryFile
+        The sink.
+    """
+    if method not in _STEPPERS:
+        raise ValueError(f"Unknown method: {method}")
+    f, y, _ = _as_system(f, y0)
+    step = _STEPPERS[method](f, len(y))
+    x, i = x0, 0
+    state = _resume(checkpoint, method, sink)
+    if state is not None:
+        x, i = state['x'], state['step']
+        y = array('d', state['y'])
+
+    while i < n:
+        step(x, y, h)
+        i += 1
+        x += h
+        if i % every == 0:
+            sink.append(x, y)
+        if checkpoint is not None and checkpoint.due(i):
+            sink.flush()
+            checkpoint.save({'solver': method, 'x': x, 'step': i, 'y': list(y), 'rows': len(sink)})
+    sink.flush()
+    return sink
@@ -0,0 +1,104 @@
+"""
+Symplectic integrators for separable Hamiltonians H(q, p) = T(p) + V(q).
+
+Every method here is a sequence of "kicks" (p -= c*h*dV/dq) and "drifts"
+(q += c*h*dT/dp). Higher-order schemes are Yoshida compositions of the
+velocity Verlet step, so they share one stepping loop and differ only in
+their coefficient tables. Gradients are cached between kicks and drifts,
+so velocity Verlet costs one dV/dq evaluation per step.
+"""
+from array import array
+from phimath.calculas.ode_solvers import Trajectory, _zeros
+
+def _compose(weights):
+    """Builds the kick/drift sequence of a composition of velocity Verlet steps."""
+    ops = []
+    for w in weights:
+        for kind, c in (('kick', w / 2), ('drift', w), ('kick', w / 2)):
+            if ops and ops[-1][0] == kind:
+                ops[-1] = (kind, ops[-1][1] + c)
+            else:
+                ops.append((kind, c))
+    return tuple(ops)
+
+_CBRT2 = 2 ** (1 / 3)
+_Y4_W1 = 1 / (2 - _CBRT2)
+_Y4_W0 = -_CBRT2 / (2 - _CBRT2)
+# Yoshida (1990) 6th order, solution A
+_Y6_W1, _Y6_W2, _Y6_W3 = -1.17767998417887, 0.235573213359357, 0.784513610477560
+_Y6_W0 = 1 - 2 * (_Y6_W1 + _Y6_W2 + _Y6_W3)
+
+METHODS = {
+    'verlet': _compose([1.0]),
+    'leapfrog': (('drift', 0.5), ('kick', 1.0), ('drift', 0.5)),
+    # Forest-Ruth and Yoshida's 4th-order triple jump share the same coefficients
+    'forest_ruth': _compose([_Y4_W1, _Y4_W0, _Y4_W1]),
+    'yoshida4': _compose([_Y4_W1, _Y4_W0, _Y4_W1]),
+    'yoshida6': _compose([_Y6_W3, _Y6_W2, _Y6_W1, _Y6_W0, _Y6_W1, _Y6_W2, _Y6_W3]),
+}
+
+def steps_for(method: str):
+    """Returns the kick/drift coefficient sequence of a symplectic method."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    return METHODS[method]
+
+def symplectic(grad_T: callable, grad_V: callable, q0, p0, h: float, n: int,
+               method: str = 'yoshida4', t0: float = 0.0) -> Trajectory:
+    """
+    Integrates a separable Hamiltonian system with a symplectic method.
+
+    Parameters:
+    grad_T : function
+        grad_T(p, out) writes dT/dp (for T = p^2/2m this is p/m) into out.
+    grad_V : function
+        grad_V(q, out) writes dV/dq (minus the force) into out.
+    q0, p0 : sequence of float
+        Initial positions and momenta.
+    h : float
+        The step size.
+    n : int
+        The number of steps to perform.
+    method : str
+        'verlet', 'leapfrog', 'forest_ruth', 'yoshida4' or 'yoshida6'.
+    t0 : float
+        The initial time.
+    Returns: Trajectory
+        Rows hold (q..., p...) after each step.
+    """
+    ops = steps_for(method)
+    q = array('d', q0)
+    p = array('d', p0)
+    d = len(q)
+    if len(p) != d:
+        raise ValueError("q0 and p0 must have the same length.")
+
+    gT, gV = _zeros(d), _zeros(d)
+    gT_valid = gV_valid = False
+    ti = _zeros(n)
+    yi = _zeros(n * 2 * d)
+    t = t0
+    width = 2 * d
+    for i in range(n):
+        for kind, c in ops:
+            ch = c * h
+            if kind == 'kick':
+                if not gV_valid:
+                    grad_V(q, gV)
+                    gV_valid = True
+                for j in range(d):
+                    p[j] -= ch * gV[j]
+                gT_valid = False
+            else:
+                if not gT_valid:
+                    grad_T(p, gT)
+                    gT_valid = True
+                for j in range(d):
+                    q[j] += ch * gT[j]
+                gV_valid = False
+        t += h
+        ti[i] = t
+        base = i * width
+        yi[base:base + d] = q
+        yi[base + d:base + width] = p
+    return Trajectory(ti, yi, width)
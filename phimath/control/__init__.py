@@ -15,6 +15,7 @@ from .numeric import (
     is_zero,
     has_converged,
     iteration_limit,
+    CallCounter,
 )
 
 from .symbols import Symbol, symbols, Expression, VectorSymbol, VectorSymbolComponents
@@ -28,6 +29,7 @@ __all__ = [
     "is_zero",
     "has_converged",
     "iteration_limit",
+    "CallCounter",
     "Symbol",
     "symbols",
     "Expression",
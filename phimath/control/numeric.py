@@ -76,3 +76,18 @@ def iteration_limit(iter_count: int, max_iter=MAX_ITERATIONS) -> None:
     if iter_count >= max_iter:
         raise RuntimeError("Iteration limit reached.")
 
+
+class CallCounter:
+    """
+    Wraps a function and counts how many times it is evaluated.
+    Solvers use it to report evaluation counts alongside iteration counts.
+    """
+    __slots__ = ['f', 'calls']
+
+    def __init__(self, f: callable):
+        self.f = f
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.f(*args)
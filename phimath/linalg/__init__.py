@@ -1,5 +1,18 @@
-from .vectors import vector
+from .vectors import vector, VectorArray
 from .matrix import matrix
+from .lu import LU
+from .qr import QR, Cholesky, lstsq, LstsqResult
+from .sparse import COO, CSR, CSC
+from .banded import Banded, BandedLU, Tridiagonal, CyclicTridiagonal
+from .preconditioners import Jacobi, SSOR, ILU
 from .solvers import solve_linear_system, gaussian_eleminator, quadratic_solver
+from .solvers import cg, bicgstab, gmres, KrylovResult
+from .eigen import eigh, eigvalsh, lanczos, EigenResult
+from .parallel import parallel_matmul, parallel_lu, parallel_solve
+from .rotations import Mat3, Quaternion
 
-__all__ = ['vector', 'matrix', 'solve_linear_system', 'gaussian_eleminator', 'quadratic_solver']
\ No newline at end of file
+__all__ = ['vector', 'VectorArray', 'matrix', 'LU', 'QR', 'Cholesky', 'lstsq', 'LstsqResult', 'COO', 'CSR', 'CSC', 'Banded', 'BandedLU', 'Tridiagonal', 'CyclicTridiagonal',
+           'solve_linear_system', 'gaussian_eleminator', 'quadratic_solver',
+           'cg', 'bicgstab', 'gmres', 'KrylovResult', 'Jacobi', 'SSOR', 'ILU',
+           'eigh', 'eigvalsh', 'lanczos', 'EigenResult',
+           'parallel_matmul', 'parallel_lu', 'parallel_solve', 'Mat3', 'Quaternion']
\ No newline at end of file
@@ -0,0 +1,437 @@
+"""
+Banded and tridiagonal matrices.
+
+A matrix whose nonzeros lie within `lower` diagonals below and `upper`
+diagonals above the main one factors in O(n * lower * (lower + upper))
+instead of O(n^3), and solves in O(n * (lower + upper)) per right-hand side.
+Tridiagonal systems (1-D chains, splines, implicit diffusion) use the
+Thomas algorithm; periodic chains use CyclicTridiagonal.
+
+Every solve accepts one right-hand side (a sequence, returned as
+array('d')) or many at once as the columns of an n x m matrix. For a
+matrix, each elimination step updates whole rows of right-hand sides, so
+the per-column cost stays in C.
+"""
+from array import array
+from itertools import repeat
+from operator import add, sub, mul
+from phimath.linalg.matrix import matrix, _dot
+
+def _rhs_rows(b, n):
+    """Right-hand sides as a list of rows (one list of m values per unknown)."""
+    if b.rows() != n:
+        raise ValueError(f"Right-hand side has {b.rows()} rows, expected {n}.")
+    return b.tolist()
+
+def _rhs_vector(b, n):
+    if len(b) != n:
+        raise ValueError(f"Right-hand side has {len(b)} entries, expected {n}.")
+    return [float(v) for v in b]
+
+def _axpy_row(y, a, x):
+    """y - a x for rows of right-hand sides."""
+    return list(map(sub, y, map(mul, x, repeat(a))))
+
+class Banded:
+    """
+    n x n band matrix with `lower` subdiagonals and `upper` superdiagonals.
+
+    Stored like LAPACK's general band format: a flat array('d') of
+    (lower + upper + 1) rows of length n, where A[i, j] lives in band row
+    upper + i - j at position j. Each diagonal is therefore contiguous,
+    which is what matvec works on.
+    """
+    __slots__ = ['n', 'lower', 'upper', 'data']
+
+    def __init__(self, n: int, lower: int, upper: int):
+        if n < 1 or lower < 0 or upper < 0:
+            raise ValueError("Banded matrix needs n >= 1 and nonnegative bandwidths.")
+        self.n = n
+        self.lower = lower
+        self.upper = upper
+        self.data = array('d', bytes(8 * n * (lower + upper + 1)))
+
+    @classmethod
+    def from_diagonals(cls, diagonals: dict) -> 'Banded':
+        """
+        Builds from {offset: values}: offset 0 is the main diagonal (n values),
+        offset k > 0 the k-th superdiagonal and k < 0 a subdiagonal (n - |k| values).
+        """
+        if 0 not in diagonals:
+            raise ValueError("The main diagonal (offset 0) is required.")
+        n = len(diagonals[0])
+        m = cls(n, max(0, -min(diagonals)), max(0, max(diagonals)))
+        for k, values in diagonals.items():
+            if len(values) != n - abs(k):
+                raise ValueError(f"Diagonal {k} needs {n - abs(k)} values, got {len(values)}.")
+            start = (m.upper - k) * n + max(0, k)
+            m.data[start:start + n - abs(k)] = array('d', values)
+        return m
+
+    @classmethod
+    def from_matrix(cls, m: matrix, lower: int = None, upper: int = None) -> 'Banded':
+        """Band part of a square matrix; the bandwidths are detected from the nonzeros when None."""
+        n = m.rows()
+        if m.cols() != n:
+            raise ValueError("Banded matrix needs a square matrix.")
+        rows = m.tolist()
+        if lower is None:
+            lower = max((i - j for i in range(n) for j in range(i) if rows[i][j] != 0), default=0)
+        if upper is None:
+            upper = max((j - i for i in range(n) for j in range(i + 1, n) if rows[i][j] != 0), default=0)
+        b = cls(n, lower, upper)
+        for k in range(-lower, upper + 1):
+            b.set_diagonal(k, [rows[i][i + k] for i in range(max(0, -k), min(n, n - k))])
+        return b
+
+    def shape(self):
+        return self.n, self.n
+
+    def _index(self, i, j):
+        if not (0 <= i < self.n and 0 <= j < self.n):
+            raise IndexError(f"Entry ({i}, {j}) is outside a {self.n}x{self.n} matrix.")
+        d = self.upper + i - j
+        return d * self.n + j if 0 <= d <= self.lower + self.upper else -1
+
+    def __getitem__(self, idx):
+        k = self._index(*idx)
+        return self.data[k] if k >= 0 else 0.0
+
+    def __setitem__(self, idx, value):
+        k = self._index(*idx)
+        if k < 0:
+            raise IndexError(f"Entry {idx} is outside the band.")
+        self.data[k] = value
+
+    def diagonal(self, k: int = 0) -> array:
+        """Copy of diagonal k (k > 0 above the main diagonal)."""
+        if not -self.lower <= k <= self.upper:
+            return array('d', bytes(8 * max(0, self.n - abs(k))))
+        start = (self.upper - k) * self.n + max(0, k)
+        return self.data[start:start + self.n - abs(k)]
+
+    def set_diagonal(self, k: int, values):
+        if not -self.lower <= k <= self.upper:
+            raise IndexError(f"Diagonal {k} is outside the band.")
+        start = (self.upper - k) * self.n + max(0, k)
+        self.data[start:start + self.n - abs(k)] = array('d', values)
+
+    def matvec(self, x, out=None) -> array:
+        """y = A x, one slice operation per diagonal."""
+        n = self.n
+        if len(x) != n:
+            raise ValueError(f"Expected a sequence of length {n}, got {len(x)}.")
+        x = array('d', x)
+        y = array('d', bytes(8 * n))
+        data = self.data
+        for k in range(-self.lower, self.upper + 1):
+            # y[j - k] += A[j - k, j] * x[j]
+            lo, hi = max(0, k), min(n, n + k)
+            start = (self.upper - k) * n
+            y[lo - k:hi - k] = array('d', map(add, y[lo - k:hi - k], map(mul, data[start + lo:start + hi], x[lo:hi])))
+        if out is None:
+            return y
+        out[:] = y
+        return out
+
+    def __mul__(self, other):
+        if isinstance(other, matrix):
+            if other.rows() != self.n:
+                raise ValueError("Incompatible dimensions for matrix multiplication.")
+            return matrix.from_columns([self.matvec(other._col_seq(j)) for j in range(other.cols())])
+        return self.matvec(other)
+
+    def to_matrix(self) -> matrix:
+        n = self.n
+        return matrix.from_function(n, n, lambda i, j: self[i, j])
+
+    def lu(self) -> 'BandedLU':
+        return BandedLU(self)
+
+    def solve(self, b):
+        """Solves A x = b through a pivoted band LU; see BandedLU.solve."""
+        return BandedLU(self).solve(b)
+
+    def __repr__(self):
+        return f"Banded(n={self.n}, lower={self.lower}, upper={self.upper})"
+
+class BandedLU:
+    """
+    LU factorization with partial pivoting of a Banded matrix.
+
+    Row exchanges let U grow to lower + upper superdiagonals (the fill-in
+    LAPACK's gbtrf also allows for), but never beyond, so factoring costs
+    O(n * lower * (lower + upper)). As with LU, a singular matrix factors
+    without error (det() is then 0), but solving with it raises ValueError.
+    """
+    __slots__ = ['n', 'piv', 'mult', 'U', 'sign', 'singular']
+
+    def __init__(self, A: Banded):
+        n, kl, ku = A.n, A.lower, A.upper
+        data = A.data.tolist()
+        starts = [max(0, i - kl) for i in range(n)]
+        # Row i as its values from column starts[i] onwards
+        rows = [[data[(ku + i - j) * n + j] for j in range(starts[i], min(n, i + ku + 1))] for i in range(n)]
+        piv = list(range(n))
+        mult = []
+        U = []
+        sign = 1
+        singular = False
+        for k in range(n):
+            last = min(n, k + kl + 1)
+            # Rows below k that reach column k all start there
+            p = max(range(k, last), key=lambda i: abs(rows[i][0]) if starts[i] == k else 0.0)
+            if p != k:
+                rows[k], rows[p] = rows[p], rows[k]
+                starts[k], starts[p] = starts[p], starts[k]
+                sign = -sign
+            piv[k] = p
+            pivot_row = rows[k] if starts[k] == k else [0.0]
+            pivot = pivot_row[0]
+            tail = pivot_row[1:]
+            factors = []
+            if pivot == 0.0:
+                singular = True
+            for i in range(k + 1, last):
+                if starts[i] != k:
+                    factors.append(0.0)
+                    continue
+                row = rows[i]
+                f = row[0] / pivot if pivot != 0.0 else 0.0
+                factors.append(f)
+                rest = row[1:]
+                if len(rest) < len(tail):
+                    rest.extend(repeat(0.0, len(tail) - len(rest)))
+                if f != 0.0:
+                    rest[:len(tail)] = list(map(sub, rest[:len(tail)], map(mul, tail, repeat(f))))
+                rows[i] = rest
+                starts[i] = k + 1
+            mult.append(factors)
+            U.append(pivot_row)
+        self.n = n
+        self.piv = piv
+        self.mult = mult
+        self.U = U
+        self.sign = sign
+        self.singular = singular
+
+    def _check(self):
+        if self.singular:
+            raise ValueError("Matrix is singular.")
+
+    def _solve_vector(self, y):
+        U = self.U
+        for k, (p, factors) in enumerate(zip(self.piv, self.mult)):
+            if p != k:
+                y[k], y[p] = y[p], y[k]
+            yk = y[k]
+            if yk != 0.0:
+                for j, f in enumerate(factors, k + 1):
+                    y[j] -= f * yk
+        for k in range(self.n - 1, -1, -1):
+            row = U[k]
+            y[k] = (y[k] - _dot(row[1:], y[k + 1:k + len(row)])) / row[0]
+        return y
+
+    def _solve_rows(self, Y):
+        U = self.U
+        for k, (p, factors) in enumerate(zip(self.piv, self.mult)):
+            if p != k:
+                Y[k], Y[p] = Y[p], Y[k]
+            yk = Y[k]
+            for j, f in enumerate(factors, k + 1):
+                if f != 0.0:
+                    Y[j] = _axpy_row(Y[j], f, yk)
+        for k in range(self.n - 1, -1, -1):
+            row = U[k]
+            acc = Y[k]
+            for j, u in enumerate(row[1:], k + 1):
+                if u != 0.0:
+                    acc = _axpy_row(acc, u, Y[j])
+            Y[k] = [v / row[0] for v in acc]
+        return Y
+
+    def solve(self, b):
+        """
+        Solves A x = b.
+
+        b: sequence of n floats, or n x m matrix of right-hand sides
+        Returns: array('d') or matrix to match b
+        """
+        self._check()
+        if isinstance(b, matrix):
+            return matrix(self._solve_rows(_rhs_rows(b, self.n)))
+        return array('d', self._solve_vector(_rhs_vector(b, self.n)))
+
+    def det(self) -> float:
+        if self.singular:
+            return 0.0
+        d = float(self.sign)
+        for row in self.U:
+            d *= row[0]
+        return d
+
+    def __repr__(self):
+        return f"BandedLU(n={self.n}, det={self.det()})"
+
+class Tridiagonal:
+    """
+    Tridiagonal system solved with the Thomas algorithm.
+
+    lower : sequence of n - 1 floats, A[i+1, i]
+    diag : sequence of n floats, A[i, i]
+    upper : sequence of n - 1 floats, A[i, i+1]
+
+    The elimination runs without pivoting, which is stable for diagonally
+    dominant or symmetric positive definite matrices (the usual case for
+    chains, splines and diffusion). A zero pivot raises ValueError; use
+    Banded.from_diagonals({-1: lower, 0: diag, 1: upper}).solve() then.
+    The forward sweep is independent of the right-hand side, so it is done
+    once here and every solve costs about 5n operations.
+    """
+    __slots__ = ['n', 'lower', 'diag', 'upper', '_cp', '_den']
+
+    def __init__(self, lower, diag, upper):
+        n = len(diag)
+        if len(lower) != n - 1 or len(upper) != n - 1:
+            raise ValueError("lower and upper diagonals need n - 1 entries.")
+        self.n = n
+        self.lower = array('d', lower)
+        self.diag = array('d', diag)
+        self.upper = array('d', upper)
+        # Modified superdiagonal c'_i and pivots of the forward sweep
+        cp = [0.0] * n
+        den = [0.0] * n
+        prev = 0.0
+        for i in range(n):
+            d = self.diag[i] - (self.lower[i - 1] * prev if i > 0 else 0.0)
+            if d == 0.0:
+                raise ValueError(f"Zero pivot at row {i}; the matrix needs pivoting.")
+            den[i] = d
+            prev = cp[i] = self.upper[i] / d if i < n - 1 else 0.0
+        self._cp = cp
+        self._den = den
+
+    def shape(self):
+        return self.n, self.n
+
+    def _solve_vector(self, d):
+        a, cp, den = self.lower, self._cp, self._den
+        n = self.n
+        x = [0.0] * n
+        prev = 0.0
+        for i in range(n):
+            prev = x[i] = (d[i] - (a[i - 1] * prev if i > 0 else 0.0)) / den[i]
+        for i in range(n - 2, -1, -1):
+            x[i] -= cp[i] * x[i + 1]
+        return x
+
+    def _solve_rows(self, D):
+        a, cp, den = self.lower, self._cp, self._den
+        n = self.n
+        for i in range(n):
+            row = D[i] if i == 0 else _axpy_row(D[i], a[i - 1], D[i - 1])
+            D[i] = [v / den[i] for v in row]
+        for i in range(n - 2, -1, -1):
+            D[i] = _axpy_row(D[i], cp[i], D[i + 1])
+        return D
+
+    def solve(self, d):
+        """
+        Solves A x = d.
+
+        d: sequence of n floats, or n x m matrix of right-hand sides
+        Returns: array('d') or matrix to match d
+        """
+        if isinstance(d, matrix):
+            return matrix(self._solve_rows(_rhs_rows(d, self.n)))
+        return array('d', self._solve_vector(_rhs_vector(d, self.n)))
+
+    def matvec(self, x) -> array:
+        return self.to_banded().matvec(x)
+
+    def to_banded(self) -> Banded:
+        if self.n == 1:
+            return Banded.from_diagonals({0: self.diag})
+        return Banded.from_diagonals({-1: self.lower, 0: self.diag, 1: self.upper})
+
+    def to_matrix(self) -> matrix:
+        return self.to_banded().to_matrix()
+
+    def __repr__(self):
+        return f"Tridiagonal(n={self.n})"
+
+class CyclicTridiagonal:
+    """
+    Periodic tridiagonal system: a tridiagonal matrix plus the corner
+    entries A[0, n-1] = lower[0] and A[n-1, 0] = upper[n-1], as for a ring
+    of springs or periodic boundary conditions.
+
+    lower, diag, upper : sequences of n floats, with lower[i] = A[i, i-1]
+    and upper[i] = A[i, i+1] taken cyclically
+
+    Solved as a rank-one (Sherman-Morrison) correction of a Tridiagonal
+    system, so each solve costs two Thomas sweeps' worth; the correction
+    vector is computed once here. Needs n >= 3.
+    """
+    __slots__ = ['n', 'lower', 'diag', 'upper', '_tri', '_z', '_beta_over_gamma', '_denom']
+
+    def __init__(self, lower, diag, upper):
+        n = len(diag)
+        if n < 3:
+            raise ValueError("Cyclic tridiagonal systems need n >= 3.")
+        if len(lower) != n or len(upper) != n:
+            raise ValueError("lower, diag and upper need n entries each.")
+        alpha = upper[n - 1]    # A[n-1, 0]
+        beta = lower[0]         # A[0, n-1]
+        gamma = -diag[0] if diag[0] != 0.0 else -1.0
+        d = list(diag)
+        d[0] -= gamma
+        d[n - 1] -= alpha * beta / gamma
+        self.n = n
+        self.lower = array('d', lower)
+        self.diag = array('d', diag)
+        self.upper = array('d', upper)
+        self._tri = Tridiagonal(lower[1:], d, upper[:n - 1])
+        u = [0.0] * n
+        u[0], u[n - 1] = gamma, alpha
+        self._z = self._tri._solve_vector(u)
+        self._beta_over_gamma = beta / gamma
+        self._denom = 1.0 + self._z[0] + self._beta_over_gamma * self._z[n - 1]
+        if self._denom == 0.0:
+            raise ValueError("Matrix is singular.")
+
+    def shape(self):
+        return self.n, self.n
+
+    def _factor(self, x0, xn):
+        # (v . x) / (1 + v . z) with v = (1, 0, ..., 0, beta / gamma)
+        return (x0 + self._beta_over_gamma * xn) / self._denom
+
+    def solve(self, d):
+        """
+        Solves A x = d.
+
+        d: sequence of n floats, or n x m matrix of right-hand sides
+        Returns: array('d') or matrix to match d
+        """
+        n, z = self.n, self._z
+        if isinstance(d, matrix):
+            Y = self._tri._solve_rows(_rhs_rows(d, n))
+            f = [self._factor(a, b) for a, b in zip(Y[0], Y[n - 1])]
+            return matrix([list(map(sub, Y[i], map(mul, f, repeat(z[i])))) for i in range(n)])
+        y = self._tri._solve_vector(_rhs_vector(d, n))
+        f = self._factor(y[0], y[n - 1])
+        return array('d', map(sub, y, map(mul, z, repeat(f))))
+
+    def to_matrix(self) -> matrix:
+        n = self.n
+        m = matrix.zeros(n, n)
+        for i in range(n):
+            m[i, (i - 1) % n] = self.lower[i]
+            m[i, i] = self.diag[i]
+            m[i, (i + 1) % n] = self.upper[i]
+        return m
+
+    def __repr__(self):
+        return f"CyclicTridiagonal(n={self.n})"
@@ -0,0 +1,41 @@
+"""
+Buffer-protocol helpers shared by vector and matrix.
+
+Both types keep their numbers in a flat float64 buffer: an array('d') they
+own, or a 'd' memoryview onto memory owned by someone else (a bytearray,
+an mmap, a shared_memory block, a NumPy array). These helpers wrap foreign
+memory without copying and describe ours to consumers such as NumPy via
+__array_interface__, without importing NumPy.
+"""
+import sys
+
+# NumPy type string for native-endian float64
+FLOAT64_TYPESTR = ('<' if sys.byteorder == 'little' else '>') + 'f8'
+
+def _float_view(buffer, count: int, offset: int = 0) -> memoryview:
+    """
+    A 1-D 'd' memoryview of count float64 values starting offset bytes into
+    buffer. No data is copied: writes through the view reach buffer (and
+    fail with TypeError when buffer is read-only, e.g. bytes).
+    """
+    view = memoryview(buffer)
+    if not view.c_contiguous:
+        raise BufferError("Only C-contiguous buffers can be wrapped.")
+    if view.format != 'B':
+        view = view.cast('B')
+    stop = offset + 8 * count
+    if offset < 0 or stop > view.nbytes:
+        raise ValueError(f"Buffer of {view.nbytes} bytes is too small for {count} "
+                         f"float64 values at offset {offset}.")
+    return view[offset:stop].cast('d')
+
+def _array_interface(data, shape, strides=None, offset=0) -> dict:
+    """__array_interface__ (version 3) sharing data, an array('d') or 'd' memoryview."""
+    if isinstance(data, list):
+        raise TypeError("Components that are not plain floats (e.g. dual numbers) have no float64 buffer.")
+    interface = {'shape': shape, 'typestr': FLOAT64_TYPESTR, 'data': data, 'version': 3}
+    if strides is not None:
+        interface['strides'] = strides
+    if offset:
+        interface['offset'] = offset
+    return interface
@@ -0,0 +1,328 @@
+"""
+Symmetric eigenvalue problems A v = lambda v.
+
+eigh diagonalizes a dense symmetric matrix: cyclic Jacobi rotations for
+small matrices (the most accurate choice, and fast enough below a dozen
+rows), Householder reduction to tridiagonal form followed by implicit QL
+iterations with Wilkinson shifts for larger ones. lanczos finds a few
+extreme eigenpairs of a large sparse operator using only products A*x.
+
+Eigenvectors are kept as rows internally so every rotation is one map()
+over two rows; they are returned as the columns of a matrix.
+"""
+import random
+from array import array
+from itertools import repeat
+from operator import add, sub, mul
+from phimath.linalg.matrix import matrix, _dot
+from phimath.linalg.sparse import CSR, CSC
+from phimath.linalg.solvers import _operator
+from phimath.math.func import sqrt
+from phimath.control.numeric import EPSILON, iteration_limit
+
+_MACHEPS = 2.220446049250313e-16
+
+# Matrices up to this size are diagonalized with Jacobi rotations by default
+JACOBI_LIMIT = 10
+
+class EigenResult:
+    """
+    Eigenvalues and eigenvectors of a symmetric matrix.
+
+    values : array('d')
+        Eigenvalues in ascending order.
+    vectors : matrix or None
+        Orthonormal eigenvectors as columns, in the order of values.
+    iterations : int
+        Jacobi sweeps, QL iterations or Lanczos steps performed.
+
+    Unpacks as values, vectors = eigh(A).
+    """
+    __slots__ = ['values', 'vectors', 'iterations']
+
+    def __init__(self, values, vectors, iterations):
+        self.values = values
+        self.vectors = vectors
+        self.iterations = iterations
+
+    def __iter__(self):
+        return iter((self.values, self.vectors))
+
+    def __repr__(self):
+        return f"EigenResult(values={list(self.values)}, iterations={self.iterations})"
+
+def _rotate(x, y, c, s):
+    """(c x - s y, s x + c y) for two rows."""
+    return (list(map(sub, map(mul, x, repeat(c)), map(mul, y, repeat(s)))),
+            list(map(add, map(mul, x, repeat(s)), map(mul, y, repeat(c)))))
+
+def _symmetric_rows(A):
+    if isinstance(A, (CSR, CSC)):
+        A = A.to_matrix()
+    rows = A.tolist() if isinstance(A, matrix) else [[float(v) for v in row] for row in A]
+    n = len(rows)
+    if any(len(row) != n for row in rows):
+        raise ValueError("Eigenvalue problems need a square matrix.")
+    scale = max((abs(v) for row in rows for v in row), default=0.0)
+    for i in range(n):
+        for j in range(i):
+            if abs(rows[i][j] - rows[j][i]) > 1e-10 * scale:
+                raise ValueError(f"Matrix is not symmetric: A[{i}, {j}] != A[{j}, {i}].")
+    return rows
+
+def _jacobi(a, max_sweeps):
+    """Cyclic Jacobi; diagonalizes the list of rows a in place. Returns (eigenvector rows, sweeps)."""
+    n = len(a)
+    V = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+    sweeps = 0
+    while True:
+        off = sum(a[i][j] * a[i][j] for i in range(n) for j in range(i + 1, n))
+        diag = sum(a[i][i] * a[i][i] for i in range(n))
+        if off <= (_MACHEPS * _MACHEPS) * diag or off == 0.0:
+            return V, sweeps
+        iteration_limit(sweeps, max_sweeps)
+        sweeps += 1
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                apq = a[p][q]
+                if apq == 0.0:
+                    continue
+                # Rotation angle that zeroes A[p, q] (the smaller root for stability)
+                theta = (a[q][q] - a[p][p]) / (2.0 * apq)
+                t = (1.0 if theta >= 0 else -1.0) / (abs(theta) + sqrt(theta * theta + 1.0))
+                c = 1.0 / sqrt(t * t + 1.0)
+                s = t * c
+                # A <- J^T A J: rotate rows p, q, then columns p, q
+                a[p], a[q] = _rotate(a[p], a[q], c, s)
+                for row in a:
+                    rp, rq = row[p], row[q]
+                    row[p] = c * rp - s * rq
+                    row[q] = s * rp + c * rq
+                a[p][q] = a[q][p] = 0.0
+                V[p], V[q] = _rotate(V[p], V[q], c, s)
+
+def _tridiagonalize(a, vectors):
+    """
+    Householder reduction of the symmetric rows a (destroyed) to tridiagonal
+    form T = Q^T A Q. Returns (d, e, Q^T as rows or None) with d the diagonal
+    and e[i] = T[i+1, i] (e[n-1] = 0).
+    """
+    n = len(a)
+    Qt = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)] if vectors else None
+    for k in range(n - 2):
+        x = [a[i][k] for i in range(k + 1, n)]
+        xnorm = sqrt(_dot(x, x))
+        if xnorm == 0.0:
+            continue
+        alpha = -xnorm if x[0] >= 0 else xnorm
+        v = x
+        v[0] -= alpha
+        vtv = _dot(v, v)
+        if vtv == 0.0:
+            continue
+        tau = 2.0 / vtv
+        # Trailing block update A <- H A H with H = I - tau v v^T
+        p = [tau * _dot(a[i][k + 1:], v) for i in range(k + 1, n)]
+        K = tau * _dot(p, v) / 2.0
+        q = list(map(sub, p, map(mul, v, repeat(K))))
+        for i, (vi, qi) in enumerate(zip(v, q), k + 1):
+            row = a[i]
+            row[k + 1:] = list(map(sub, row[k + 1:], map(add, map(mul, q, repeat(vi)), map(mul, v, repeat(qi)))))
+        a[k + 1][k] = a[k][k + 1] = alpha
+        for i in range(k + 2, n):
+            a[i][k] = a[k][i] = 0.0
+        if vectors:
+            # Q <- Q H, i.e. Q^T <- H Q^T on rows k+1..n-1
+            w = [0.0] * n
+            for vi, row in zip(v, Qt[k + 1:]):
+                if vi != 0.0:
+                    w = list(map(add, w, map(mul, row, repeat(tau * vi))))
+            for i, vi in enumerate(v, k + 1):
+                if vi != 0.0:
+                    Qt[i] = list(map(sub, Qt[i], map(mul, w, repeat(vi))))
+    d = [a[i][i] for i in range(n)]
+    e = [a[i + 1][i] for i in range(n - 1)] + [0.0]
+    return d, e, Qt
+
+def _tql(d, e, Z, max_iter):
+    """
+    Implicit QL iterations with Wilkinson shifts on the tridiagonal (d, e),
+    in place. Rows of Z (eigenvector rows, or None) are rotated along.
+    Returns the number of iterations.
+    """
+    n = len(d)
+    total = 0
+    for l in range(n):
+        iterations = 0
+        while True:
+            m = l
+            while m < n - 1:
+                dd = abs(d[m]) + abs(d[m + 1])
+                if abs(e[m]) <= _MACHEPS * dd:
+                    break
+                m += 1
+            if m == l:
+                break
+            iteration_limit(iterations, max_iter)
+            iterations += 1
+            g = (d[l + 1] - d[l]) / (2.0 * e[l])
+            r = sqrt(g * g + 1.0)
+            g = d[m] - d[l] + e[l] / (g + (r if g >= 0 else -r))
+            s = c = 1.0
+            p = 0.0
+            deflated = False
+            for i in range(m - 1, l - 1, -1):
+                f = s * e[i]
+                b = c * e[i]
+                r = sqrt(f * f + g * g)
+                e[i + 1] = r
+                if r == 0.0:
+                    d[i + 1] -= p
+                    e[m] = 0.0
+                    deflated = True
+                    break
+                s = f / r
+                c = g / r
+                g = d[i + 1] - p
+                r = (d[i] - g) * s + 2.0 * c * b
+                p = s * r
+                d[i + 1] = g + p
+                g = c * r - b
+                if Z is not None:
+                    Z[i], Z[i + 1] = _rotate(Z[i], Z[i + 1], c, s)
+            if deflated:
+                continue
+            d[l] -= p
+            e[l] = g
+            e[m] = 0.0
+        total += iterations
+    return total
+
+def _sorted_result(values, rows, iterations):
+    order = sorted(range(len(values)), key=values.__getitem__)
+    vectors = matrix.from_columns([rows[i] for i in order]) if rows is not None else None
+    return EigenResult(array('d', [values[i] for i in order]), vectors, iterations)
+
+def eigh(A, vectors: bool = True, method: str = 'auto', max_iter: int = 60) -> EigenResult:
+    """
+    All eigenvalues (and eigenvectors) of a real symmetric matrix.
+
+    A: matrix, CSR/CSC matrix or list of rows; must be symmetric
+    vectors: also compute the orthonormal eigenvectors
+    method: 'jacobi' (rotations, best for small matrices), 'qr' (Householder
+        tridiagonalization + implicit QL) or 'auto' (jacobi up to JACOBI_LIMIT rows)
+    max_iter: limit on Jacobi sweeps, or on QL iterations per eigenvalue
+        (RuntimeError when reached)
+    Returns: EigenResult with ascending values
+    """
+    a = _symmetric_rows(A)
+    n = len(a)
+    if method == 'auto':
+        method = 'jacobi' if n <= JACOBI_LIMIT else 'qr'
+    if method == 'jacobi':
+        V, sweeps = _jacobi(a, max_iter)
+        return _sorted_result([a[i][i] for i in range(n)], V if vectors else None, sweeps)
+    if method == 'qr':
+        d, e, Z = _tridiagonalize(a, vectors)
+        iterations = _tql(d, e, Z, max_iter)
+        return _sorted_result(d, Z, iterations)
+    raise ValueError(f"Unknown method: {method}")
+
+def eigvalsh(A, method: str = 'auto') -> array:
+    """Eigenvalues of a real symmetric matrix in ascending order."""
+    return eigh(A, vectors=False, method=method).values
+
+def lanczos(A, k: int = 6, which: str = 'largest', n: int = None, v0=None,
+            tol: float = EPSILON, max_iter: int = None) -> EigenResult:
+    """
+    The k largest or smallest eigenpairs of a large symmetric operator.
+
+    Builds an orthonormal Krylov basis (fully reorthogonalized, so no ghost
+    eigenvalues appear) one product A*x at a time, and stops when the k
+    wanted Ritz pairs have residuals ||A x - theta x|| below
+    tol * max(1, |theta|). Only the basis and a small tridiagonal matrix are
+    stored; A is never formed. A single Krylov sequence sees one copy of
+    each repeated eigenvalue, so degenerate modes are reported once.
+
+    A: matrix, sparse or banded matrix, or function x -> A*x (then n or v0 is needed)
+    k: number of eigenpairs
+    which: 'largest' or 'smallest' (algebraic)
+    n: dimension, when A is a function
+    v0: starting vector (a fixed pseudo-random one when None)
+    tol: relative residual tolerance
+    max_iter: limit on Lanczos steps (default n; RuntimeError when reached
+        before convergence)
+    Returns: EigenResult with the k values ascending and the Ritz vectors as columns
+    """
+    if which not in ('largest', 'smallest'):
+        raise ValueError(f"Unknown selection: {which}")
+    if n is None:
+        n = A.shape()[0] if hasattr(A, 'shape') else (len(v0) if v0 is not None else None)
+        if n is None:
+            raise ValueError("The dimension n is needed when A is a function.")
+    if not 0 < k <= n:
+        raise ValueError(f"k must be between 1 and {n}.")
+    op = _operator(A, n)
+    rng = random.Random(0)
+    max_iter = n if max_iter is None else max_iter
+
+    def _unit(v):
+        # Orthogonalize against the basis (twice is enough) and normalize
+        for _ in range(2):
+            for Vi in V:
+                v = list(map(sub, v, map(mul, Vi, repeat(_dot(v, Vi)))))
+        norm = sqrt(_dot(v, v))
+        return [x / norm for x in v] if norm > 0.0 else None
+
+    V = []
+    v = _unit(list(v0) if v0 is not None else [rng.uniform(-1.0, 1.0) for _ in range(n)])
+    if v is None:
+        raise ValueError("Starting vector must be nonzero.")
+    V.append(v)
+    alpha, beta = [], []
+    steps = 0
+    while True:
+        iteration_limit(steps, max_iter)
+        steps += 1
+        j = len(V) - 1
+        w = list(op(V[j]))
+        if j > 0:
+            w = list(map(sub, w, map(mul, V[j - 1], repeat(beta[j - 1]))))
+        a = _dot(w, V[j])
+        alpha.append(a)
+        w = list(map(sub, w, map(mul, V[j], repeat(a))))
+        for Vi in V:
+            w = list(map(sub, w, map(mul, Vi, repeat(_dot(w, Vi)))))
+        b = sqrt(_dot(w, w))
+        m = j + 1
+
+        if m >= k and (m == n or m % 5 == 0 or b == 0.0 or m >= max_iter):
+            # Ritz values from the small tridiagonal matrix. Rotations act on
+            # rows, so tracking only the last component of each eigenvector
+            # is enough for the residuals |b * s_last|.
+            d, e = list(alpha), list(beta[:m - 1]) + [0.0]
+            last = [[1.0 if i == m - 1 else 0.0] for i in range(m)]
+            _tql(d, e, last, 60)
+            order = sorted(range(m), key=d.__getitem__)
+            wanted = order[:k] if which == 'smallest' else order[m - k:]
+            if m == n or all(abs(b * last[i][0]) <= tol * max(1.0, abs(d[i])) for i in wanted):
+                d, e = list(alpha), list(beta[:m - 1]) + [0.0]
+                S = [[1.0 if i == r else 0.0 for r in range(m)] for i in range(m)]
+                _tql(d, e, S, 60)
+                cols = []
+                for i in wanted:
+                    x = [0.0] * n
+                    for s, Vj in zip(S[i], V):
+                        if s != 0.0:
+                            x = list(map(add, x, map(mul, Vj, repeat(s))))
+                    cols.append(x)
+                return EigenResult(array('d', [d[i] for i in wanted]), matrix.from_columns(cols), steps)
+
+        if b <= _MACHEPS * max(1.0, abs(a)):
+            # Invariant subspace: continue from a fresh direction (beta = 0 splits T)
+            v = _unit([rng.uniform(-1.0, 1.0) for _ in range(n)])
+            beta.append(0.0)
+        else:
+            v = [x / b for x in w]
+            beta.append(b)
+        V.append(v)
@@ -0,0 +1,190 @@
+"""
+LU factorization with partial pivoting.
+
+Factor once, then solve, invert or take the determinant for O(n^2) per
+right-hand side instead of repeating the O(n^3) elimination.
+"""
+from array import array
+from itertools import repeat
+from operator import mul, sub
+from phimath.linalg.matrix import matrix, _dot
+from phimath.linalg.vectors import vector
+
+class LU:
+    """
+    Pivoted LU factorization PA = LU of a square matrix.
+
+    A : matrix or list of rows
+        The matrix to factor. It is copied, never modified.
+
+    L (unit lower) and U share one row-major table; piv[i] is the row of A
+    that ended up in row i. A singular matrix factors without error
+    (det() is then 0), but solving with it raises ValueError. Only an exact
+    zero pivot counts as singular; use rcond() to detect matrices that are
+    singular up to rounding.
+    """
+    __slots__ = ['n', '_rows', 'piv', 'sign', 'singular', '_anorm']
+
+    def __init__(self, A):
+        rows = A.tolist() if isinstance(A, matrix) else [[float(v) for v in row] for row in A]
+        n = len(rows)
+        if any(len(row) != n for row in rows):
+            raise ValueError("LU factorization needs a square matrix.")
+        # 1-norm (largest column sum), kept for condition estimates
+        self._anorm = max((sum(abs(rows[i][j]) for i in range(n)) for j in range(n)), default=0.0)
+
+        piv = list(range(n))
+        sign = 1
+        singular = False
+        for k in range(n):
+            p = max(range(k, n), key=lambda i: abs(rows[i][k]))
+            if rows[p][k] == 0.0:
+                singular = True
+                continue
+            if p != k:
+                rows[k], rows[p] = rows[p], rows[k]
+                piv[k], piv[p] = piv[p], piv[k]
+                sign = -sign
+            row_k = rows[k]
+            pivot = row_k[k]
+            tail = row_k[k + 1:]
+            for i in range(k + 1, n):
+                row_i = rows[i]
+                factor = row_i[k] / pivot
+                row_i[k] = factor
+                if factor != 0.0:
+                    row_i[k + 1:] = list(map(sub, row_i[k + 1:], map(mul, tail, repeat(factor))))
+        self.n = n
+        self._rows = rows
+        self.piv = piv
+        self.sign = sign
+        self.singular = singular
+
+    @classmethod
+    def _from_packed(cls, rows, piv, sign, singular, anorm):
+        """Wraps factors computed elsewhere (e.g. parallel_lu) in the same packed layout."""
+        lu = cls.__new__(cls)
+        lu.n = len(rows)
+        lu._rows = rows
+        lu.piv = piv
+        lu.sign = sign
+        lu.singular = singular
+        lu._anorm = anorm
+        return lu
+
+    def _check(self):
+        if self.singular:
+            raise ValueError("Matrix is singular.")
+
+    def _solve_column(self, b):
+        rows = self._rows
+        n = self.n
+        x = [b[p] for p in self.piv]
+        for i in range(1, n):
+            x[i] -= _dot(rows[i][:i], x[:i])
+        for i in range(n - 1, -1, -1):
+            row = rows[i]
+            x[i] = (x[i] - _dot(row[i + 1:], x[i + 1:])) / row[i]
+        return x
+
+    def _solve_transpose_column(self, b):
+        rows = self._rows
+        n = self.n
+        # U^T z = b, then L^T w = z, then x = P^T w
+        z = [float(v) for v in b]
+        for i in range(n):
+            s = z[i]
+            for k in range(i):
+                s -= rows[k][i] * z[k]
+            z[i] = s / rows[i][i]
+        for i in range(n - 2, -1, -1):
+            s = z[i]
+            for k in range(i + 1, n):
+                s -= rows[k][i] * z[k]
+            z[i] = s
+        x = [0.0] * n
+        for i, p in enumerate(self.piv):
+            x[p] = z[i]
+        return x
+
+    def solve(self, b):
+        """
+        Solves A x = b.
+
+        b: sequence of n floats, vector, or n x m matrix of right-hand sides
+        Returns: array('d'), vector or matrix to match b
+        """
+        self._check()
+        if isinstance(b, matrix):
+            if b.rows() != self.n:
+                raise ValueError(f"Right-hand side has {b.rows()} rows, expected {self.n}.")
+            cols = [self._solve_column(b._col_seq(j)) for j in range(b.cols())]
+            return matrix.from_columns(cols)
+        if isinstance(b, vector):
+            return vector(*self._solve_column([b.x, b.y, b.z]))
+        if len(b) != self.n:
+            raise ValueError(f"Right-hand side has {len(b)} entries, expected {self.n}.")
+        return array('d', self._solve_column(b))
+
+    def solve_transpose(self, b):
+        """Solves A^T x = b for a sequence b; returns array('d')."""
+        self._check()
+        return array('d', self._solve_transpose_column(b))
+
+    def det(self) -> float:
+        d = float(self.sign)
+        for i in range(self.n):
+            d *= self._rows[i][i]
+        return d
+
+    def inverse(self) -> matrix:
+        self._check()
+        n = self.n
+        cols = [self._solve_column([1.0 if i == j else 0.0 for i in range(n)]) for j in range(n)]
+        return matrix.from_columns(cols)
+
+    def L(self) -> matrix:
+        """Unit lower-triangular factor (of the row-permuted matrix PA)."""
+        n = self.n
+        return matrix.from_function(n, n, lambda i, j: 1.0 if i == j else (self._rows[i][j] if j < i else 0.0))
+
+    def U(self) -> matrix:
+        n = self.n
+        return matrix.from_function(n, n, lambda i, j: self._rows[i][j] if j >= i else 0.0)
+
+    def inverse_norm1(self, exact: bool = False) -> float:
+        """
+        ||A^-1||_1, estimated with Hager's method from a few solves with A
+        and A^T (exact=True computes the full inverse instead).
+        """
+        self._check()
+        n = self.n
+        if exact or n <= 4:
+            inv = self.inverse()
+            return max(sum(abs(v) for v in inv._col_seq(j)) for j in range(n))
+        x = [1.0 / n] * n
+        estimate = 0.0
+        for _ in range(5):
+            y = self._solve_column(x)
+            estimate = sum(abs(v) for v in y)
+            xi = [1.0 if v >= 0 else -1.0 for v in y]
+            z = self._solve_transpose_column(xi)
+            j = max(range(n), key=lambda i: abs(z[i]))
+            if abs(z[j]) <= _dot(z, x):
+                break
+            x = [0.0] * n
+            x[j] = 1.0
+        return estimate
+
+    def cond(self, exact: bool = False) -> float:
+        """1-norm condition number ||A||_1 ||A^-1||_1 (inf when singular)."""
+        if self.singular:
+            return float('inf')
+        return self._anorm * self.inverse_norm1(exact)
+
+    def rcond(self, exact: bool = False) -> float:
+        """Reciprocal condition number: near 0 for ill-conditioned matrices."""
+        return 1.0 / self.cond(exact)
+
+    def __repr__(self):
+        return f"LU(n={self.n}, det={self.det()})"
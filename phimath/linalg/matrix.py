@@ -1,115 +1,442 @@
+from array import array
+from operator import add, sub, mul
 from phimath.math.trigo import *
 from phimath.math.constants import *
+from phimath.linalg.buffers import _float_view, _array_interface
+
+try:
+    from math import sumprod as _dot    # Python 3.12+
+except ImportError:
+    def _dot(a, b):
+        return sum(map(mul, a, b))
+
+# Width of the column panels of the right operand held in memory by matmul
+MATMUL_TILE = 128
+
+def _matmul_kernel(a, b, n, k, m, tile, c=None):
+    """
+    Row-major product of a (n x k) and b (k x m), written into c.
+
+    Each entry is one C-level dot product of a row of a with a column of b,
+    which beats i-k-j row updates under CPython. Columns of b are gathered
+    into contiguous panels of at most tile columns, so the working set stays
+    bounded while every row of a sweeps the panel.
+    """
+    a_rows = [a[i * k:(i + 1) * k] for i in range(n)]
+    if m <= tile:
+        # One panel holds every column: build the result in a single pass
+        cols = [b[j::m] for j in range(m)]
+        values = [_dot(row, col) for row in a_rows for col in cols]
+        if c is None:
+            return array('d', values)
+        c[:] = array('d', values)
+        return c
+    if c is None:
+        c = array('d', bytes(8 * n * m))
+    for j0 in range(0, m, tile):
+        j1 = min(j0 + tile, m)
+        panel = [b[j::m] for j in range(j0, j1)]
+        base = j0
+        for row in a_rows:
+            c[base:base + j1 - j0] = array('d', [_dot(row, col) for col in panel])
+            base += m
+    return c
+
+def _quarters(a, rows, cols, r2, c2):
+    """Splits a row-major rows x cols buffer into four r2 x c2 blocks, zero-padded."""
+    pad = array('d', bytes(8 * (2 * c2 - cols)))
+    blocks = [array('d'), array('d'), array('d'), array('d')]
+    for i in range(2 * r2):
+        if i < rows:
+            row = a[i * cols:(i + 1) * cols] + pad
+        else:
+            row = array('d', bytes(16 * c2))
+        top = 0 if i < r2 else 2
+        blocks[top].extend(row[:c2])
+        blocks[top + 1].extend(row[c2:])
+    return blocks
+
+def _add(x, y):
+    return array('d', list(map(add, x, y)))
+
+def _sub(x, y):
+    return array('d', list(map(sub, x, y)))
+
+def _strassen(a, b, n, k, m, threshold, tile):
+    if min(n, k, m) < threshold:
+        return _matmul_kernel(a, b, n, k, m, tile)
+    n2, k2, m2 = (n + 1) // 2, (k + 1) // 2, (m + 1) // 2
+    a11, a12, a21, a22 = _quarters(a, n, k, n2, k2)
+    b11, b12, b21, b22 = _quarters(b, k, m, k2, m2)
+    mult = lambda x, y: _strassen(x, y, n2, k2, m2, threshold, tile)
+    m1 = mult(_add(a11, a22), _add(b11, b22))
+    m2_ = mult(_add(a21, a22), b11)
+    m3 = mult(a11, _sub(b12, b22))
+    m4 = mult(a22, _sub(b21, b11))
+    m5 = mult(_add(a11, a12), b22)
+    m6 = mult(_sub(a21, a11), _add(b11, b12))
+    m7 = mult(_sub(a12, a22), _add(b21, b22))
+    c11 = _add(_sub(_add(m1, m4), m5), m7)
+    c12 = _add(m3, m5)
+    c21 = _add(m2_, m4)
+    c22 = _add(_add(_sub(m1, m2_), m3), m6)
+
+    # Reassemble and crop the padding
+    c = array('d')
+    for i in range(n):
+        top, bottom = (c11, c12) if i < n2 else (c21, c22)
+        r = i if i < n2 else i - n2
+        c.extend(top[r * m2:(r + 1) * m2])
+        c.extend(bottom[r * m2:r * m2 + m - m2])
+    return c
 
 
 class matrix:
+    """
+    Dense matrix of floats in flat row-major array('d') storage.
+
+    Element (i, j) lives at data[_offset + i * _rs + j * _cs]. Shape and
+    strides are cached when the matrix is built, so shape() and indexing
+    never recompute them. transpose(), row(), col(), block() and slicing
+    (m[i, :], m[:, j], m[a:b, c:d]) return views that share data with the
+    original; use copy() for an independent matrix.
+    """
 
-    __slots__ = ['data', '_rows', '_cols']
+    __slots__ = ['data', '_rows', '_cols', '_offset', '_rs', '_cs']
 
     def __init__(self, data):
-        self.data = data
+        if isinstance(data, matrix):
+            data = data.tolist()
+        buf = array('d')
+        cols = None
+        n = 0
+        for row in data:
+            if cols is None:
+                cols = len(row)
+            elif len(row) != cols:
+                raise ValueError("All rows must have the same length.")
+            buf.extend(row)
+            n += 1
+        self.data = buf
+        self._rows = n
+        self._cols = cols or 0
+        self._offset = 0
+        self._rs = self._cols
+        self._cs = 1
+
+    @classmethod
+    def _view(cls, data, rows, cols, offset, rs, cs):
+        m = object.__new__(cls)
+        m.data = data
+        m._rows = rows
+        m._cols = cols
+        m._offset = offset
+        m._rs = rs
+        m._cs = cs
+        return m
+
+    # Bulk constructors
+
+    @classmethod
+    def from_flat(cls, values, rows: int, cols: int):
+        """Wraps row-major values (no copy when values is already an array('d'))."""
+        data = values if isinstance(values, array) and values.typecode == 'd' else array('d', values)
+        if len(data) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} values for a {rows}x{cols} matrix, got {len(data)}.")
+        return cls._view(data, rows, cols, 0, cols, 1)
+
+    @classmethod
+    def from_buffer(cls, buffer, rows: int, cols: int, offset: int = 0):
+        """
+        Wraps rows * cols row-major float64 values starting offset bytes into
+        any buffer (bytearray, mmap, shared memory, array, ...) without
+        copying; element writes go straight to that memory.
+        """
+        return cls._view(_float_view(buffer, rows * cols, offset), rows, cols, 0, cols, 1)
+
+    @classmethod
+    def frombytes(cls, data: bytes, rows: int, cols: int):
+        """Copies a matrix out of row-major native float64 bytes (see tobytes)."""
+        if len(data) != 8 * rows * cols:
+            raise ValueError(f"A {rows}x{cols} matrix needs {8 * rows * cols} bytes, got {len(data)}.")
+        buf = array('d')
+        buf.frombytes(data)
+        return cls._view(buf, rows, cols, 0, cols, 1)
+
+    @classmethod
+    def zeros(cls, rows: int, cols: int = None):
+        cols = rows if cols is None else cols
+        return cls._view(array('d', bytes(8 * rows * cols)), rows, cols, 0, cols, 1)
+
+    @classmethod
+    def full(cls, rows: int, cols: int, value: float):
+        return cls._view(array('d', [value]) * (rows * cols), rows, cols, 0, cols, 1)
+
+    @classmethod
+    def identity(cls, n: int):
+        m = cls.zeros(n, n)
+        m.data[::n + 1] = array('d', [1.0]) * n
+        return m
+
+    @classmethod
+    def diag(cls, values):
+        values = list(values)
+        n = len(values)
+        m = cls.zeros(n, n)
+        m.data[::n + 1] = array('d', values)
+        return m
+
+    @classmethod
+    def from_function(cls, rows: int, cols: int, f: callable):
+        """Builds the matrix with entries f(i, j)."""
+        return cls._view(array('d', [f(i, j) for i in range(rows) for j in range(cols)]), rows, cols, 0, cols, 1)
+
+    @classmethod
+    def from_columns(cls, columns):
+        return cls(columns).transpose().copy()
+
+    # Element access and views
+
+    def _index(self, i, j):
+        """Buffer position of element (i, j); negative indices count from the end."""
+        idx = (i, j)
+        if i < 0:
+            i += self._rows
+        if j < 0:
+            j += self._cols
+        if not (0 <= i < self._rows and 0 <= j < self._cols):
+            raise IndexError(f"Index {idx} out of range for a {self._rows}x{self._cols} matrix.")
+        return self._offset + i * self._rs + j * self._cs
 
     def __getitem__(self, idx):
         i, j = idx
-        return self.data[i][j]
+        if type(i) is slice or type(j) is slice:
+            return self._slice(i, j)
+        return self.data[self._index(i, j)]
 
     def __setitem__(self, idx, value):
         i, j = idx
-        self.data[i][j] = value
+        if type(i) is slice or type(j) is slice:
+            view = self._slice(i, j)
+            if isinstance(value, matrix):
+                value = value._flat()
+            elif not hasattr(value, '__len__'):
+                value = array('d', [value]) * (view._rows * view._cols)
+            view._assign(value)
+            return
+        self.data[self._index(i, j)] = value
+
+    def _slice(self, i, j):
+        if type(i) is slice:
+            r0, r1, rstep = i.indices(self._rows)
+        else:
+            r0 = i + self._rows if i < 0 else i
+            if not 0 <= r0 < self._rows:
+                raise IndexError(f"Row {i} out of range for a {self._rows}x{self._cols} matrix.")
+            r1, rstep = r0 + 1, 1
+        if type(j) is slice:
+            c0, c1, cstep = j.indices(self._cols)
+        else:
+            c0 = j + self._cols if j < 0 else j
+            if not 0 <= c0 < self._cols:
+                raise IndexError(f"Column {j} out of range for a {self._rows}x{self._cols} matrix.")
+            c1, cstep = c0 + 1, 1
+        if rstep < 1 or cstep < 1:
+            raise ValueError("Matrix views need positive slice steps.")
+        rows = max(0, (r1 - r0 + rstep - 1) // rstep)
+        cols = max(0, (c1 - c0 + cstep - 1) // cstep)
+        return matrix._view(self.data, rows, cols, self._offset + r0 * self._rs + c0 * self._cs,
+                            self._rs * rstep, self._cs * cstep)
+
+    def row(self, i: int):
+        """Zero-copy 1 x n view of row i."""
+        return self._slice(i, slice(None))
+
+    def col(self, j: int):
+        """Zero-copy n x 1 view of column j."""
+        return self._slice(slice(None), j)
+
+    def block(self, r0: int, r1: int, c0: int, c1: int):
+        """Zero-copy view of rows r0:r1 and columns c0:c1."""
+        return self._slice(slice(r0, r1), slice(c0, c1))
+
+    def _row_seq(self, i):
+        """Row i as an array('d') (a copy when the row is strided)."""
+        start = self._offset + i * self._rs
+        if self._cs == 1:
+            return self.data[start:start + self._cols]
+        return self.data[start:start + (self._cols - 1) * self._cs + 1:self._cs]
+
+    def _col_seq(self, j):
+        start = self._offset + j * self._cs
+        if self._rows == 0:
+            return array('d')
+        return self.data[start:start + (self._rows - 1) * self._rs + 1:self._rs]
+
+    def is_contiguous(self) -> bool:
+        """True when the elements occupy the whole buffer in row-major order."""
+        return self._cs == 1 and self._rs == self._cols and self._offset == 0 \
+            and len(self.data) == self._rows * self._cols
+
+    def _flat(self):
+        """Row-major elements: the buffer itself when contiguous, else a copy."""
+        if self.is_contiguous():
+            return self.data
+        out = array('d')
+        for i in range(self._rows):
+            out.extend(self._row_seq(i))
+        return out
+
+    def _assign(self, values):
+        if len(values) != self._rows * self._cols:
+            raise ValueError("Assigned values do not match the view's shape.")
+        cols = self._cols
+        for i in range(self._rows):
+            start = self._offset + i * self._rs
+            chunk = values[i * cols:(i + 1) * cols]
+            if not isinstance(chunk, array):
+                chunk = array('d', chunk)
+            if self._cs == 1:
+                self.data[start:start + cols] = chunk
+            else:
+                self.data[start:start + (cols - 1) * self._cs + 1:self._cs] = chunk
+
+    # Buffer interop
+
+    def memoryview(self) -> memoryview:
+        """
+        2-D (rows x cols) 'd' memoryview sharing the matrix's memory. Needs
+        the rows to be contiguous (e.g. not a transpose or column view;
+        copy() those first).
+        """
+        if self._cs != 1 or self._rs != self._cols:
+            raise BufferError("Only row-major contiguous matrices export a memoryview; use copy().")
+        flat = memoryview(self.data)[self._offset:self._offset + self._rows * self._cols]
+        return flat.cast('B').cast('d', (self._rows, self._cols))
+
+    def __buffer__(self, flags):
+        # Buffer protocol for Python 3.12+: memoryview(m), file.write(m), ...
+        return self.memoryview()
+
+    @property
+    def __array_interface__(self):
+        # Strided views (transposes, columns, blocks) are shared as they are
+        return _array_interface(self.data, (self._rows, self._cols),
+                                (8 * self._rs, 8 * self._cs), 8 * self._offset)
+
+    def tobytes(self) -> bytes:
+        """Row-major native float64 bytes (a copy, even for strided views)."""
+        return self._flat().tobytes()
+
+    def copy(self):
+        """Independent contiguous copy."""
+        return matrix._view(array('d', self._flat()), self._rows, self._cols, 0, self._cols, 1)
+
+    def tolist(self):
+        return [self._row_seq(i).tolist() for i in range(self._rows)]
 
     def shape(self):
-        return len(self.data), len(self.data[0]) if self.data else 0
-    
+        return self._rows, self._cols
+
     def rows(self):
-        return self.shape()[0]
-    
+        return self._rows
+
     def cols(self):
-        return self.shape()[1]
+        return self._cols
 
     def __add__(self, other):
         if self.shape() != other.shape():
             raise ValueError("Matrices must have the same dimensions to add.")
-        result = [
-            [
-                self.data[i][j] + other.data[i][j]
-                for j in range(self.shape()[1])
-            ]
-            for i in range(self.shape()[0])
-        ]
-        return matrix(result)
+        return matrix.from_flat(array('d', list(map(add, self._flat(), other._flat()))), self._rows, self._cols)
 
     def __sub__(self, other):
         if self.shape() != other.shape():
             raise ValueError("Matrices must have the same dimensions to subtract.")
-        result = [
-            [
-                self.data[i][j] - other.data[i][j]
-                for j in range(self.shape()[1])
-            ]
-            for i in range(self.shape()[0])
-        ]
-        return matrix(result)
+        return matrix.from_flat(array('d', list(map(sub, self._flat(), other._flat()))), self._rows, self._cols)
 
     def __mul__(self, other):
-        if self.shape()[1] != other.shape()[0]:
+        if isinstance(other, (int, float)):
+            return matrix.from_flat(array('d', [other * v for v in self._flat()]), self._rows, self._cols)
+        return self.matmul(other)
+
+    def matmul(self, other, out=None, tile: int = None, strassen: int = None):
+        """
+        Matrix product self * other.
+
+        out: matrix of the result's shape to write into (reused, not reallocated)
+        tile: width of the column panels of other held in memory (default MATMUL_TILE)
+        strassen: use Strassen's recursion while every dimension is at least
+            this size (None disables it; it trades some accuracy for fewer products)
+        """
+        n, k, m = self._rows, self._cols, other._cols
+        if k != other._rows:
             raise ValueError("Incompatible dimensions for matrix multiplication.")
-        result = [
-            [
-                sum(
-                    self.data[i][k] * other.data[k][j]
-                    for k in range(self.shape()[1])
-                )
-                for j in range(other.shape()[1])
-            ]
-            for i in range(self.shape()[0])
-        ]
-        return matrix(result)
+        tile = tile or MATMUL_TILE
+        a, b = self._flat(), other._flat()
+        if strassen is not None and min(n, k, m) >= max(strassen, 2):
+            c = _strassen(a, b, n, k, m, strassen, tile)
+        elif out is not None and out.is_contiguous() and out.data is not a and out.data is not b:
+            c = _matmul_kernel(a, b, n, k, m, tile, out.data)
+        else:
+            c = _matmul_kernel(a, b, n, k, m, tile)
+        if out is None:
+            return matrix.from_flat(c, n, m)
+        if out.shape() != (n, m):
+            raise ValueError(f"out must have shape {(n, m)}, not {out.shape()}.")
+        if c is not out.data:
+            out._assign(c)
+        return out
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return self * other
+        return NotImplemented
 
     def transpose(self):
-        result = [
-            [self.data[j][i] for j in range(self.shape()[0])]
-            for i in range(self.shape()[1])
-        ]
-        return matrix(result)
-    
+        """Zero-copy transposed view."""
+        return matrix._view(self.data, self._cols, self._rows, self._offset, self._cs, self._rs)
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def lu(self):
+        """Pivoted LU factorization; factor once and reuse it for many solves."""
+        from phimath.linalg.lu import LU
+        return LU(self)
+
+    def qr(self, pivoting: bool = False):
+        """Householder QR factorization (A P = Q R)."""
+        from phimath.linalg.qr import QR
+        return QR(self, pivoting)
+
+    def cholesky(self):
+        """Cholesky factorization A = L L^T of a symmetric positive definite matrix."""
+        from phimath.linalg.qr import Cholesky
+        return Cholesky(self)
+
     def determinant(self):
-        if self.shape()[0] != self.shape()[1]:
+        if self._rows != self._cols:
             raise ValueError("Determinant is only defined for square matrices.")
-        n = self.shape()[0]
-        if n == 1:
-            return self.data[0][0]
-        if n == 2:
-            return self.data[0][0] * self.data[1][1] - self.data[0][1] * self.data[1][0]
-        det = 0
-        for c in range(n):
-            minor = matrix([
-                [self.data[i][j] for j in range(n) if j != c]
-                for i in range(1, n)
-            ])
-            det += ((-1) ** c) * self.data[0][c] * minor.determinant()
-        return det
-    
+        return self.lu().det()
+
+    def inverse(self):
+        return self.lu().inverse()
+
     def rotate(self, angle, axis):
-        c = cos(angle)
-        s = sin(angle)
-        t = 1 - c
-                # Ensure axis is normalized for consistent rotation
-        axis = axis.normalize() 
-        x, y, z = axis.x, axis.y, axis.z
-                # Standard Rodriguez Rotation Formula (Active / Right-Hand Rule)
-        rotation_matrix = matrix([
-            [t*x*x + c,   t*x*y - s*z, t*x*z + s*y], 
-            [t*x*y + s*z, t*y*y + c,   t*y*z - s*x],
-            [-t*x*z + s*y, t*y*z + s*x, t*z*z + c ] # Note the sign changes here
-        ])
-        return rotation_matrix * self
+        """
+        Right-handed rotation by angle (radians) about axis, applied to
+        every column of this 3 x m matrix. The rotation is an unrolled Mat3,
+        so no general 3x3 matrix or O(n^3) product is built per call.
+        """
+        from phimath.linalg.rotations import Mat3
+        return Mat3.from_axis_angle(axis, angle).apply_matrix(self)
 
     def __repr__(self):
-        rows = [str(row) for row in self.data]
+        rows = [str(row) for row in self.tolist()]
         return "\n".join(rows)
-    
+
     def solve(self, b):
-        from phimath.linalg.solvers import gaussian_eleminator
     # 1. If 'b' is a list [1, 2, 3], turn it into a Column Matrix [[1], [2], [3]]
         if isinstance(b, list):
             b = matrix([[val] for val in b])
@@ -118,27 +445,20 @@ class matrix:
         elif hasattr(b, 'x'): # Checking if it's a Vector(x, y, z)
             b = matrix([[b.x], [b.y], [b.z]])
 
-        # Now gaussian_eleminator gets two Matrix objects: (N x N) and (N x 1)
-        return gaussian_eleminator(self, b)
-    
+        # Factor once and solve every column of b against the same LU
+        return self.lu().solve(b)
+
     def lu_decomposition(A):
         """
-        Performs LU Decomposition of matrix A.
-        Returns matrices L and U such that A = LU.
+        Performs LU Decomposition of matrix A with partial pivoting.
+        Returns matrices L and U such that A = LU; L is a row permutation
+        of a unit lower-triangular matrix. Use A.lu() to factor once and solve.
         """
-        n = A.rows()
-        L = matrix([[0 if i != j else 1 for j in range(n)] for i in range(n)])
-        U = matrix([[0 for _ in range(n)] for _ in range(n)])
-    
-        for i in range(n):
-            for j in range(i, n):
-                U[i, j] = A[i, j]
-                for k in range(i):
-                    U[i, j] -= L[i, k] * U[k, j]
-            for j in range(i + 1, n):
-                L[j, i] = A[j, i]
-                for k in range(i):
-                    L[j, i] -= L[j, k] * U[k, i]
-                L[j, i] /= U[i, i]
-    
-        return L, U
\ No newline at end of file
+        lu = A.lu()
+        n = lu.n
+        L = matrix.zeros(n, n)
+        lower = lu.L()
+        # Undo the row permutation so that A = LU holds exactly
+        for i, p in enumerate(lu.piv):
+            L[p, :] = lower.row(i)
+        return L, lu.U()
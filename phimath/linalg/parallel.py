@@ -0,0 +1,271 @@
+"""
+Process-parallel dense kernels on shared memory.
+
+Operands are copied once into multiprocessing.shared_memory blocks; worker
+processes attach to them by name and read and write their share in place,
+so no matrix data is ever pickled. The workers form one persistent pool,
+created on first use and reused by every later call (shutdown() releases it).
+
+Work is split into contiguous blocks of rows (or columns) of the result,
+one task per worker. Problems smaller than PARALLEL_THRESHOLD
+multiply-adds run serially, since starting tasks costs a few milliseconds.
+"""
+import os
+import atexit
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from operator import sub, mul
+from itertools import repeat
+from phimath.linalg.matrix import matrix, _matmul_kernel, MATMUL_TILE
+from phimath.linalg.lu import LU
+
+# Smallest problem (in multiply-adds) worth distributing across processes
+PARALLEL_THRESHOLD = 128 ** 3
+
+# Column width of the panels factored serially by parallel_lu
+LU_PANEL = 64
+
+_pool = None
+_pool_size = 0
+
+def _get_pool(processes):
+    global _pool, _pool_size
+    if _pool is None or _pool_size != processes:
+        shutdown()
+        _pool = ProcessPoolExecutor(max_workers=processes)
+        _pool_size = processes
+    return _pool
+
+def shutdown():
+    """Stops the persistent worker pool (it restarts on the next parallel call)."""
+    global _pool, _pool_size
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+        _pool_size = 0
+
+atexit.register(shutdown)
+
+def _processes(processes):
+    return (os.cpu_count() or 1) if processes is None else processes
+
+class _Shared:
+    """A float64 buffer in shared memory, with a 'd' memoryview onto it."""
+
+    def __init__(self, size=None, name=None):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(8 * size, 8))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.view = self.shm.buf.cast('d')
+
+    @classmethod
+    def from_buffer(cls, data):
+        s = cls(len(data))
+        s.view[:len(data)] = array('d', data)
+        return s
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self, unlink=False):
+        self.view.release()
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def _blocks(total, parts):
+    """Splits range(total) into at most parts contiguous (start, stop) blocks."""
+    parts = max(1, min(parts, total))
+    step = -(-total // parts)
+    return [(s, min(s + step, total)) for s in range(0, total, step)]
+
+# ---------------------------------------------------------------------------
+# Worker tasks: attach by name, work on a block, detach
+# ---------------------------------------------------------------------------
+
+def _matmul_rows_task(a_name, b_name, c_name, n, k, m, r0, r1, tile):
+    a, b, c = _Shared(name=a_name), _Shared(name=b_name), _Shared(name=c_name)
+    try:
+        # The kernel reads the shared views directly: nothing is copied per worker
+        c.view[r0 * m:r1 * m] = _matmul_kernel(a.view[r0 * k:r1 * k], b.view[:k * m], r1 - r0, k, m, tile)
+    finally:
+        a.close(), b.close(), c.close()
+
+def _matmul_cols_task(a_name, b_name, c_name, n, k, m, j0, j1, tile):
+    a, b, c = _Shared(name=a_name), _Shared(name=b_name), _Shared(name=c_name)
+    try:
+        w = j1 - j0
+        # Only this worker's k x w panel of B is gathered; A is read in place
+        panel = array('d')
+        for r in range(k):
+            panel.extend(b.view[r * m + j0:r * m + j1])
+        block = _matmul_kernel(a.view[:n * k], panel, n, k, w, tile)
+        for i in range(n):
+            c.view[i * m + j0:i * m + j1] = block[i * w:(i + 1) * w]
+    finally:
+        a.close(), b.close(), c.close()
+
+def _schur_task(a_name, n, k0, w, r0, r1, tile):
+    """A[r0:r1, k0+w:] -= A[r0:r1, k0:k0+w] * A[k0:k0+w, k0+w:] on the shared n x n matrix."""
+    a = _Shared(name=a_name)
+    try:
+        _schur_update(a.view, n, k0, w, r0, r1, tile)
+    finally:
+        a.close()
+
+def _schur_update(view, n, k0, w, r0, r1, tile):
+    c0 = k0 + w
+    m = n - c0
+    if m <= 0 or r1 <= r0:
+        return
+    L = array('d')
+    for i in range(r0, r1):
+        L.extend(view[i * n + k0:i * n + c0])
+    U = array('d')
+    for i in range(k0, c0):
+        U.extend(view[i * n + c0:(i + 1) * n])
+    prod = _matmul_kernel(L, U, r1 - r0, w, m, tile)
+    for t, i in enumerate(range(r0, r1)):
+        row = view[i * n + c0:(i + 1) * n]
+        view[i * n + c0:(i + 1) * n] = array('d', map(sub, row, prod[t * m:(t + 1) * m]))
+
+# ---------------------------------------------------------------------------
+# Public kernels
+# ---------------------------------------------------------------------------
+
+def parallel_matmul(A: matrix, B: matrix, processes: int = None, partition: str = 'auto',
+                    tile: int = None) -> matrix:
+    """
+    Matrix product A * B computed by a pool of worker processes.
+
+    processes: workers (default os.cpu_count()); 1 or a product below
+        PARALLEL_THRESHOLD multiply-adds runs A.matmul(B) serially
+    partition: 'rows' (each worker owns a block of rows of the result),
+        'cols' (a block of columns) or 'auto' (whichever dimension is larger)
+    tile: column panel width of the per-worker kernel (default MATMUL_TILE)
+    """
+    n, k, m = A.rows(), A.cols(), B.cols()
+    if k != B.rows():
+        raise ValueError("Incompatible dimensions for matrix multiplication.")
+    processes = _processes(processes)
+    if processes <= 1 or n * k * m < PARALLEL_THRESHOLD:
+        return A.matmul(B, tile=tile)
+    if partition == 'auto':
+        partition = 'rows' if n >= m else 'cols'
+    if partition not in ('rows', 'cols'):
+        raise ValueError(f"Unknown partition: {partition}")
+    tile = tile or MATMUL_TILE
+
+    a = _Shared.from_buffer(A._flat())
+    b = _Shared.from_buffer(B._flat())
+    c = _Shared(n * m)
+    try:
+        task = _matmul_rows_task if partition == 'rows' else _matmul_cols_task
+        blocks = _blocks(n if partition == 'rows' else m, processes)
+        pool = _get_pool(processes)
+        futures = [pool.submit(task, a.name, b.name, c.name, n, k, m, s, e, tile) for s, e in blocks]
+        for f in futures:
+            f.result()
+        return matrix.from_flat(array('d', c.view[:n * m]), n, m)
+    finally:
+        a.close(True), b.close(True), c.close(True)
+
+def parallel_lu(A, processes: int = None, panel: int = None) -> LU:
+    """
+    Blocked right-looking LU factorization with partial pivoting.
+
+    Each panel of columns is factored serially, then the trailing block is
+    updated (A22 -= L21 U12, where almost all the work is) by the worker
+    pool, each worker owning a block of rows of the shared matrix.
+    Returns the same LU object as LU(A), so solve, det, inverse and cond
+    work unchanged.
+
+    processes: workers (default os.cpu_count()); small matrices fall back to LU(A)
+    panel: panel width (default LU_PANEL)
+    """
+    rows = A.tolist() if isinstance(A, matrix) else [[float(v) for v in row] for row in A]
+    n = len(rows)
+    if any(len(row) != n for row in rows):
+        raise ValueError("LU factorization needs a square matrix.")
+    processes = _processes(processes)
+    if processes <= 1 or n ** 3 < PARALLEL_THRESHOLD:
+        return LU(rows)
+    nb = panel or LU_PANEL
+    anorm = max((sum(abs(rows[i][j]) for i in range(n)) for j in range(n)), default=0.0)
+
+    shared = _Shared(n * n)
+    view = shared.view
+    for i, row in enumerate(rows):
+        view[i * n:(i + 1) * n] = array('d', row)
+    del rows
+    piv = list(range(n))
+    sign = 1
+    singular = False
+    pool = _get_pool(processes)
+    try:
+        for k0 in range(0, n, nb):
+            w = min(nb, n - k0)
+            c0 = k0 + w
+            # 1. Factor the tall panel A[k0:, k0:c0] serially
+            P = [view[i * n + k0:i * n + c0].tolist() for i in range(k0, n)]
+            swaps = []
+            for j in range(w):
+                p = max(range(j, n - k0), key=lambda i: abs(P[i][j]))
+                if P[p][j] == 0.0:
+                    singular = True
+                    continue
+                if p != j:
+                    P[j], P[p] = P[p], P[j]
+                    swaps.append((k0 + j, k0 + p))
+                pivot_row = P[j]
+                pivot = pivot_row[j]
+                tail = pivot_row[j + 1:]
+                for i in range(j + 1, n - k0):
+                    row = P[i]
+                    f = row[j] / pivot
+                    row[j] = f
+                    if f != 0.0:
+                        row[j + 1:] = list(map(sub, row[j + 1:], map(mul, tail, repeat(f))))
+            # 2. Apply the row swaps to whole rows, then store the factored panel
+            for r, p in swaps:
+                tmp = array('d', view[r * n:(r + 1) * n])
+                view[r * n:(r + 1) * n] = view[p * n:(p + 1) * n]
+                view[p * n:(p + 1) * n] = tmp
+                piv[r], piv[p] = piv[p], piv[r]
+                sign = -sign
+            for t, i in enumerate(range(k0, n)):
+                view[i * n + k0:i * n + c0] = array('d', P[t])
+            if c0 >= n:
+                break
+            # 3. U12 = L11^-1 A12 (unit lower triangular solve on the panel's rows)
+            for j in range(1, w):
+                r = k0 + j
+                row = view[r * n + c0:(r + 1) * n].tolist()
+                for t in range(j):
+                    f = P[j][t]
+                    if f != 0.0:
+                        row = list(map(sub, row, map(mul, view[(k0 + t) * n + c0:(k0 + t + 1) * n], repeat(f))))
+                view[r * n + c0:(r + 1) * n] = array('d', row)
+            # 4. Trailing update A22 -= L21 U12, distributed by row blocks
+            trailing = n - c0
+            if trailing * trailing * w < PARALLEL_THRESHOLD:
+                _schur_update(view, n, k0, w, c0, n, MATMUL_TILE)
+            else:
+                futures = [pool.submit(_schur_task, shared.name, n, k0, w, c0 + s, c0 + e, MATMUL_TILE)
+                           for s, e in _blocks(trailing, processes)]
+                for f in futures:
+                    f.result()
+        packed = [view[i * n:(i + 1) * n].tolist() for i in range(n)]
+    finally:
+        shared.close(True)
+    return LU._from_packed(packed, piv, sign, singular, anorm)
+
+def parallel_solve(A, B, processes: int = None):
+    """
+    Solves A X = B (Gaussian elimination with partial pivoting) using
+    parallel_lu for the factorization. B may be a sequence, vector or matrix.
+    """
+    return parallel_lu(A, processes).solve(B)
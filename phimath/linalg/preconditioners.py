@@ -0,0 +1,192 @@
+"""
+Preconditioners for the Krylov solvers in phimath.linalg.solvers.
+
+A preconditioner M approximates A and is applied as z = M(r), the solution
+of M z = r. Each one is built once from the entries of A (a matrix or a
+sparse matrix) and then applied every iteration, so construction may be
+slow but application must be cheap.
+"""
+from array import array
+from operator import mul
+from phimath.linalg.matrix import matrix
+from phimath.linalg.sparse import CSR, CSC
+
+def _as_csr(A) -> CSR:
+    if isinstance(A, CSR):
+        return A
+    if isinstance(A, CSC):
+        return A.tocsr()
+    if isinstance(A, matrix):
+        return CSR.from_matrix(A)
+    raise TypeError(f"A preconditioner needs the entries of A (matrix, CSR or CSC), got {type(A).__name__}.")
+
+def _split(A: CSR):
+    """Splits each row of A into its strictly lower part, diagonal and strictly upper part."""
+    n = A.shape()[0]
+    ip, idx, data = A.indptr, A.indices, A.data
+    lower, upper, diag = [], [], array('d', bytes(8 * n))
+    for i in range(n):
+        lo_idx, lo_val, up_idx, up_val = [], [], [], []
+        for k in range(ip[i], ip[i + 1]):
+            j = idx[k]
+            if j < i:
+                lo_idx.append(j)
+                lo_val.append(data[k])
+            elif j > i:
+                up_idx.append(j)
+                up_val.append(data[k])
+            else:
+                diag[i] = data[k]
+        lower.append((lo_idx, lo_val))
+        upper.append((up_idx, up_val))
+    for i, d in enumerate(diag):
+        if d == 0.0:
+            raise ValueError(f"Zero on the diagonal at row {i}.")
+    return lower, diag, upper
+
+class Jacobi:
+    """
+    Diagonal (Jacobi) preconditioner: M = diag(A).
+
+    Cheapest to build and apply; effective when A is diagonally dominant
+    with badly scaled rows.
+    """
+    __slots__ = ['inv_diag']
+
+    def __init__(self, A):
+        if isinstance(A, (CSR, CSC)):
+            diag = A.diagonal()
+        elif isinstance(A, matrix):
+            diag = [A[i, i] for i in range(min(A.shape()))]
+        else:
+            raise TypeError(f"A preconditioner needs the entries of A (matrix, CSR or CSC), got {type(A).__name__}.")
+        if any(d == 0.0 for d in diag):
+            raise ValueError("Jacobi preconditioner needs a nonzero diagonal.")
+        self.inv_diag = array('d', [1.0 / d for d in diag])
+
+    def __call__(self, r) -> array:
+        return array('d', map(mul, self.inv_diag, r))
+
+    def __repr__(self):
+        return f"Jacobi(n={len(self.inv_diag)})"
+
+class _Triangular:
+    """
+    Applies M = (L + D) D^-1 (D + U) with one forward and one backward sweep.
+    Rows are kept as plain lists of (column, value): sparse rows are short,
+    and an inline loop over lists beats any per-row call.
+    """
+    __slots__ = ['lower', 'diag', 'upper', 'scale']
+
+    def _forward(self, y):
+        # (L + D) y = r, in place
+        diag = self.diag
+        i = 0
+        for idx, val in self.lower:
+            s = y[i]
+            for j, v in zip(idx, val):
+                s -= v * y[j]
+            y[i] = s / diag[i]
+            i += 1
+
+    def _backward(self, z):
+        # (D + U) z = D y, in place
+        upper, diag = self.upper, self.diag
+        for i in range(len(z) - 1, -1, -1):
+            idx, val = upper[i]
+            if idx:
+                s = 0.0
+                for j, v in zip(idx, val):
+                    s += v * z[j]
+                z[i] -= s / diag[i]
+
+    def __call__(self, r) -> array:
+        z = r.tolist() if isinstance(r, array) else list(r)
+        self._forward(z)
+        self._backward(z)
+        if self.scale != 1.0:
+            return array('d', [self.scale * v for v in z])
+        return array('d', z)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(n={len(self.diag)})"
+
+class SSOR(_Triangular):
+    """
+    Symmetric successive over-relaxation preconditioner
+
+        M = omega / (2 - omega) * (D/omega + L) (D/omega)^-1 (D/omega + U)
+
+    with A = L + D + U. One forward and one backward Gauss-Seidel sweep per
+    application; symmetric when A is, so it can be used with CG.
+
+    omega: relaxation factor in (0, 2); 1 gives symmetric Gauss-Seidel
+    """
+    __slots__ = []
+
+    def __init__(self, A, omega: float = 1.0):
+        if not 0.0 < omega < 2.0:
+            raise ValueError("SSOR needs 0 < omega < 2.")
+        self.lower, diag, self.upper = _split(_as_csr(A))
+        self.diag = [d / omega for d in diag]
+        self.scale = (2.0 - omega) / omega
+
+class ILU(_Triangular):
+    """
+    Incomplete LU factorization with zero fill-in, ILU(0): A ~ L U where L
+    (unit lower) and U keep exactly the sparsity pattern of A.
+
+    Usually a much stronger preconditioner than Jacobi or SSOR for
+    nonsymmetric problems such as discretized transport equations.
+    """
+    __slots__ = []
+
+    def __init__(self, A):
+        A = _as_csr(A)
+        n = A.shape()[0]
+        ip, idx, data = A.indptr, A.indices, A.data
+        lower, upper = [], []
+        diag = [0.0] * n
+        for i in range(n):
+            row = {idx[k]: data[k] for k in range(ip[i], ip[i + 1])}
+            for k in sorted(j for j in row if j < i):
+                if diag[k] == 0.0:
+                    raise ValueError(f"Zero pivot at row {k} of the incomplete factorization.")
+                factor = row[k] / diag[k]
+                row[k] = factor
+                up_idx, up_val = upper[k]
+                for j, v in zip(up_idx, up_val):
+                    if j in row:
+                        row[j] -= factor * v
+            cols = sorted(row)
+            lo = [j for j in cols if j < i]
+            up = [j for j in cols if j > i]
+            lower.append((lo, [row[j] for j in lo]))
+            upper.append((up, [row[j] for j in up]))
+            diag[i] = row.get(i, 0.0)
+        if diag and diag[-1] == 0.0:
+            raise ValueError(f"Zero pivot at row {n - 1} of the incomplete factorization.")
+        self.lower, self.upper = lower, upper
+        # L has a unit diagonal; U's diagonal is applied in the backward sweep
+        self.diag = diag
+        self.scale = 1.0
+
+    def _forward(self, y):
+        # Unit lower triangle
+        i = 0
+        for idx, val in self.lower:
+            if idx:
+                s = y[i]
+                for j, v in zip(idx, val):
+                    s -= v * y[j]
+                y[i] = s
+            i += 1
+
+    def _backward(self, z):
+        upper, diag = self.upper, self.diag
+        for i in range(len(z) - 1, -1, -1):
+            idx, val = upper[i]
+            s = z[i]
+            for j, v in zip(idx, val):
+                s -= v * z[j]
+            z[i] = s / diag[i]
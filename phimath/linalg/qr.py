@@ -0,0 +1,351 @@
+"""
+QR and Cholesky factorizations, and linear least squares.
+
+QR works on the columns of A (copied once into plain lists, then
+overwritten in place by R and the Householder vectors, as LAPACK's geqrf
+does), so each reflection is a dot product and an update along whole
+columns. Cholesky works in place on a copy of the rows, like LU.
+
+lstsq solves min ||A x - b|| through column-pivoted QR instead of the
+normal equations A^T A x = A^T b, which square the condition number. With
+block=..., A is consumed in blocks of rows (TSQR): only an n x n triangle
+and the current block are ever held, so the row count is unbounded.
+"""
+from array import array
+from itertools import islice, repeat
+from operator import sub, mul
+from phimath.linalg.matrix import matrix, _dot
+from phimath.linalg.vectors import vector
+from phimath.math.func import sqrt
+
+_MACHEPS = 2.220446049250313e-16
+
+def _columns(A):
+    if isinstance(A, matrix):
+        return [list(A._col_seq(j)) for j in range(A.cols())], A.rows()
+    rows = [[float(v) for v in row] for row in A]
+    n = len(rows[0]) if rows else 0
+    if any(len(row) != n for row in rows):
+        raise ValueError("All rows must have the same length.")
+    return [[row[j] for row in rows] for j in range(n)], len(rows)
+
+def _householder(cols, m, pivoting, extra=()):
+    """
+    Householder QR of the column lists cols (m rows) in place: on return the
+    upper triangle holds R and column k below the diagonal holds v[1:] of
+    the k-th reflector (v[0] = 1 implicitly). The extra columns (right-hand
+    sides) receive every reflection as well. Returns (tau, perm).
+    """
+    n = len(cols)
+    perm = list(range(n))
+    tau = []
+    norms = [_dot(c, c) for c in cols] if pivoting else None
+    for k in range(min(m, n)):
+        if pivoting:
+            p = max(range(k, n), key=norms.__getitem__)
+            if p != k:
+                cols[k], cols[p] = cols[p], cols[k]
+                norms[k], norms[p] = norms[p], norms[k]
+                perm[k], perm[p] = perm[p], perm[k]
+        col = cols[k]
+        x = col[k:]
+        normx = sqrt(_dot(x, x))
+        if normx == 0.0:
+            tau.append(0.0)
+            continue
+        alpha = -normx if x[0] >= 0 else normx
+        v0 = x[0] - alpha
+        v = [1.0] + [xi / v0 for xi in x[1:]]
+        t = -v0 / alpha     # 2 / (v . v) for the scaled v
+        col[k] = alpha
+        col[k + 1:] = v[1:]
+        tau.append(t)
+        for c in list(cols[k + 1:]) + list(extra):
+            s = t * _dot(v, c[k:])
+            if s != 0.0:
+                c[k:] = list(map(sub, c[k:], map(mul, v, repeat(s))))
+        if pivoting:
+            for j in range(k + 1, n):
+                rkj = cols[j][k]
+                norms[j] -= rkj * rkj
+                # Recompute when cancellation has eaten the downdated norm
+                if norms[j] <= 1e-8 * abs(rkj * rkj):
+                    tail = cols[j][k + 1:]
+                    norms[j] = _dot(tail, tail)
+    return tau, perm
+
+def _back_substitute(R, c, r):
+    """Solves the leading r x r block of the upper triangle R (columns) for c."""
+    x = [0.0] * r
+    for i in range(r - 1, -1, -1):
+        s = c[i]
+        for j in range(i + 1, r):
+            s -= R[j][i] * x[j]
+        x[i] = s / R[i][i]
+    return x
+
+class QR:
+    """
+    Householder QR factorization A P = Q R of an m x n matrix.
+
+    A : matrix or list of rows
+        The matrix to factor. It is copied, never modified.
+    pivoting : bool
+        Column pivoting (largest remaining column first), which orders
+        |R[0,0]| >= |R[1,1]| >= ... and reveals the numerical rank.
+
+    perm[k] is the column of A that ended up in column k (identity without
+    pivoting). Q is kept implicitly as Householder reflectors.
+    """
+    __slots__ = ['m', 'n', '_cols', 'tau', 'perm']
+
+    def __init__(self, A, pivoting: bool = False):
+        cols, m = _columns(A)
+        self.m = m
+        self.n = len(cols)
+        self._cols = cols
+        self.tau, self.perm = _householder(cols, m, pivoting)
+
+    def _apply(self, b, transpose):
+        """Q^T b (transpose=True) or Q b for a list b of length m, in place."""
+        ks = range(len(self.tau)) if transpose else range(len(self.tau) - 1, -1, -1)
+        for k in ks:
+            t = self.tau[k]
+            if t == 0.0:
+                continue
+            v = [1.0] + self._cols[k][k + 1:]
+            s = t * _dot(v, b[k:])
+            b[k:] = list(map(sub, b[k:], map(mul, v, repeat(s))))
+        return b
+
+    def qt(self, b) -> array:
+        """Q^T b for a sequence of length m."""
+        if len(b) != self.m:
+            raise ValueError(f"Expected a sequence of length {self.m}, got {len(b)}.")
+        return array('d', self._apply([float(v) for v in b], True))
+
+    def R(self) -> matrix:
+        k = min(self.m, self.n)
+        return matrix.from_function(k, self.n, lambda i, j: self._cols[j][i] if j >= i else 0.0)
+
+    def Q(self) -> matrix:
+        """Thin Q (m x min(m, n)) with orthonormal columns."""
+        k = min(self.m, self.n)
+        cols = []
+        for j in range(k):
+            e = [0.0] * self.m
+            e[j] = 1.0
+            cols.append(self._apply(e, False))
+        return matrix.from_columns(cols)
+
+    def rank(self, rcond: float = None) -> int:
+        """Number of |R[k,k]| above rcond * |R[0,0]| (meaningful with pivoting)."""
+        k = min(self.m, self.n)
+        if rcond is None:
+            rcond = max(self.m, self.n) * _MACHEPS
+        diag = [abs(self._cols[i][i]) for i in range(k)]
+        if not diag or diag[0] == 0.0:
+            return 0
+        return sum(1 for d in diag if d > rcond * diag[0])
+
+    def solve(self, b):
+        """
+        Least-squares solution of A x = b (exact for square nonsingular A).
+        Needs m >= n and full column rank.
+
+        b: sequence of m floats, vector, or m x p matrix of right-hand sides
+        Returns: array('d'), vector or matrix to match b
+        """
+        if self.m < self.n or self.rank(0.0) < self.n:
+            raise ValueError("QR solve needs full column rank; use lstsq for rank-deficient problems.")
+        if isinstance(b, matrix):
+            return matrix.from_columns([self._solve_column(b._col_seq(j)) for j in range(b.cols())])
+        if isinstance(b, vector):
+            return vector(*self._solve_column([b.x, b.y, b.z]))
+        return array('d', self._solve_column(b))
+
+    def _solve_column(self, b):
+        if len(b) != self.m:
+            raise ValueError(f"Right-hand side has {len(b)} entries, expected {self.m}.")
+        c = self._apply([float(v) for v in b], True)
+        y = _back_substitute(self._cols, c, self.n)
+        x = [0.0] * self.n
+        for k, p in enumerate(self.perm):
+            x[p] = y[k]
+        return x
+
+    def __repr__(self):
+        return f"QR(m={self.m}, n={self.n})"
+
+class Cholesky:
+    """
+    Cholesky factorization A = L L^T of a symmetric positive definite matrix.
+
+    Half the work of LU and no pivoting. Only the lower triangle of A is
+    read; a matrix that is not positive definite raises ValueError, which
+    also makes this the cheapest SPD test.
+    """
+    __slots__ = ['n', '_rows']
+
+    def __init__(self, A):
+        rows = A.tolist() if isinstance(A, matrix) else [[float(v) for v in row] for row in A]
+        n = len(rows)
+        if any(len(row) != n for row in rows):
+            raise ValueError("Cholesky factorization needs a square matrix.")
+        for j in range(n):
+            row_j = rows[j]
+            head = row_j[:j]
+            d = row_j[j] - _dot(head, head)
+            if d <= 0.0:
+                raise ValueError("Matrix is not positive definite.")
+            ljj = sqrt(d)
+            row_j[j] = ljj
+            for i in range(j + 1, n):
+                row_i = rows[i]
+                row_i[j] = (row_i[j] - _dot(row_i[:j], head)) / ljj
+            # Drop the (unused) upper triangle so rows hold exactly L
+            del row_j[j + 1:]
+        self.n = n
+        self._rows = rows
+
+    def _solve_column(self, b):
+        rows = self._rows
+        n = self.n
+        y = [float(v) for v in b]
+        for i in range(n):
+            row = rows[i]
+            y[i] = (y[i] - _dot(row[:i], y[:i])) / row[i]
+        for i in range(n - 1, -1, -1):
+            s = y[i]
+            for k in range(i + 1, n):
+                s -= rows[k][i] * y[k]
+            y[i] = s / rows[i][i]
+        return y
+
+    def solve(self, b):
+        """
+        Solves A x = b.
+
+        b: sequence of n floats, vector, or n x m matrix of right-hand sides
+        Returns: array('d'), vector or matrix to match b
+        """
+        if isinstance(b, matrix):
+            if b.rows() != self.n:
+                raise ValueError(f"Right-hand side has {b.rows()} rows, expected {self.n}.")
+            return matrix.from_columns([self._solve_column(b._col_seq(j)) for j in range(b.cols())])
+        if isinstance(b, vector):
+            return vector(*self._solve_column([b.x, b.y, b.z]))
+        if len(b) != self.n:
+            raise ValueError(f"Right-hand side has {len(b)} entries, expected {self.n}.")
+        return array('d', self._solve_column(b))
+
+    def L(self) -> matrix:
+        n = self.n
+        return matrix.from_function(n, n, lambda i, j: self._rows[i][j] if j <= i else 0.0)
+
+    def det(self) -> float:
+        d = 1.0
+        for i in range(self.n):
+            d *= self._rows[i][i]
+        return d * d
+
+    def __repr__(self):
+        return f"Cholesky(n={self.n})"
+
+class LstsqResult:
+    """
+    Solution of a linear least-squares problem.
+
+    x : array('d')
+        Minimizer of ||A x - b|| (the basic solution with free variables
+        set to zero when A is rank deficient).
+    residual : float
+        ||A x - b||^2.
+    rank : int
+        Numerical rank of A.
+    rows : int
+        Rows of A that were processed.
+    """
+    __slots__ = ['x', 'residual', 'rank', 'rows']
+
+    def __init__(self, x, residual, rank, rows):
+        self.x = x
+        self.residual = residual
+        self.rank = rank
+        self.rows = rows
+
+    def __repr__(self):
+        return f"LstsqResult(x={list(self.x)}, residual={self.residual}, rank={self.rank})"
+
+def _tsqr(rows, b, block):
+    """
+    Reduces the rows of [A | b] block by block to an n x n triangle R and
+    c = (Q^T b)[:n]. Returns (R as columns, c, sum of squares of the rest of
+    Q^T b, number of rows).
+    """
+    rows = iter(rows)
+    b = iter(b)
+    R_cols = None
+    c = []
+    rss = 0.0
+    count = 0
+    while True:
+        chunk = [[float(v) for v in row] for row in islice(rows, block)]
+        if not chunk:
+            break
+        rhs = [float(v) for v in islice(b, len(chunk))]
+        if len(rhs) != len(chunk):
+            raise ValueError("b has fewer entries than A has rows.")
+        count += len(chunk)
+        n = len(chunk[0])
+        if R_cols is None:
+            R_cols = [[] for _ in range(n)]
+        # Stack the current triangle on top of the new rows
+        cols = [R_cols[j] + [row[j] for row in chunk] for j in range(n)]
+        rhs = c + rhs
+        _householder(cols, len(rhs), False, extra=(rhs,))
+        k = min(n, len(rhs))
+        R_cols = [[cols[j][i] if i <= j else 0.0 for i in range(k)] for j in range(n)]
+        rss += _dot(rhs[k:], rhs[k:])
+        c = rhs[:k]
+    if next(b, None) is not None:
+        raise ValueError("b has more entries than A has rows.")
+    if R_cols is None:
+        raise ValueError("A has no rows.")
+    return R_cols, c, rss, count
+
+def lstsq(A, b, rcond: float = None, block: int = None) -> LstsqResult:
+    """
+    Least-squares solution of the overdetermined system A x ~ b.
+
+    A: matrix, list of rows, or (with block) any iterable of rows such as a
+        generator reading from a file
+    b: sequence (or iterable, with block) of one value per row of A
+    rcond: relative cutoff for the rank: columns whose pivot |R[k,k]| is
+        below rcond * |R[0,0]| are treated as dependent (default max(m, n) * eps)
+    block: process A in blocks of this many rows (TSQR). Memory is then
+        O(block * n) whatever the number of rows.
+    Returns: LstsqResult
+    """
+    if isinstance(A, matrix):
+        A = A.tolist()
+    if block is None:
+        A = A if isinstance(A, list) else list(A)
+        block = max(len(A), 1)
+    R_cols, c, rss, m = _tsqr(A, b, block)
+    n = len(R_cols)
+
+    # Rank-revealing QR of the small triangle; it carries c along
+    k = len(c)
+    cols = [col[:k] for col in R_cols]
+    tau, perm = _householder(cols, k, True, extra=(c,))
+    if rcond is None:
+        rcond = max(m, n) * _MACHEPS
+    diag = [abs(cols[i][i]) for i in range(min(k, n))]
+    rank = sum(1 for d in diag if diag[0] > 0.0 and d > rcond * diag[0])
+    y = _back_substitute(cols, c, rank)
+    x = array('d', bytes(8 * n))
+    for i in range(rank):
+        x[perm[i]] = y[i]
+    residual = rss + _dot(c[rank:], c[rank:])
+    return LstsqResult(x, residual, rank, m)
@@ -0,0 +1,359 @@
+"""
+Fixed-size 3-D rotation types.
+
+Mat3 keeps its nine entries in __slots__ and Quaternion its four, so every
+operation below is a handful of unrolled float multiplies with no loops,
+no shape checks and no intermediate lists. Use them instead of a general
+3x3 matrix wherever rotations are composed or applied many times:
+
+    q = Quaternion.from_axis_angle(vector(0, 1, 0), 0.01)
+    R = q.to_mat3()
+    points = R.apply_many(points)
+
+Compose with *, apply with * or apply(), and renormalize (normalize() for
+quaternions, orthonormalize() for matrices) after long chains of products,
+since rounding slowly lets a rotation drift away from unit length.
+"""
+from array import array
+from phimath.linalg.matrix import matrix
+from phimath.linalg.vectors import vector, _new
+from phimath.math.trigo import sin, cos, acos, atan2
+from phimath.math.func import sqrt
+
+# Above this |cos(angle)| between two quaternions slerp falls back to a
+# normalized linear blend (sin(angle) is too small to divide by)
+SLERP_LINEAR = 0.9995
+
+def _components(v):
+    if isinstance(v, vector):
+        return v.data[0], v.data[1], v.data[2]
+    x, y, z = v
+    return x, y, z
+
+def _unit_axis(axis):
+    x, y, z = _components(axis)
+    norm = sqrt(x * x + y * y + z * z)
+    if norm == 0:
+        raise ValueError("Rotation axis must be a nonzero vector.")
+    return x / norm, y / norm, z / norm
+
+class Mat3:
+    """
+    3x3 matrix with its entries unrolled into slots (row-major m00..m22).
+
+    Mat3 * Mat3 composes, Mat3 * vector rotates a vector, and Mat3 * matrix
+    applies the rotation to every column of a 3 x m matrix.
+    """
+    __slots__ = ['m00', 'm01', 'm02', 'm10', 'm11', 'm12', 'm20', 'm21', 'm22']
+
+    def __init__(self, m00=1.0, m01=0.0, m02=0.0, m10=0.0, m11=1.0, m12=0.0, m20=0.0, m21=0.0, m22=1.0):
+        self.m00, self.m01, self.m02 = m00, m01, m02
+        self.m10, self.m11, self.m12 = m10, m11, m12
+        self.m20, self.m21, self.m22 = m20, m21, m22
+
+    @classmethod
+    def identity(cls):
+        return cls()
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds a Mat3 from a 3x3 matrix or three rows of three numbers."""
+        if isinstance(rows, matrix):
+            if rows.shape() != (3, 3):
+                raise ValueError(f"Mat3 needs a 3x3 matrix, got {rows.rows()}x{rows.cols()}.")
+            return cls(*rows._flat())
+        r0, r1, r2 = rows
+        return cls(*map(float, r0), *map(float, r1), *map(float, r2))
+
+    @classmethod
+    def from_axis_angle(cls, axis, angle: float):
+        """Right-handed rotation by angle (radians) about axis (Rodrigues' formula)."""
+        x, y, z = _unit_axis(axis)
+        c = cos(angle)
+        s = sin(angle)
+        t = 1 - c
+        return cls(t * x * x + c,     t * x * y - s * z, t * x * z + s * y,
+                   t * x * y + s * z, t * y * y + c,     t * y * z - s * x,
+                   t * x * z - s * y, t * y * z + s * x, t * z * z + c)
+
+    def _entries(self):
+        return (self.m00, self.m01, self.m02, self.m10, self.m11, self.m12, self.m20, self.m21, self.m22)
+
+    def __getitem__(self, idx):
+        i, j = idx
+        if i < 0:
+            i += 3
+        if j < 0:
+            j += 3
+        if not (0 <= i < 3 and 0 <= j < 3):
+            raise IndexError(f"Index {idx} out of range for a 3x3 matrix.")
+        return getattr(self, self.__slots__[3 * i + j])
+
+    def __iter__(self):
+        return iter(self._entries())
+
+    def tolist(self):
+        e = self._entries()
+        return [list(e[0:3]), list(e[3:6]), list(e[6:9])]
+
+    def to_matrix(self) -> matrix:
+        return matrix.from_flat(array('d', self._entries()), 3, 3)
+
+    def to_quaternion(self):
+        return Quaternion.from_mat3(self)
+
+    # Algebra
+
+    def compose(self, other: 'Mat3') -> 'Mat3':
+        """self * other: the rotation that applies other first, then self."""
+        a, b, c, d, e, f, g, h, i = self._entries()
+        A, B, C, D, E, F, G, H, I = other._entries()
+        return Mat3(a * A + b * D + c * G, a * B + b * E + c * H, a * C + b * F + c * I,
+                    d * A + e * D + f * G, d * B + e * E + f * H, d * C + e * F + f * I,
+                    g * A + h * D + i * G, g * B + h * E + i * H, g * C + h * F + i * I)
+
+    def apply(self, v) -> vector:
+        x, y, z = _components(v)
+        return _new(self.m00 * x + self.m01 * y + self.m02 * z,
+                    self.m10 * x + self.m11 * y + self.m12 * z,
+                    self.m20 * x + self.m21 * y + self.m22 * z)
+
+    def apply_many(self, vectors) -> list:
+        """Rotates every vector (or (x, y, z) triple) in an iterable; returns a list of vectors."""
+        a, b, c, d, e, f, g, h, i = self._entries()
+        out = []
+        append = out.append
+        for v in vectors:
+            x, y, z = _components(v)
+            append(_new(a * x + b * y + c * z, d * x + e * y + f * z, g * x + h * y + i * z))
+        return out
+
+    def apply_matrix(self, M: matrix) -> matrix:
+        """Applies self to every column of a 3 x m matrix."""
+        if M.rows() != 3:
+            raise ValueError(f"Mat3 applies to matrices with 3 rows, got {M.rows()}.")
+        a, b, c, d, e, f, g, h, i = self._entries()
+        m = M.cols()
+        flat = M._flat().tolist()
+        cols = list(zip(flat[:m], flat[m:2 * m], flat[2 * m:]))
+        out = [a * x + b * y + c * z for x, y, z in cols]
+        out += [d * x + e * y + f * z for x, y, z in cols]
+        out += [g * x + h * y + i * z for x, y, z in cols]
+        return matrix._view(array('d', out), 3, m, 0, m, 1)
+
+    def __mul__(self, other):
+        if isinstance(other, Mat3):
+            return self.compose(other)
+        if isinstance(other, vector):
+            return self.apply(other)
+        if isinstance(other, matrix):
+            return self.apply_matrix(other)
+        if isinstance(other, (int, float)):
+            return Mat3(*[other * v for v in self._entries()])
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return self.__mul__(other)
+        return NotImplemented
+
+    def transpose(self) -> 'Mat3':
+        """The transpose, which is also the inverse of a rotation."""
+        return Mat3(self.m00, self.m10, self.m20, self.m01, self.m11, self.m21, self.m02, self.m12, self.m22)
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def det(self) -> float:
+        a, b, c, d, e, f, g, h, i = self._entries()
+        return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+
+    def orthonormalize(self) -> 'Mat3':
+        """
+        Rotation obtained by Gram-Schmidt on the rows: undoes the drift of
+        long product chains, which slowly lose orthogonality and unit length.
+        """
+        a, b, c, d, e, f, g, h, i = self._entries()
+        n = sqrt(a * a + b * b + c * c)
+        if n == 0:
+            raise ValueError("Cannot orthonormalize a singular matrix.")
+        a, b, c = a / n, b / n, c / n
+        p = a * d + b * e + c * f
+        d, e, f = d - p * a, e - p * b, f - p * c
+        n = sqrt(d * d + e * e + f * f)
+        if n == 0:
+            raise ValueError("Cannot orthonormalize a singular matrix.")
+        d, e, f = d / n, e / n, f / n
+        # The third row is fixed by the first two (right-handed frame)
+        return Mat3(a, b, c, d, e, f, b * f - c * e, c * d - a * f, a * e - b * d)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mat3):
+            return NotImplemented
+        return self._entries() == other._entries()
+
+    def __repr__(self):
+        return f"Mat3({self.tolist()})"
+
+class Quaternion:
+    """
+    Quaternion w + xi + yj + zk. Unit quaternions represent rotations:
+    q * p composes (p first), q * v rotates a vector, q.slerp(p, t)
+    interpolates at constant angular speed.
+    """
+    __slots__ = ['w', 'x', 'y', 'z']
+
+    def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
+        self.w = w
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @classmethod
+    def identity(cls):
+        return cls()
+
+    @classmethod
+    def from_axis_angle(cls, axis, angle: float):
+        """Unit quaternion for a right-handed rotation by angle (radians) about axis."""
+        x, y, z = _unit_axis(axis)
+        s = sin(0.5 * angle)
+        return cls(cos(0.5 * angle), s * x, s * y, s * z)
+
+    @classmethod
+    def from_mat3(cls, R):
+        """Unit quaternion of a rotation matrix (a Mat3, a 3x3 matrix or three rows)."""
+        if not isinstance(R, Mat3):
+            R = Mat3.from_rows(R)
+        a, b, c, d, e, f, g, h, i = R._entries()
+        trace = a + e + i
+        # Divide by the largest of the four candidate components (Shepperd)
+        if trace > 0:
+            s = 2.0 * sqrt(1.0 + trace)
+            q = cls(0.25 * s, (h - f) / s, (c - g) / s, (d - b) / s)
+        elif a >= e and a >= i:
+            s = 2.0 * sqrt(1.0 + a - e - i)
+            q = cls((h - f) / s, 0.25 * s, (b + d) / s, (c + g) / s)
+        elif e >= i:
+            s = 2.0 * sqrt(1.0 + e - a - i)
+            q = cls((c - g) / s, (b + d) / s, 0.25 * s, (f + h) / s)
+        else:
+            s = 2.0 * sqrt(1.0 + i - a - e)
+            q = cls((d - b) / s, (c + g) / s, (f + h) / s, 0.25 * s)
+        return q.normalize()
+
+    def __iter__(self):
+        return iter((self.w, self.x, self.y, self.z))
+
+    def to_mat3(self) -> Mat3:
+        """Rotation matrix of the quaternion (assumed unit length)."""
+        w, x, y, z = self.w, self.x, self.y, self.z
+        xx, yy, zz = x * x, y * y, z * z
+        xy, xz, yz = x * y, x * z, y * z
+        wx, wy, wz = w * x, w * y, w * z
+        return Mat3(1 - 2 * (yy + zz), 2 * (xy - wz), 2 * (xz + wy),
+                    2 * (xy + wz), 1 - 2 * (xx + zz), 2 * (yz - wx),
+                    2 * (xz - wy), 2 * (yz + wx), 1 - 2 * (xx + yy))
+
+    def to_axis_angle(self):
+        """Returns (axis, angle) with angle in [0, 2 pi]; the axis is x for the identity."""
+        w, x, y, z = self.normalize()
+        s = sqrt(x * x + y * y + z * z)
+        if s == 0:
+            return vector(1.0, 0.0, 0.0), 0.0
+        return vector(x / s, y / s, z / s), 2.0 * atan2(s, w)
+
+    # Algebra
+
+    def norm(self) -> float:
+        return sqrt(self.w * self.w + self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normalize(self) -> 'Quaternion':
+        """Unit quaternion in the same direction (renormalization after long product chains)."""
+        n = self.norm()
+        if n == 0:
+            raise ValueError("Cannot normalize a zero quaternion.")
+        return Quaternion(self.w / n, self.x / n, self.y / n, self.z / n)
+
+    def conjugate(self) -> 'Quaternion':
+        return Quaternion(self.w, -self.x, -self.y, -self.z)
+
+    def inverse(self) -> 'Quaternion':
+        n2 = self.w * self.w + self.x * self.x + self.y * self.y + self.z * self.z
+        if n2 == 0:
+            raise ValueError("A zero quaternion has no inverse.")
+        return Quaternion(self.w / n2, -self.x / n2, -self.y / n2, -self.z / n2)
+
+    def dot(self, other: 'Quaternion') -> float:
+        return self.w * other.w + self.x * other.x + self.y * other.y + self.z * other.z
+
+    def compose(self, other: 'Quaternion') -> 'Quaternion':
+        """Hamilton product self * other: the rotation that applies other first."""
+        w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+        w2, x2, y2, z2 = other.w, other.x, other.y, other.z
+        return Quaternion(w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+                          w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                          w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                          w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2)
+
+    def rotate(self, v) -> vector:
+        """Rotates a vector by the (unit) quaternion: v + 2w (u x v) + 2 u x (u x v)."""
+        vx, vy, vz = _components(v)
+        w, x, y, z = self.w, self.x, self.y, self.z
+        tx = 2.0 * (y * vz - z * vy)
+        ty = 2.0 * (z * vx - x * vz)
+        tz = 2.0 * (x * vy - y * vx)
+        return _new(vx + w * tx + y * tz - z * ty,
+                    vy + w * ty + z * tx - x * tz,
+                    vz + w * tz + x * ty - y * tx)
+
+    def apply_many(self, vectors) -> list:
+        """Rotates many vectors through the equivalent Mat3 (9 multiplies each instead of 15)."""
+        return self.to_mat3().apply_many(vectors)
+
+    def __mul__(self, other):
+        if isinstance(other, Quaternion):
+            return self.compose(other)
+        if isinstance(other, vector):
+            return self.rotate(other)
+        if isinstance(other, (int, float)):
+            return Quaternion(other * self.w, other * self.x, other * self.y, other * self.z)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return self.__mul__(other)
+        return NotImplemented
+
+    def __neg__(self):
+        return Quaternion(-self.w, -self.x, -self.y, -self.z)
+
+    def slerp(self, other: 'Quaternion', t: float) -> 'Quaternion':
+        """
+        Spherical linear interpolation from self (t = 0) to other (t = 1)
+        along the shorter arc, at constant angular velocity.
+        """
+        w, x, y, z = other.w, other.x, other.y, other.z
+        d = self.w * w + self.x * x + self.y * y + self.z * z
+        if d < 0:
+            # q and -q are the same rotation; take the short way round
+            w, x, y, z, d = -w, -x, -y, -z, -d
+        if d > SLERP_LINEAR:
+            k0, k1 = 1.0 - t, t
+            return Quaternion(k0 * self.w + k1 * w, k0 * self.x + k1 * x,
+                              k0 * self.y + k1 * y, k0 * self.z + k1 * z).normalize()
+        theta = acos(d)
+        s = sin(theta)
+        k0 = sin((1.0 - t) * theta) / s
+        k1 = sin(t * theta) / s
+        return Quaternion(k0 * self.w + k1 * w, k0 * self.x + k1 * x,
+                          k0 * self.y + k1 * y, k0 * self.z + k1 * z)
+
+    def __eq__(self, other):
+        if not isinstance(other, Quaternion):
+            return NotImplemented
+        return (self.w, self.x, self.y, self.z) == (other.w, other.x, other.y, other.z)
+
+    def __repr__(self):
+        return f"Quaternion({self.w}, {self.x}, {self.y}, {self.z})"
@@ -1,6 +1,13 @@
 
-from phimath.linalg.matrix import matrix
+from array import array
+from itertools import repeat
+from operator import add, sub, mul
+from phimath.linalg.matrix import matrix, _dot
+from phimath.linalg.preconditioners import Jacobi, SSOR, ILU
 from phimath.math.func import sqrt
+from phimath.control.numeric import EPSILON, MAX_ITERATIONS, CallCounter, iteration_limit
+
+_MACHEPS = 2.220446049250313e-16
 
 def gaussian_eleminator(A, B):
     # Ensure inputs are matrix objects
@@ -10,48 +17,44 @@ def gaussian_eleminator(A, B):
     n = a.rows()
     m = b.cols()
 
-    # 1. FIX: Build the augmented matrix as a true list of lists
+    # 1. Build the augmented matrix [A | B] as a list of rows
     # We need A (n x n) and B (n x m) combined into (n x n+m)
-    augmented_data = []
-    for i in range(n):
-        # Accessing data[i] directly because it's a list
-        row = list(a.data[i]) + list(b.data[i])
-        augmented_data.append(row)
-    
-    aug = matrix(augmented_data)
+    aug = [ra + rb for ra, rb in zip(a.tolist(), b.tolist())]
 
     # 2. Forward Elimination (Row Echelon Form)
     for i in range(n):
         # Partial Pivoting: find the largest element in current column
         max_row = i
         for k in range(i + 1, n):
-            if abs(aug[k, i]) > abs(aug[max_row, i]):
+            if abs(aug[k][i]) > abs(aug[max_row][i]):
                 max_row = k
-        
-        # Swap rows in the internal data
-        aug.data[i], aug.data[max_row] = aug.data[max_row], aug.data[i]
 
-        pivot = aug[i, i]
+        # Swap rows
+        aug[i], aug[max_row] = aug[max_row], aug[i]
+
+        row_i = aug[i]
+        pivot = row_i[i]
         if abs(pivot) < 1e-10: # Handle floating point near zero
             raise ValueError("Matrix is singular or nearly singular.")
 
         # Eliminate rows below
         for k in range(i + 1, n):
-            factor = aug[k, i] / pivot
+            row_k = aug[k]
+            factor = row_k[i] / pivot
             for j in range(i, n + m):
-                aug[k, j] -= factor * aug[i, j]
+                row_k[j] -= factor * row_i[j]
 
     # 3. Back Substitution
     # We create a result matrix for X (n x m)
-    x_data = [[0.0] * m for _ in range(n)]
-    res = matrix(x_data)
+    res = matrix.zeros(n, m)
 
     for j in range(m): # Solve for each column in B
         for i in range(n - 1, -1, -1):
-            sum_val = aug[i, n + j]
+            row_i = aug[i]
+            sum_val = row_i[n + j]
             for k in range(i + 1, n):
-                sum_val -= aug[i, k] * res[k, j]
-            res[i, j] = sum_val / aug[i, i]
+                sum_val -= row_i[k] * res[k, j]
+            res[i, j] = sum_val / row_i[i]
 
     return res
 
@@ -89,3 +92,241 @@ def quadratic_solver(a: float, b: float, c: float) -> tuple:
     root1 = (-b + sqrt(d))/(2*a) #using power operator, later will be changed to sqrt for better precision
     root2 = (-b - sqrt(d))/(2*a)
     return (root1,root2)
+
+
+# ---------------------------------------------------------------------------
+# Krylov solvers
+#
+# Only products A*x are needed, so A may be a dense matrix, a sparse or
+# banded matrix or any function x -> A*x. Vectors are array('d'); every update is a
+# single map() over the buffers.
+# ---------------------------------------------------------------------------
+
+_PRECONDITIONERS = {'jacobi': Jacobi, 'ssor': SSOR, 'ilu': ILU}
+
+class KrylovResult:
+    """
+    Outcome of an iterative linear solve.
+
+    x : array('d')
+        The solution.
+    iterations : int
+        Iterations performed.
+    residuals : list of float
+        ||b - A x|| at the start and after every iteration (GMRES reports
+        its cheap running estimate of the same quantity).
+    nmatvec : int
+        Products with A.
+    """
+    __slots__ = ['x', 'iterations', 'residuals', 'nmatvec']
+
+    def __init__(self, x, iterations, residuals, nmatvec):
+        self.x = x
+        self.iterations = iterations
+        self.residuals = residuals
+        self.nmatvec = nmatvec
+
+    @property
+    def residual(self) -> float:
+        return self.residuals[-1]
+
+    def __repr__(self):
+        return f"KrylovResult(iterations={self.iterations}, residual={self.residual}, nmatvec={self.nmatvec})"
+
+def _operator(A, n):
+    if isinstance(A, matrix):
+        if A.shape() != (n, n):
+            raise ValueError(f"Expected a {n}x{n} matrix, got {A.rows()}x{A.cols()}.")
+        rows = A.tolist()
+        return lambda x: array('d', [_dot(row, x) for row in rows])
+    if hasattr(A, 'matvec'):
+        # CSR, CSC, Banded, Tridiagonal
+        if A.shape() != (n, n):
+            raise ValueError(f"Expected a {n}x{n} matrix, got {A.shape()[0]}x{A.shape()[1]}.")
+        return A.matvec
+    if callable(A):
+        return lambda x: array('d', A(x))
+    raise TypeError(f"A must be a matrix, a sparse matrix or a callable, got {type(A).__name__}.")
+
+def _preconditioner(M, A):
+    if M is None:
+        return None
+    if isinstance(M, str):
+        try:
+            return _PRECONDITIONERS[M.lower()](A)
+        except KeyError:
+            raise ValueError(f"Unknown preconditioner: {M}") from None
+    return M
+
+def _norm(x):
+    return sqrt(_dot(x, x))
+
+def _axpy(a, x, y):
+    """y + a x as a new array."""
+    return array('d', map(add, y, map(mul, x, repeat(a))))
+
+def _start(A, b, x0, M, tol):
+    b = array('d', b)
+    n = len(b)
+    matvec = CallCounter(_operator(A, n))
+    x = array('d', bytes(8 * n)) if x0 is None else array('d', x0)
+    r = array('d', map(sub, b, matvec(x))) if x0 is not None else array('d', b)
+    bnorm = _norm(b)
+    return matvec, _preconditioner(M, A), b, x, r, tol * (bnorm if bnorm > 0 else 1.0)
+
+def cg(A, b, x0=None, M=None, tol: float = EPSILON, max_iter: int = MAX_ITERATIONS) -> KrylovResult:
+    """
+    Preconditioned conjugate gradients for symmetric positive definite A.
+
+    A: matrix, sparse or banded matrix (anything with matvec), or function x -> A*x
+    b: right-hand side (any sequence of floats)
+    x0: initial guess (zero when None)
+    M: preconditioner: None, 'jacobi', 'ssor', 'ilu' or a function r -> M^-1 r
+        (must be symmetric positive definite as well)
+    tol: stop when ||b - A x|| < tol * ||b||
+    max_iter: iteration limit (RuntimeError when reached)
+    """
+    matvec, M, b, x, r, atol = _start(A, b, x0, M, tol)
+    rnorm = _norm(r)
+    residuals = [rnorm]
+    z = M(r) if M else r
+    p = array('d', z)
+    rz = _dot(r, z)
+    iterations = 0
+    while rnorm >= atol:
+        iteration_limit(iterations, max_iter)
+        iterations += 1
+        Ap = matvec(p)
+        pAp = _dot(p, Ap)
+        if pAp <= 0.0:
+            raise ValueError("Matrix is not positive definite.")
+        alpha = rz / pAp
+        x = _axpy(alpha, p, x)
+        r = _axpy(-alpha, Ap, r)
+        rnorm = _norm(r)
+        residuals.append(rnorm)
+        z = M(r) if M else r
+        rz_new = _dot(r, z)
+        p = _axpy(rz_new / rz, p, z)
+        rz = rz_new
+    return KrylovResult(x, iterations, residuals, matvec.calls)
+
+def bicgstab(A, b, x0=None, M=None, tol: float = EPSILON, max_iter: int = MAX_ITERATIONS) -> KrylovResult:
+    """
+    Stabilized bi-conjugate gradients (van der Vorst) for general square A,
+    right-preconditioned. Two products with A per iteration and constant memory.
+
+    Parameters are as for cg; A and M need not be symmetric.
+    """
+    matvec, M, b, x, r, atol = _start(A, b, x0, M, tol)
+    n = len(x)
+    rnorm = _norm(r)
+    residuals = [rnorm]
+    r_hat = array('d', r)
+    rho = alpha = omega = 1.0
+    v = array('d', bytes(8 * n))
+    p = array('d', bytes(8 * n))
+    iterations = 0
+    while rnorm >= atol:
+        iteration_limit(iterations, max_iter)
+        iterations += 1
+        rho_new = _dot(r_hat, r)
+        if rho_new == 0.0:
+            raise RuntimeError("BiCGSTAB breakdown: r is orthogonal to the shadow residual.")
+        beta = (rho_new / rho) * (alpha / omega)
+        p = _axpy(beta, _axpy(-omega, v, p), r)
+        p_hat = M(p) if M else p
+        v = matvec(p_hat)
+        alpha = rho_new / _dot(r_hat, v)
+        s = _axpy(-alpha, v, r)
+        snorm = _norm(s)
+        if snorm < atol:
+            x = _axpy(alpha, p_hat, x)
+            rnorm = snorm
+            residuals.append(rnorm)
+            break
+        s_hat = M(s) if M else s
+        t = matvec(s_hat)
+        tt = _dot(t, t)
+        omega = _dot(t, s) / tt if tt > 0.0 else 0.0
+        if omega == 0.0:
+            raise RuntimeError("BiCGSTAB breakdown: stabilization step vanished.")
+        x = _axpy(omega, s_hat, _axpy(alpha, p_hat, x))
+        r = _axpy(-omega, t, s)
+        rnorm = _norm(r)
+        residuals.append(rnorm)
+        rho = rho_new
+    return KrylovResult(x, iterations, residuals, matvec.calls)
+
+def gmres(A, b, x0=None, M=None, tol: float = EPSILON, max_iter: int = MAX_ITERATIONS,
+          restart: int = 30) -> KrylovResult:
+    """
+    Restarted GMRES(restart) for general square A, right-preconditioned.
+
+    Builds an orthonormal Krylov basis with modified Gram-Schmidt and
+    minimizes the residual over it through Givens rotations; after restart
+    iterations the basis is discarded and the method starts again from the
+    current x, bounding memory at restart + 1 vectors. If A is singular on
+    the Krylov space (breakdown), the best iterate so far is returned.
+
+    restart: Krylov subspace dimension between restarts
+    Other parameters are as for cg.
+    """
+    matvec, M, b, x, r, atol = _start(A, b, x0, M, tol)
+    beta = _norm(r)
+    residuals = [beta]
+    iterations = 0
+    breakdown = False
+    while beta >= atol and not breakdown:
+        V = [array('d', [v / beta for v in r])]
+        Z = []
+        H = []              # columns of the Hessenberg matrix, already rotated
+        cs, sn = [], []
+        g = [beta]
+        for j in range(restart):
+            iteration_limit(iterations, max_iter)
+            iterations += 1
+            z = M(V[j]) if M else V[j]
+            Z.append(z)
+            w = matvec(z)
+            w_norm = _norm(w)
+            h = []
+            for Vi in V:
+                hij = _dot(w, Vi)
+                w = _axpy(-hij, Vi, w)
+                h.append(hij)
+            h_next = _norm(w)
+            for i in range(j):
+                h[i], h[i + 1] = cs[i] * h[i] + sn[i] * h[i + 1], -sn[i] * h[i] + cs[i] * h[i + 1]
+            d = sqrt(h[j] * h[j] + h_next * h_next)
+            if d <= 16 * _MACHEPS * w_norm:
+                # Nothing of A z is left after orthogonalization and rotation
+                # (up to rounding): A is singular on this Krylov space and the
+                # residual cannot shrink, so keep the earlier columns and stop
+                Z.pop()
+                residuals.append(abs(g[j]))
+                breakdown = True
+                break
+            c, s = h[j] / d, h_next / d
+            cs.append(c)
+            sn.append(s)
+            h[j] = d
+            H.append(h)
+            g.append(-s * g[j])
+            g[j] *= c
+            residuals.append(abs(g[j + 1]))
+            if abs(g[j + 1]) < atol or h_next == 0.0:
+                break
+            V.append(array('d', [v / h_next for v in w]))
+
+        # Back substitution for the coefficients, then x += Z y
+        k = len(H)
+        y = [0.0] * k
+        for i in range(k - 1, -1, -1):
+            y[i] = (g[i] - sum(H[m][i] * y[m] for m in range(i + 1, k))) / H[i][i]
+        for yi, zi in zip(y, Z):
+            x = _axpy(yi, zi, x)
+        r = array('d', map(sub, b, matvec(x)))
+        beta = _norm(r)
+        residuals[-1] = beta
+    return KrylovResult(x, iterations, residuals, matvec.calls)
@@ -0,0 +1,306 @@
+"""
+Sparse matrices.
+
+COO collects (row, col, value) triplets incrementally, summing duplicates
+when it is compressed; this is the natural format for assembling stiffness
+matrices element by element. CSR and CSC keep the compressed structure in
+array buffers: indptr marks where each row (column) starts in indices and
+data. CSR is the format for fast products A*x; CSC is its transpose, and
+either converts to the other's transpose without copying.
+"""
+from array import array
+from itertools import repeat
+from operator import mul
+from bisect import bisect_left
+from phimath.linalg.matrix import matrix
+
+_INDEX = 'l'
+
+def _as_buffer(x, n):
+    if len(x) != n:
+        raise ValueError(f"Expected a sequence of length {n}, got {len(x)}.")
+    return x
+
+def _compress(major, minor, values, n_major):
+    """Sorts triplets by (major, minor), summing duplicates. Returns (indptr, indices, data)."""
+    buckets = [[] for _ in range(n_major)]
+    for a, b, v in zip(major, minor, values):
+        buckets[a].append((b, v))
+    indptr = array(_INDEX, [0])
+    indices = array(_INDEX)
+    data = array('d')
+    for entries in buckets:
+        entries.sort(key=lambda e: e[0])
+        last = -1
+        for b, v in entries:
+            if b == last:
+                data[-1] += v
+            else:
+                indices.append(b)
+                data.append(v)
+                last = b
+        indptr.append(len(indices))
+    return indptr, indices, data
+
+class COO:
+    """
+    Coordinate-format sparse matrix for incremental assembly.
+
+    COO(rows, cols) starts empty; add(), add_block() and extend() append
+    entries (duplicates are summed when converting).
+    """
+    __slots__ = ['_rows', '_cols', 'row', 'col', 'data']
+
+    def __init__(self, rows: int, cols: int = None):
+        self._rows = rows
+        self._cols = rows if cols is None else cols
+        self.row = array(_INDEX)
+        self.col = array(_INDEX)
+        self.data = array('d')
+
+    def shape(self):
+        return self._rows, self._cols
+
+    @property
+    def nnz(self) -> int:
+        """Stored entries, duplicates included."""
+        return len(self.data)
+
+    def add(self, i: int, j: int, value: float):
+        if not (0 <= i < self._rows and 0 <= j < self._cols):
+            raise IndexError(f"Entry ({i}, {j}) is outside a {self._rows}x{self._cols} matrix.")
+        self.row.append(i)
+        self.col.append(j)
+        self.data.append(value)
+
+    def add_block(self, rows, cols, block, scale: float = 1.0):
+        """Adds scale * block[a][b] at (rows[a], cols[b]) (element assembly)."""
+        for a, i in enumerate(rows):
+            values = block[a]
+            for b, j in enumerate(cols):
+                v = values[b]
+                if v != 0.0:
+                    self.add(i, j, scale * v)
+
+    def extend(self, rows, cols, values):
+        start = len(self.data)
+        self.row.extend(rows)
+        self.col.extend(cols)
+        self.data.extend(values)
+        if not (len(self.row) == len(self.col) == len(self.data)):
+            del self.row[start:], self.col[start:], self.data[start:]
+            raise ValueError("rows, cols and values must have the same length.")
+        new_rows, new_cols = self.row[start:], self.col[start:]
+        if new_rows and not (0 <= min(new_rows) and max(new_rows) < self._rows
+                             and 0 <= min(new_cols) and max(new_cols) < self._cols):
+            del self.row[start:], self.col[start:], self.data[start:]
+            for i, j in zip(new_rows, new_cols):
+                if not (0 <= i < self._rows and 0 <= j < self._cols):
+                    raise IndexError(f"Entry ({i}, {j}) is outside a {self._rows}x{self._cols} matrix.")
+
+    @classmethod
+    def from_dict(cls, entries: dict, shape: tuple):
+        """Builds from {(i, j): value}."""
+        m = cls(*shape)
+        for (i, j), v in entries.items():
+            m.add(i, j, v)
+        return m
+
+    def tocsr(self) -> 'CSR':
+        return CSR(*_compress(self.row, self.col, self.data, self._rows), (self._rows, self._cols))
+
+    def tocsc(self) -> 'CSC':
+        return CSC(*_compress(self.col, self.row, self.data, self._cols), (self._rows, self._cols))
+
+    def to_matrix(self) -> matrix:
+        m = matrix.zeros(self._rows, self._cols)
+        cols = self._cols
+        dense = m.data
+        for i, j, v in zip(self.row, self.col, self.data):
+            dense[i * cols + j] += v
+        return m
+
+    def __repr__(self):
+        return f"COO(shape={self.shape()}, nnz={self.nnz})"
+
+class _Compressed:
+    __slots__ = ['indptr', 'indices', 'data', '_rows', '_cols']
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self._rows, self._cols = shape
+
+    def shape(self):
+        return self._rows, self._cols
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def _find(self, major, minor):
+        start, end = self.indptr[major], self.indptr[major + 1]
+        k = bisect_left(self.indices, minor, start, end)
+        return self.data[k] if k < end and self.indices[k] == minor else 0.0
+
+    def _products(self, x):
+        """data[k] * x[indices[k]] for every stored entry, computed in C."""
+        if isinstance(x, array):
+            # Gathering from a list skips re-boxing a float per stored entry
+            x = x.tolist()
+        return list(map(mul, self.data, map(x.__getitem__, self.indices)))
+
+    def _segment_sums(self, prods):
+        ip = self.indptr
+        return array('d', [sum(prods[s:e]) for s, e in zip(ip, ip[1:])])
+
+    def _scatter(self, x, n):
+        y = array('d', bytes(8 * n))
+        ip, idx, data = self.indptr, self.indices, self.data
+        for major in range(len(ip) - 1):
+            xm = x[major]
+            if xm != 0.0:
+                for k in range(ip[major], ip[major + 1]):
+                    y[idx[k]] += data[k] * xm
+        return y
+
+    def __repr__(self):
+        return f"{type(self).__name__}(shape={self.shape()}, nnz={self.nnz})"
+
+class CSR(_Compressed):
+    """
+    Compressed sparse row matrix: the column indices and values of row i
+    are indices[indptr[i]:indptr[i+1]] and data[indptr[i]:indptr[i+1]].
+    """
+    __slots__ = []
+
+    @classmethod
+    def from_matrix(cls, m: matrix, tol: float = 0.0) -> 'CSR':
+        """Keeps the entries of m with |value| > tol."""
+        indptr = array(_INDEX, [0])
+        indices = array(_INDEX)
+        data = array('d')
+        for i in range(m.rows()):
+            for j, v in enumerate(m._row_seq(i)):
+                if abs(v) > tol:
+                    indices.append(j)
+                    data.append(v)
+            indptr.append(len(indices))
+        return cls(indptr, indices, data, m.shape())
+
+    def __getitem__(self, idx):
+        i, j = idx
+        return self._find(i, j)
+
+    def matvec(self, x, out=None) -> array:
+        """y = A x for a sequence x (array, list or memoryview) of length cols."""
+        y = self._segment_sums(self._products(_as_buffer(x, self._cols)))
+        if out is None:
+            return y
+        out[:] = y
+        return out
+
+    def rmatvec(self, x) -> array:
+        """y = A^T x."""
+        return self._scatter(_as_buffer(x, self._rows), self._cols)
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return CSR(array(_INDEX, self.indptr), array(_INDEX, self.indices),
+                       array('d', [other * v for v in self.data]), self.shape())
+        if isinstance(other, matrix):
+            if other.rows() != self._cols:
+                raise ValueError("Incompatible dimensions for matrix multiplication.")
+            return matrix.from_columns([self.matvec(other._col_seq(j)) for j in range(other.cols())])
+        return self.matvec(other)
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return self * other
+        return NotImplemented
+
+    def transpose(self) -> 'CSC':
+        """Zero-copy transpose: the same buffers read as a CSC matrix."""
+        return CSC(self.indptr, self.indices, self.data, (self._cols, self._rows))
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def tocsc(self) -> 'CSC':
+        major = array(_INDEX)
+        for i in range(self._rows):
+            major.extend(repeat(i, self.indptr[i + 1] - self.indptr[i]))
+        return CSC(*_compress(self.indices, major, self.data, self._cols), self.shape())
+
+    def diagonal(self) -> array:
+        return array('d', [self._find(i, i) for i in range(min(self._rows, self._cols))])
+
+    def to_matrix(self) -> matrix:
+        m = matrix.zeros(self._rows, self._cols)
+        dense, cols = m.data, self._cols
+        ip, idx, data = self.indptr, self.indices, self.data
+        for i in range(self._rows):
+            base = i * cols
+            for k in range(ip[i], ip[i + 1]):
+                dense[base + idx[k]] = data[k]
+        return m
+
+class CSC(_Compressed):
+    """
+    Compressed sparse column matrix: the row indices and values of column j
+    are indices[indptr[j]:indptr[j+1]] and data[indptr[j]:indptr[j+1]].
+    """
+    __slots__ = []
+
+    @classmethod
+    def from_matrix(cls, m: matrix, tol: float = 0.0) -> 'CSC':
+        return CSR.from_matrix(m.transpose(), tol).transpose()
+
+    def __getitem__(self, idx):
+        i, j = idx
+        return self._find(j, i)
+
+    def matvec(self, x, out=None) -> array:
+        y = self._scatter(_as_buffer(x, self._cols), self._rows)
+        if out is None:
+            return y
+        out[:] = y
+        return out
+
+    def rmatvec(self, x) -> array:
+        """y = A^T x, computed like a CSR product."""
+        return self._segment_sums(self._products(_as_buffer(x, self._rows)))
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return CSC(array(_INDEX, self.indptr), array(_INDEX, self.indices),
+                       array('d', [other * v for v in self.data]), self.shape())
+        if isinstance(other, matrix):
+            if other.rows() != self._cols:
+                raise ValueError("Incompatible dimensions for matrix multiplication.")
+            return matrix.from_columns([self.matvec(other._col_seq(j)) for j in range(other.cols())])
+        return self.matvec(other)
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return self * other
+        return NotImplemented
+
+    def transpose(self) -> CSR:
+        """Zero-copy transpose: the same buffers read as a CSR matrix."""
+        return CSR(self.indptr, self.indices, self.data, (self._cols, self._rows))
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def tocsr(self) -> CSR:
+        return self.transpose().tocsc().transpose()
+
+    def diagonal(self) -> array:
+        return array('d', [self._find(i, i) for i in range(min(self._rows, self._cols))])
+
+    def to_matrix(self) -> matrix:
+        return self.transpose().to_matrix().transpose().copy()
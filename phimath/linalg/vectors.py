@@ -1,9 +1,43 @@
 from array import array
+from itertools import repeat
+from math import fsum, hypot
+from operator import add, sub, mul, neg, truediv
 from phimath.math.trigo import sin, cos
 from phimath.math.constants import DEG_TO_RAD
 from phimath.control.symbols import *
+from phimath.math.dual import is_dual
+from phimath.linalg.buffers import _float_view, _array_interface
+
+_object_new = object.__new__
+
+def _component(value):
+    # Dual numbers pass through untouched so derivatives survive vector arithmetic
+    if value is None:
+        return 0.0
+    if is_dual(value):
+        return value
+    return float(value)
+
+def _xyz(v):
+    # The storage itself for plain vectors; x/y/z for anything vector-like
+    return v.data if type(v) is vector else (v.x, v.y, v.z)
+
+def _new(x, y, z):
+    """
+    Builds a vector from computed components without __new__'s symbolic
+    detection or per-component float() calls. Components that cannot live
+    in a 'd' array (dual numbers) take the regular constructor.
+    """
+    v = _object_new(vector)
+    try:
+        v.data = array('d', (x, y, z))
+    except TypeError:
+        return vector(x, y, z)
+    return v
 
 class vector:
+    __slots__ = ['data']
+
     def __new__(cls, x=None, y=None, z=None, mode=None):
         is_symbolic = isinstance(x, str) or \
                       (hasattr(x, 'name') and hasattr(x, 'is_function')) or \
@@ -16,6 +50,12 @@ class vector:
         return super(vector, cls).__new__(cls)
     
     def __init__(self, x=None, y=None, z=None, mode=None):
+        if is_dual(x) or is_dual(y) or is_dual(z):
+            # Dual components cannot live in a 'd' array; a plain list keeps
+            # every operator below working for forward-mode differentiation
+            self.data = [_component(x), _component(y), _component(z)]
+            return
+
         # 'd' denotes double-precision floats (8 bytes) for high-precision mechanics
         self.data = array('d', [0.0, 0.0, 0.0])
         
@@ -37,41 +77,148 @@ class vector:
     @property
     def x(self): return self.data[0]
     @x.setter
-    def x(self, value): self.data[0] = float(value)
+    def x(self, value): self.data[0] = _component(value)
 
     @property
     def y(self): return self.data[1]
     @y.setter
-    def y(self, value): self.data[1] = float(value)
+    def y(self, value): self.data[1] = _component(value)
 
     @property
     def z(self): return self.data[2]
     @z.setter
-    def z(self, value): self.data[2] = float(value)
+    def z(self, value): self.data[2] = _component(value)
+
+    @classmethod
+    def from_floats(cls, x: float, y: float, z: float):
+        """
+        Fast numeric constructor: skips the symbolic checks and float()
+        conversion of vector(x, y, z). Components must be real numbers.
+        """
+        v = _object_new(cls)
+        v.data = array('d', (x, y, z))
+        return v
+
+    def copy(self):
+        v = _object_new(vector)
+        # Slicing a memoryview would share the wrapped memory
+        v.data = array('d', self.data) if type(self.data) is memoryview else self.data[:]
+        return v
+
+    # Buffer interop
+
+    @classmethod
+    def from_buffer(cls, buffer, offset: int = 0):
+        """
+        Wraps three float64 values starting offset bytes into any writable
+        buffer (bytearray, mmap, array, shared memory, ...) without copying:
+        the vector reads and writes that memory directly.
+        """
+        v = _object_new(cls)
+        v.data = _float_view(buffer, 3, offset)
+        return v
+
+    @classmethod
+    def frombytes(cls, data: bytes):
+        """Copies a vector out of 24 bytes of native float64 values (see tobytes)."""
+        if len(data) != 24:
+            raise ValueError(f"A vector needs 24 bytes, got {len(data)}.")
+        v = _object_new(cls)
+        v.data = array('d')
+        v.data.frombytes(data)
+        return v
+
+    def tobytes(self) -> bytes:
+        return self.memoryview().tobytes()
+
+    def memoryview(self) -> memoryview:
+        """Writable 'd' memoryview of the three components (no copy)."""
+        if isinstance(self.data, list):
+            raise TypeError("A vector with dual components has no float64 buffer.")
+        return memoryview(self.data)
+
+    def __buffer__(self, flags):
+        # Buffer protocol for Python 3.12+: memoryview(v), struct.pack_into, ...
+        return self.memoryview()
+
+    @property
+    def __array_interface__(self):
+        return _array_interface(self.data, (3,))
 
     def __add__(self, other):
-        return vector(self.data[0] + other.x, self.data[1] + other.y, self.data[2] + other.z)
+        d, o = self.data, _xyz(other)
+        return _new(d[0] + o[0], d[1] + o[1], d[2] + o[2])
 
     def __sub__(self, other):
-        return vector(self.data[0] - other.x, self.data[1] - other.y, self.data[2] - other.z)
+        d, o = self.data, _xyz(other)
+        return _new(d[0] - o[0], d[1] - o[1], d[2] - o[2])
 
     def __mul__(self, scalar):
-        return vector(self.data[0] * scalar, self.data[1] * scalar, self.data[2] * scalar)
+        d = self.data
+        return _new(d[0] * scalar, d[1] * scalar, d[2] * scalar)
     
     def __rmul__(self, scalar):
         return self.__mul__(scalar)
     
     def __truediv__(self, scalar):
-        return vector(self.data[0] / scalar, self.data[1] / scalar, self.data[2] / scalar)
-    
+        d = self.data
+        return _new(d[0] / scalar, d[1] / scalar, d[2] / scalar)
+
+    # In-place arithmetic: updates this vector's storage, allocates nothing.
+    # Note that every name bound to this vector sees the change.
+
+    def _store(self, x, y, z):
+        d = self.data
+        try:
+            d[0] = x
+            d[1] = y
+            d[2] = z
+        except TypeError:
+            if not (is_dual(x) or is_dual(y) or is_dual(z)):
+                raise   # e.g. a read-only wrapped buffer
+            # A dual component arrived; switch to list storage like the constructor
+            self.data = [x, y, z]
+        return self
+
+    def set(self, x, y, z):
+        """Overwrites the components in place."""
+        return self._store(x, y, z)
+
+    def zero(self):
+        """Sets every component to 0 in place."""
+        return self._store(0.0, 0.0, 0.0)
+
+    def __iadd__(self, other):
+        d, o = self.data, _xyz(other)
+        return self._store(d[0] + o[0], d[1] + o[1], d[2] + o[2])
+
+    def __isub__(self, other):
+        d, o = self.data, _xyz(other)
+        return self._store(d[0] - o[0], d[1] - o[1], d[2] - o[2])
+
+    def __imul__(self, scalar):
+        d = self.data
+        return self._store(d[0] * scalar, d[1] * scalar, d[2] * scalar)
+
+    def __itruediv__(self, scalar):
+        d = self.data
+        return self._store(d[0] / scalar, d[1] / scalar, d[2] / scalar)
+
+    def add_scaled(self, other, scalar):
+        """self += other * scalar in place, without the temporary vector (axpy)."""
+        d, o = self.data, _xyz(other)
+        return self._store(d[0] + o[0] * scalar, d[1] + o[1] * scalar, d[2] + o[2] * scalar)
+
     def dot(self, other):
-        return self.data[0] * other.x + self.data[1] * other.y + self.data[2] * other.z
+        d, o = self.data, _xyz(other)
+        return d[0] * o[0] + d[1] * o[1] + d[2] * o[2]
 
     def cross(self, other):
-        return vector(
-            self.data[1] * other.z - self.data[2] * other.y,
-            self.data[2] * other.x - self.data[0] * other.z,
-            self.data[0] * other.y - self.data[1] * other.x
+        d, o = self.data, _xyz(other)
+        return _new(
+            d[1] * o[2] - d[2] * o[1],
+            d[2] * o[0] - d[0] * o[2],
+            d[0] * o[1] - d[1] * o[0]
         )
     
     def magnitude(self):
@@ -82,8 +229,252 @@ class vector:
     def normalize(self):
         mag = self.magnitude()
         if mag == 0:
-            return vector(0.0, 0.0, 0.0)
+            return _new(0.0, 0.0, 0.0)
         return self.__truediv__(mag)
     
     def __repr__(self):
-        return f"vector({self.data[0]}, {self.data[1]}, {self.data[2]})"
\ No newline at end of file
+        return f"vector({self.data[0]}, {self.data[1]}, {self.data[2]})"
+
+def _broadcast(other, n):
+    """Columns of a VectorArray (length-checked) or a single vector repeated n times."""
+    if isinstance(other, VectorArray):
+        if len(other) != n:
+            raise ValueError(f"VectorArray lengths differ: {n} and {len(other)}.")
+        return other.xs, other.ys, other.zs
+    if isinstance(other, vector):
+        return repeat(other.x, n), repeat(other.y, n), repeat(other.z, n)
+    raise TypeError(f"Expected a VectorArray or a vector, got {type(other).__name__}.")
+
+def _factors(scalar, n):
+    # One number for every vector, or one number per vector
+    if isinstance(scalar, (int, float)):
+        return repeat(float(scalar), n)
+    if len(scalar) != n:
+        raise ValueError(f"Expected {n} factors, got {len(scalar)}.")
+    return scalar
+
+class VectorArray:
+    """
+    N three-dimensional vectors stored as three contiguous array('d')
+    columns xs, ys, zs (structure of arrays).
+
+    Every operation works on whole columns with map() over the arrays, so
+    Python's loop overhead is paid once per batch instead of once per
+    vector, and no intermediate vector objects are created. Arithmetic
+    broadcasts a single vector against every element:
+
+        r = VectorArray.from_vectors(p.r for p in particles)
+        r += v * dt
+        r.scatter_to(p.r for p in particles)
+
+    A[i] gathers one element as a new vector, A[i] = v scatters one back;
+    gather_from/scatter_to copy between the array and existing vector
+    objects in place.
+    """
+    __slots__ = ['xs', 'ys', 'zs']
+
+    def __init__(self, xs=(), ys=(), zs=()):
+        self.xs = xs if isinstance(xs, array) and xs.typecode == 'd' else array('d', xs)
+        self.ys = ys if isinstance(ys, array) and ys.typecode == 'd' else array('d', ys)
+        self.zs = zs if isinstance(zs, array) and zs.typecode == 'd' else array('d', zs)
+        if not len(self.xs) == len(self.ys) == len(self.zs):
+            raise ValueError("VectorArray columns must have the same length.")
+
+    @classmethod
+    def _wrap(cls, xs, ys, zs):
+        va = object.__new__(cls)
+        va.xs = xs
+        va.ys = ys
+        va.zs = zs
+        return va
+
+    # Bulk constructors
+
+    @classmethod
+    def zeros(cls, n: int):
+        return cls._wrap(array('d', bytes(8 * n)), array('d', bytes(8 * n)), array('d', bytes(8 * n)))
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """Gathers any iterable of vectors (or (x, y, z) triples) into columns."""
+        xs, ys, zs = array('d'), array('d'), array('d')
+        for v in vectors:
+            if isinstance(v, vector):
+                v = v.data
+            xs.append(v[0])
+            ys.append(v[1])
+            zs.append(v[2])
+        return cls._wrap(xs, ys, zs)
+
+    @classmethod
+    def from_interleaved(cls, values):
+        """Splits x0, y0, z0, x1, y1, z1, ... into columns."""
+        buf = values if isinstance(values, array) and values.typecode == 'd' else array('d', values)
+        if len(buf) % 3:
+            raise ValueError("Interleaved data must hold a multiple of 3 values.")
+        return cls._wrap(buf[0::3], buf[1::3], buf[2::3])
+
+    def interleaved(self) -> array:
+        """The vectors as one x0, y0, z0, x1, ... buffer."""
+        out = array('d', bytes(24 * len(self.xs)))
+        out[0::3] = self.xs
+        out[1::3] = self.ys
+        out[2::3] = self.zs
+        return out
+
+    def copy(self):
+        return VectorArray._wrap(array('d', self.xs), array('d', self.ys), array('d', self.zs))
+
+    # Gather / scatter
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return VectorArray._wrap(self.xs[idx], self.ys[idx], self.zs[idx])
+        return vector.from_floats(self.xs[idx], self.ys[idx], self.zs[idx])
+
+    def __setitem__(self, idx, v):
+        if isinstance(idx, slice):
+            self.xs[idx], self.ys[idx], self.zs[idx] = v.xs, v.ys, v.zs
+            return
+        self.xs[idx] = v.x
+        self.ys[idx] = v.y
+        self.zs[idx] = v.z
+
+    def __iter__(self):
+        return map(vector.from_floats, self.xs, self.ys, self.zs)
+
+    def to_vectors(self) -> list:
+        return list(self)
+
+    def gather(self, indices):
+        """New VectorArray holding the elements at the given indices."""
+        indices = list(indices)
+        xs, ys, zs = self.xs, self.ys, self.zs
+        return VectorArray._wrap(array('d', [xs[i] for i in indices]),
+                                 array('d', [ys[i] for i in indices]),
+                                 array('d', [zs[i] for i in indices]))
+
+    def scatter(self, indices, values: 'VectorArray'):
+        """Writes values[k] into element indices[k], in place."""
+        xs, ys, zs = self.xs, self.ys, self.zs
+        for k, i in enumerate(indices):
+            xs[i] = values.xs[k]
+            ys[i] = values.ys[k]
+            zs[i] = values.zs[k]
+
+    def gather_from(self, vectors):
+        """Overwrites the columns, in place, with the components of existing vectors."""
+        n = 0
+        xs, ys, zs = self.xs, self.ys, self.zs
+        for n, v in enumerate(vectors, 1):
+            d = v.data
+            xs[n - 1] = d[0]
+            ys[n - 1] = d[1]
+            zs[n - 1] = d[2]
+        if n != len(xs):
+            raise ValueError(f"Expected {len(xs)} vectors, got {n}.")
+
+    def scatter_to(self, vectors):
+        """Writes every element into the matching existing vector object, in place."""
+        n = 0
+        for n, (v, x, y, z) in enumerate(zip(vectors, self.xs, self.ys, self.zs), 1):
+            d = v.data
+            d[0] = x
+            d[1] = y
+            d[2] = z
+        if n != len(self.xs):
+            raise ValueError(f"Expected {len(self.xs)} vectors, got {n}.")
+
+    # Bulk arithmetic
+
+    def __add__(self, other):
+        ox, oy, oz = _broadcast(other, len(self))
+        return VectorArray._wrap(array('d', map(add, self.xs, ox)), array('d', map(add, self.ys, oy)),
+                                 array('d', map(add, self.zs, oz)))
+
+    def __sub__(self, other):
+        ox, oy, oz = _broadcast(other, len(self))
+        return VectorArray._wrap(array('d', map(sub, self.xs, ox)), array('d', map(sub, self.ys, oy)),
+                                 array('d', map(sub, self.zs, oz)))
+
+    def __neg__(self):
+        return VectorArray._wrap(array('d', map(neg, self.xs)), array('d', map(neg, self.ys)),
+                                 array('d', map(neg, self.zs)))
+
+    def __mul__(self, scalar):
+        """Scales every vector by one number, or vector i by scalar[i]."""
+        n = len(self)
+        return VectorArray._wrap(array('d', map(mul, self.xs, _factors(scalar, n))),
+                                 array('d', map(mul, self.ys, _factors(scalar, n))),
+                                 array('d', map(mul, self.zs, _factors(scalar, n))))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        n = len(self)
+        return VectorArray._wrap(array('d', map(truediv, self.xs, _factors(scalar, n))),
+                                 array('d', map(truediv, self.ys, _factors(scalar, n))),
+                                 array('d', map(truediv, self.zs, _factors(scalar, n))))
+
+    def __iadd__(self, other):
+        ox, oy, oz = _broadcast(other, len(self))
+        self.xs[:] = array('d', map(add, self.xs, ox))
+        self.ys[:] = array('d', map(add, self.ys, oy))
+        self.zs[:] = array('d', map(add, self.zs, oz))
+        return self
+
+    def __isub__(self, other):
+        ox, oy, oz = _broadcast(other, len(self))
+        self.xs[:] = array('d', map(sub, self.xs, ox))
+        self.ys[:] = array('d', map(sub, self.ys, oy))
+        self.zs[:] = array('d', map(sub, self.zs, oz))
+        return self
+
+    def __imul__(self, scalar):
+        n = len(self)
+        self.xs[:] = array('d', map(mul, self.xs, _factors(scalar, n)))
+        self.ys[:] = array('d', map(mul, self.ys, _factors(scalar, n)))
+        self.zs[:] = array('d', map(mul, self.zs, _factors(scalar, n)))
+        return self
+
+    def dot(self, other) -> array:
+        """Element-wise dot products, one per vector."""
+        ox, oy, oz = _broadcast(other, len(self))
+        return array('d', map(add, map(add, map(mul, self.xs, ox), map(mul, self.ys, oy)), map(mul, self.zs, oz)))
+
+    def cross(self, other) -> 'VectorArray':
+        """Element-wise cross products self[i] x other[i]."""
+        x, y, z = self.xs, self.ys, self.zs
+        ox, oy, oz = _broadcast(other, len(self))
+        return VectorArray._wrap(array('d', map(sub, map(mul, y, oz), map(mul, z, oy))),
+                                 array('d', map(sub, map(mul, z, ox), map(mul, x, oz))),
+                                 array('d', map(sub, map(mul, x, oy), map(mul, y, ox))))
+
+    def norm(self) -> array:
+        """Euclidean length of every vector."""
+        return array('d', map(hypot, self.xs, self.ys, self.zs))
+
+    def normalize(self) -> 'VectorArray':
+        """Unit vectors; zero vectors stay zero, as in vector.normalize()."""
+        inv = [1.0 / r if r else 0.0 for r in map(hypot, self.xs, self.ys, self.zs)]
+        return self * inv
+
+    # Reductions
+
+    def sum(self) -> vector:
+        return vector(fsum(self.xs), fsum(self.ys), fsum(self.zs))
+
+    def mean(self) -> vector:
+        if not len(self):
+            raise ValueError("Mean of an empty VectorArray.")
+        return self.sum() / len(self)
+
+    def weighted_sum(self, weights) -> vector:
+        """sum_i weights[i] * self[i], e.g. the total momentum from velocities and masses."""
+        return (self * weights).sum()
+
+    def __repr__(self):
+        return f"VectorArray(n={len(self)})"
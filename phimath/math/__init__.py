@@ -2,6 +2,7 @@ from .constants import E, PI, TWO_PI, HALF_PI, DEG_TO_RAD, RAD_TO_DEG
 from .trigo import normalize_angle, sin, cos, sin_deg, cos_deg, tan, tan_deg, sinh, cosh, tanh, sech, csch, coth, asin, acos, atan, atan2, sec, csc, cot, sec_deg, csc_deg, cot_deg
 from .exp_log import exp, ln, log
 from .func import sqrt, cbrt, pow, abs, make_function
+from .dual import Dual, HyperDual
 
 __all__ = [
     #contants
@@ -15,5 +16,7 @@ __all__ = [
     #exponential and logarithmic functions
     "exp","ln","log",
     #other math functions
-    "sqrt","cbrt","pow", "abs","make_function"
+    "sqrt","cbrt","pow", "abs","make_function",
+    #automatic differentiation numbers
+    "Dual","HyperDual"
     ]
@@ -0,0 +1,299 @@
+"""
+Dual and hyper-dual numbers for forward-mode automatic differentiation.
+
+A Dual carries a value together with its partial derivatives with respect
+to one or more seed directions, so a single evaluation of a function built
+from phimath.math yields exact first derivatives. A HyperDual carries the
+extra mixed term needed for exact second derivatives.
+
+This module only depends on the standard library so that the scalar
+functions in phimath.math can import it without cycles.
+"""
+import math
+
+
+class Dual:
+    """
+    Dual number a + sum(b_i * eps_i) with eps_i * eps_j = 0.
+
+    real : float
+        The value part.
+    eps : float or sequence of float
+        The derivative part. A single float seeds one direction, a sequence
+        of length n seeds n directions at once (e.g. a 3-component gradient).
+    """
+    __slots__ = ('real', 'eps')
+
+    def __init__(self, real, eps=1.0):
+        self.real = float(real)
+        if isinstance(eps, (int, float)):
+            self.eps = (float(eps),)
+        else:
+            self.eps = tuple(float(e) for e in eps)
+
+    @classmethod
+    def _make(cls, real, eps):
+        # Internal constructor that skips the float() conversions
+        d = object.__new__(cls)
+        d.real = real
+        d.eps = eps
+        return d
+
+    @property
+    def dual(self):
+        """Derivative part of a single-direction dual number."""
+        return self.eps[0]
+
+    def chain(self, f0, f1, f2=None):
+        """
+        Applies a scalar function through the chain rule.
+        f0, f1 are the function value and first derivative at self.real;
+        f2 (second derivative) is ignored for first-order duals.
+        """
+        return Dual._make(f0, tuple(f1 * e for e in self.eps))
+
+    # --- Arithmetic ---
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual._make(self.real + other.real, tuple(p + q for p, q in zip(self.eps, other.eps)))
+        if isinstance(other, (int, float)):
+            return Dual._make(self.real + other, self.eps)
+        return NotImplemented
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual._make(self.real - other.real, tuple(p - q for p, q in zip(self.eps, other.eps)))
+        if isinstance(other, (int, float)):
+            return Dual._make(self.real - other, self.eps)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, (int, float)):
+            return Dual._make(other - self.real, tuple(-e for e in self.eps))
+        return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            a, b = self.real, other.real
+            return Dual._make(a * b, tuple(a * q + b * p for p, q in zip(self.eps, other.eps)))
+        if isinstance(other, (int, float)):
+            return Dual._make(self.real * other, tuple(e * other for e in self.eps))
+        return NotImplemented
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            a, b = self.real, other.real
+            b2 = b * b
+            return Dual._make(a / b, tuple((p * b - a * q) / b2 for p, q in zip(self.eps, other.eps)))
+        if isinstance(other, (int, float)):
+            return Dual._make(self.real / other, tuple(e / other for e in self.eps))
+        return NotImplemented
+
+    def __rtruediv__(self, other):
+        if isinstance(other, (int, float)):
+            a = self.real
+            f1 = -other / (a * a)
+            return Dual._make(other / a, tuple(f1 * e for e in self.eps))
+        return NotImplemented
+
+    def __pow__(self, other):
+        a = self.real
+        if isinstance(other, Dual):
+            # x^y = exp(y ln x)
+            f0 = a ** other.real
+            la = math.log(a)
+            return Dual._make(f0, tuple(f0 * (other.real * p / a + la * q) for p, q in zip(self.eps, other.eps)))
+        if isinstance(other, (int, float)):
+            if other == 0:
+                return Dual._make(1.0, tuple(0.0 for _ in self.eps))
+            return self.chain(a ** other, other * a ** (other - 1))
+        return NotImplemented
+
+    def __rpow__(self, other):
+        if isinstance(other, (int, float)):
+            f0 = other ** self.real
+            return self.chain(f0, f0 * math.log(other))
+        return NotImplemented
+
+    def __neg__(self):
+        return Dual._make(-self.real, tuple(-e for e in self.eps))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.real < 0 else self
+
+    # --- Comparisons act on the value part only ---
+    def __eq__(self, other):
+        return self.real == (other.real if isinstance(other, Dual) else other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        return self.real < (other.real if isinstance(other, Dual) else other)
+
+    def __le__(self, other):
+        return self.real <= (other.real if isinstance(other, Dual) else other)
+
+    def __gt__(self, other):
+        return self.real > (other.real if isinstance(other, Dual) else other)
+
+    def __ge__(self, other):
+        return self.real >= (other.real if isinstance(other, Dual) else other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        if len(self.eps) == 1:
+            return f"Dual({self.real}, {self.eps[0]})"
+        return f"Dual({self.real}, {self.eps})"
+
+
+class HyperDual:
+    """
+    Hyper-dual number a + b*e1 + c*e2 + d*e1e2 with e1^2 = e2^2 = 0.
+    Seeding b = c = 1 makes d the exact second derivative.
+    """
+    __slots__ = ('real', 'e1', 'e2', 'e12')
+
+    def __init__(self, real, e1=1.0, e2=1.0, e12=0.0):
+        self.real = float(real)
+        self.e1 = float(e1)
+        self.e2 = float(e2)
+        self.e12 = float(e12)
+
+    @classmethod
+    def _make(cls, real, e1, e2, e12):
+        h = object.__new__(cls)
+        h.real = real
+        h.e1 = e1
+        h.e2 = e2
+        h.e12 = e12
+        return h
+
+    def chain(self, f0, f1, f2=0.0):
+        """
+        Applies a scalar function through the second-order chain rule.
+        f0, f1, f2 are the function value and its first two derivatives at self.real.
+        """
+        return HyperDual._make(f0, f1 * self.e1, f1 * self.e2, f1 * self.e12 + f2 * self.e1 * self.e2)
+
+    # --- Arithmetic ---
+    def __add__(self, other):
+        if isinstance(other, HyperDual):
+            return HyperDual._make(self.real + other.real, self.e1 + other.e1, self.e2 + other.e2, self.e12 + other.e12)
+        if isinstance(other, (int, float)):
+            return HyperDual._make(self.real + other, self.e1, self.e2, self.e12)
+        return NotImplemented
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        if isinstance(other, HyperDual):
+            return HyperDual._make(self.real - other.real, self.e1 - other.e1, self.e2 - other.e2, self.e12 - other.e12)
+        if isinstance(other, (int, float)):
+            return HyperDual._make(self.real - other, self.e1, self.e2, self.e12)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, (int, float)):
+            return HyperDual._make(other - self.real, -self.e1, -self.e2, -self.e12)
+        return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, HyperDual):
+            a, b = self, other
+            return HyperDual._make(
+                a.real * b.real,
+                a.real * b.e1 + a.e1 * b.real,
+                a.real * b.e2 + a.e2 * b.real,
+                a.real * b.e12 + a.e1 * b.e2 + a.e2 * b.e1 + a.e12 * b.real,
+            )
+        if isinstance(other, (int, float)):
+            return HyperDual._make(self.real * other, self.e1 * other, self.e2 * other, self.e12 * other)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def _reciprocal(self):
+        a = self.real
+        return self.chain(1.0 / a, -1.0 / (a * a), 2.0 / (a * a * a))
+
+    def __truediv__(self, other):
+        if isinstance(other, HyperDual):
+            return self * other._reciprocal()
+        if isinstance(other, (int, float)):
+            return HyperDual._make(self.real / other, self.e1 / other, self.e2 / other, self.e12 / other)
+        return NotImplemented
+
+    def __rtruediv__(self, other):
+        if isinstance(other, (int, float)):
+            return self._reciprocal() * other
+        return NotImplemented
+
+    def __pow__(self, other):
+        a = self.real
+        if isinstance(other, HyperDual):
+            # x^y = exp(y ln x)
+            from phimath.math.exp_log import exp, ln
+            return exp(other * ln(self))
+        if isinstance(other, (int, float)):
+            if other == 0:
+                return HyperDual._make(1.0, 0.0, 0.0, 0.0)
+            return self.chain(a ** other, other * a ** (other - 1), other * (other - 1) * a ** (other - 2))
+        return NotImplemented
+
+    def __rpow__(self, other):
+        if isinstance(other, (int, float)):
+            f0 = other ** self.real
+            lc = math.log(other)
+            return self.chain(f0, f0 * lc, f0 * lc * lc)
+        return NotImplemented
+
+    def __neg__(self):
+        return HyperDual._make(-self.real, -self.e1, -self.e2, -self.e12)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.real < 0 else self
+
+    # --- Comparisons act on the value part only ---
+    def __eq__(self, other):
+        return self.real == (other.real if isinstance(other, HyperDual) else other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        return self.real < (other.real if isinstance(other, HyperDual) else other)
+
+    def __le__(self, other):
+        return self.real <= (other.real if isinstance(other, HyperDual) else other)
+
+    def __gt__(self, other):
+        return self.real > (other.real if isinstance(other, HyperDual) else other)
+
+    def __ge__(self, other):
+        return self.real >= (other.real if isinstance(other, HyperDual) else other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"HyperDual({self.real}, {self.e1}, {self.e2}, {self.e12})"
+
+
+def is_dual(x) -> bool:
+    """Check if x is a Dual or HyperDual number."""
+    return isinstance(x, (Dual, HyperDual))
@@ -1,5 +1,7 @@
 import math
+import cmath
 from phimath.control.symbols import Expression
+from phimath.math.dual import is_dual
 # -------------------------------------------------
 # Exponential
 # -------------------------------------------------
@@ -7,6 +9,11 @@ from phimath.control.symbols import Expression
 def exp(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "exp", None)
+    if is_dual(x):
+        e = math.exp(x.real)
+        return x.chain(e, e, e)
+    if isinstance(x, complex):
+        return cmath.exp(x)
     return math.exp(x)
 # -------------------------------------------------
 # Natural logarithm
@@ -15,6 +22,11 @@ def exp(x: float) -> float:
 def ln(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "ln", None)
+    if is_dual(x):
+        a = x.real
+        return x.chain(math.log(a), 1 / a, -1 / (a * a))
+    if isinstance(x, complex):
+        return cmath.log(x)
     return math.log(x)
 
 # -------------------------------------------------
@@ -25,5 +37,8 @@ def log(x, base=10):
     if hasattr(x, 'derive') or hasattr(x, 'evaluate') or hasattr(base, 'derive'):
         # Use left for the argument and right for the base
         return Expression(x, "log", base)
-    
+    if is_dual(x) or is_dual(base):
+        return ln(x) / ln(base)
+    if isinstance(x, complex) or isinstance(base, complex):
+        return cmath.log(x) / cmath.log(base)
     return math.log(x, base)
@@ -1,27 +1,56 @@
 from array import array
 import math
+import cmath
+from contextvars import ContextVar
 from phimath.control.symbols import Expression
+from phimath.math.dual import is_dual
+
+# Set only by calculas.differentiate.complex_step, which needs the analytic
+# continuation of |x| (x or -x by the sign of the real part) instead of the modulus
+_analytic_abs = ContextVar('analytic_abs', default=False)
 
 def sqrt(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "sqrt", None)
-    if x < 0:
-        return x**0.5  # Handle negative inputs by returning complex result
+    if is_dual(x):
+        r = math.sqrt(x.real)
+        return x.chain(r, 0.5 / r, -0.25 / (r * x.real))
+    if isinstance(x, complex) or x < 0:
+        return cmath.sqrt(x)  # Handle complex and negative inputs by returning complex result
     return math.sqrt(x)
 
 def cbrt(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "cbrt", None)
+    if is_dual(x):
+        r = math.cbrt(x.real)
+        return x.chain(r, r / (3 * x.real), -2 * r / (9 * x.real * x.real))
+    if isinstance(x, complex):
+        # Real branch, matching math.cbrt on the real axis (the principal
+        # branch of x ** (1/3) is complex for negative x)
+        if x.real < 0:
+            return -((-x) ** (1 / 3))
+        return x ** (1 / 3)
     return math.cbrt(x)
 
 def pow(x: float, n: int) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "**", n)
+    if is_dual(x) or is_dual(n):
+        return x ** n
+    if isinstance(x, complex) or isinstance(n, complex):
+        return x ** n
     return math.pow(x, n)
 
 def abs(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "abs", None)
+    if is_dual(x):
+        return -x if x.real < 0 else x
+    if isinstance(x, complex):
+        if _analytic_abs.get():
+            return -x if x.real < 0 else x
+        return math.hypot(x.real, x.imag)
     return math.fabs(x)
 
 def make_function(xi: array, yi: array) -> callable:
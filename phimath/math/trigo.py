@@ -1,6 +1,8 @@
 import math
+import cmath
 from phimath.math.constants import DEG_TO_RAD
 from phimath.control.symbols import Expression
+from phimath.math.dual import is_dual
 
 def normalize_angle(x: float) -> float:
     """Reduce angle x to range [-pi, pi] using precise math.fmod"""
@@ -14,6 +16,11 @@ def sin(x: float) -> float:
     # Check if x is a Symbol or Expression by looking for calculus methods
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "sin", None)
+    if is_dual(x):
+        s, c = math.sin(x.real), math.cos(x.real)
+        return x.chain(s, c, -s)
+    if isinstance(x, complex):
+        return cmath.sin(x)
     if x == 0:
         return 0.0
     if x == math.pi:
@@ -23,6 +30,11 @@ def sin(x: float) -> float:
 def cos(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "cos", None)
+    if is_dual(x):
+        s, c = math.sin(x.real), math.cos(x.real)
+        return x.chain(c, -s, -c)
+    if isinstance(x, complex):
+        return cmath.cos(x)
     if x == math.pi / 2:
         return 0.0
     if x == 3 * math.pi / 2:
@@ -32,6 +44,12 @@ def cos(x: float) -> float:
 def tan(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "tan", None)
+    if is_dual(x):
+        t = math.tan(x.real)
+        sec2 = 1 + t * t
+        return x.chain(t, sec2, 2 * t * sec2)
+    if isinstance(x, complex):
+        return cmath.tan(x)
     if x == math.pi / 2 or x == 3 * math.pi / 2:
         raise ValueError("tan(x) is undefined for x = (2n+1)*pi/2")
     return math.tan(x)
@@ -86,12 +104,28 @@ def cot_deg(x: float) -> float:
 # -------------------------------------------------
 
 def sinh(x: float) -> float:
+    if is_dual(x):
+        sh, ch = math.sinh(x.real), math.cosh(x.real)
+        return x.chain(sh, ch, sh)
+    if isinstance(x, complex):
+        return cmath.sinh(x)
     return math.sinh(x)
 
 def cosh(x: float) -> float:
+    if is_dual(x):
+        sh, ch = math.sinh(x.real), math.cosh(x.real)
+        return x.chain(ch, sh, ch)
+    if isinstance(x, complex):
+        return cmath.cosh(x)
     return math.cosh(x)
 
 def tanh(x: float) -> float:
+    if is_dual(x):
+        t = math.tanh(x.real)
+        sech2 = 1 - t * t
+        return x.chain(t, sech2, -2 * t * sech2)
+    if isinstance(x, complex):
+        return cmath.tanh(x)
     return math.tanh(x)
 
 def sech(x: float) -> float:
@@ -118,16 +152,34 @@ def coth(x: float) -> float:
 def asin(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "asin", None)
+    if is_dual(x):
+        a = x.real
+        r = 1 / math.sqrt(1 - a * a)
+        return x.chain(math.asin(a), r, a * r ** 3)
+    if isinstance(x, complex):
+        return cmath.asin(x)
     return math.asin(x)
 
 def acos(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "acos", None)
+    if is_dual(x):
+        a = x.real
+        r = 1 / math.sqrt(1 - a * a)
+        return x.chain(math.acos(a), -r, -a * r ** 3)
+    if isinstance(x, complex):
+        return cmath.acos(x)
     return math.acos(x)
 
 def atan(x: float) -> float:
     if hasattr(x, 'derive') or hasattr(x, 'evaluate'):
         return Expression(x, "atan", None)
+    if is_dual(x):
+        a = x.real
+        r = 1 / (1 + a * a)
+        return x.chain(math.atan(a), r, -2 * a * r * r)
+    if isinstance(x, complex):
+        return cmath.atan(x)
     return math.atan(x)
 
 def atan2(y: float, x: float) -> float:
@@ -1,13 +1,18 @@
 from phimath.calculas import differentiate
+from phimath.calculas.symplectic import steps_for
 from phimath.linalg.vectors import vector
+from phimath.linalg.sparse import COO, CSR
+from phimath.linalg.matrix import matrix
+from phimath.linalg.eigen import eigh, lanczos
 from .vectorops import VectorOps
 from phimath.physics.constants import G, G_EARTH
 
 class Particle:
     def __init__(self, mass, position=None, velocity=None, radius=0.5):
         self.mass = mass
-        self.r = position if position else vector(0, 0, 0)
-        self.v = velocity if velocity else vector(0, 0, 0)
+        # Own copies: the integrator updates r, v and a in place
+        self.r = position.copy() if position else vector(0, 0, 0)
+        self.v = velocity.copy() if velocity else vector(0, 0, 0)
         self.a = vector(0, 0, 0)
         self.radius = radius
 
@@ -41,19 +46,22 @@ class RigidBody(Particle):
         min_dist = self.radius + other.radius
 
         if 0 < distance < min_dist:
-            # Velocity update
-            v1_final = (self.v * (self.mass - other.mass) + 2 * other.mass * other.v) / (self.mass + other.mass)
-            v2_final = (other.v * (other.mass - self.mass) + 2 * self.mass * self.v) / (self.mass + other.mass)
-            
+            # Velocity update, in place: v1 -= 2 m2/M (v1 - v2), v2 += 2 m1/M (v1 - v2)
+            total = self.mass + other.mass
+            relative_v = self.v - other.v
             combined_e = (self.elasticity + getattr(other, 'elasticity', 1.0)) / 2
-            self.v = v1_final * combined_e
-            other.v = v2_final * combined_e
+            self.v.add_scaled(relative_v, -2 * other.mass / total)
+            self.v *= combined_e
+            other.v.add_scaled(relative_v, 2 * self.mass / total)
+            other.v *= combined_e
 
             # Position Correction
             overlap = min_dist - distance
             correction = relative_pos.normalize() * (overlap / 2)
             self.r += correction
             other.r -= correction
+            return True
+        return False
 
 class Force:
     def __init__(self, magnitude, direction):
@@ -76,36 +84,59 @@ class SpringForce:
         self.p1 = particle1
         self.p2 = particle2
         self.damping = damping
+        self._axis = vector(0, 0, 0)    # scratch unit axis reused by apply()
 
     def apply(self):
         """Calculates tension and damping, then applies it."""
-        r_vec = self.p2.r - self.p1.r
-        r_mag = r_vec.magnitude()
+        # Works on components and one scratch vector: no temporaries per call
+        p1, p2 = self.p1, self.p2
+        r1, r2 = p1.r.data, p2.r.data
+        dx, dy, dz = r2[0] - r1[0], r2[1] - r1[1], r2[2] - r1[2]
+        r_mag = (dx * dx + dy * dy + dz * dz) ** 0.5
         
         if r_mag > 0:
             # 1. Spring Force (Hooke's Law)
-            unit_vector = r_vec.normalize()
+            ux, uy, uz = dx / r_mag, dy / r_mag, dz / r_mag
             extension = r_mag - self.rest_length
             spring_f_mag = self.k * extension
             
             # 2. Damping Force
             # We only damp the velocity along the spring's axis
-            relative_v = self.p2.v - self.p1.v
+            v1, v2 = p1.v.data, p2.v.data
             # Dot product gives the scalar projection of velocity onto the spring vector
-            v_along_spring = relative_v.dot(unit_vector) 
+            v_along_spring = (v2[0] - v1[0]) * ux + (v2[1] - v1[1]) * uy + (v2[2] - v1[2]) * uz
             damping_f_mag = self.damping * v_along_spring
             
-            # Total Force Vector
-            total_f_vec = unit_vector * (spring_f_mag + damping_f_mag)
+            # Total Force along the axis
+            total_f_mag = spring_f_mag + damping_f_mag
+            unit_vector = self._axis.set(ux, uy, uz)
             
             # Apply to particles (Equal and Opposite)
-            self.p1.a += total_f_vec / self.p1.mass
-            self.p2.a -= total_f_vec / self.p2.mass
+            p1.a.add_scaled(unit_vector, total_f_mag / p1.mass)
+            p2.a.add_scaled(unit_vector, -total_f_mag / p2.mass)
     
     def e_potential_energy(self):
         r_mag = (self.p2.r - self.p1.r).magnitude()
         return 0.5 * self.k * ((r_mag - self.rest_length)**2)
 
+    def stiffness(self):
+        """
+        3x3 tangent stiffness block K = k u u^T + (T / L)(I - u u^T) of the
+        spring in its current configuration, where u is the unit axis and
+        T = k (L - L0) the tension. The spring contributes +K to the
+        diagonal blocks of both particles and -K to the off-diagonal ones.
+        """
+        r_vec = self.p2.r - self.p1.r
+        r_mag = r_vec.magnitude()
+        if r_mag == 0:
+            return [[0.0] * 3 for _ in range(3)]
+        u = (r_vec.x / r_mag, r_vec.y / r_mag, r_vec.z / r_mag)
+        geometric = self.k * (r_mag - self.rest_length) / r_mag
+        return [
+            [(self.k - geometric) * u[i] * u[j] + (geometric if i == j else 0.0) for j in range(3)]
+            for i in range(3)
+        ]
+
     def __repr__(self):
         return f"SpringForce(k={self.k}, L0={self.rest_length}, c={self.damping})"
     
@@ -113,24 +144,96 @@ class System:
     def __init__(self, particles, springs=None):
         self.particles = particles
         self.springs = springs if springs else []
+        self._axis = vector(0, 0, 0)    # scratch unit separation for pair forces
+
+    def stiffness_matrix(self, format: str = 'csr'):
+        """
+        Sparse 3N x 3N stiffness matrix of the spring network, assembled
+        spring by spring. Particle i owns rows and columns 3i..3i+2.
+        format: 'coo', 'csr' or 'csc'
+        """
+        index = {id(p): i for i, p in enumerate(self.particles)}
+        K = COO(3 * len(self.particles))
+        for spring in self.springs:
+            block = spring.stiffness()
+            a = range(3 * index[id(spring.p1)], 3 * index[id(spring.p1)] + 3)
+            b = range(3 * index[id(spring.p2)], 3 * index[id(spring.p2)] + 3)
+            K.add_block(a, a, block)
+            K.add_block(b, b, block)
+            K.add_block(a, b, block, -1.0)
+            K.add_block(b, a, block, -1.0)
+        if format == 'coo':
+            return K
+        if format == 'csr':
+            return K.tocsr()
+        if format == 'csc':
+            return K.tocsc()
+        raise ValueError(f"Unknown format: {format}")
+
+    def inertia_tensor(self):
+        """3x3 inertia tensor sum m (|r|^2 I - r r^T) about the center of mass."""
+        total = sum(p.mass for p in self.particles)
+        com = [sum(p.mass * getattr(p.r, c) for p in self.particles) / total for c in 'xyz']
+        I = [[0.0] * 3 for _ in range(3)]
+        for p in self.particles:
+            r = [p.r.x - com[0], p.r.y - com[1], p.r.z - com[2]]
+            r2 = r[0] * r[0] + r[1] * r[1] + r[2] * r[2]
+            for i in range(3):
+                for j in range(3):
+                    I[i][j] += p.mass * ((r2 if i == j else 0.0) - r[i] * r[j])
+        return matrix(I)
+
+    def principal_axes(self):
+        """Principal moments (ascending) and axes (columns) of the inertia tensor."""
+        return eigh(self.inertia_tensor())
+
+    def normal_modes(self, k: int = None, which: str = 'smallest'):
+        """
+        Small-oscillation modes of the spring network about the current
+        configuration: K x = omega^2 M x, solved as the symmetric problem
+        M^-1/2 K M^-1/2 y = omega^2 y.
+
+        k: number of modes; all 3N modes by dense eigh when None, otherwise
+            the k smallest or largest by Lanczos on the sparse matrix
+        which: 'smallest' or 'largest' (used with k)
+        Returns: EigenResult whose values are omega^2 and whose columns are
+            displacement patterns x = M^-1/2 y
+        """
+        K = self.stiffness_matrix('csr')
+        scale = [p.mass ** -0.5 for p in self.particles for _ in range(3)]
+        data = K.data
+        for i in range(len(scale)):
+            for idx in range(K.indptr[i], K.indptr[i + 1]):
+                data[idx] *= scale[i] * scale[K.indices[idx]]
+        result = eigh(K.to_matrix()) if k is None else lanczos(K, k, which)
+        modes = result.vectors
+        for i in range(modes.rows()):
+            for j in range(modes.cols()):
+                modes[i, j] *= scale[i]
+        return result
 
     def compute_gravitational_forces(self):
+        axis = self._axis
         for i in range(len(self.particles)):
             for j in range(i + 1, len(self.particles)):
                 p1, p2 = self.particles[i], self.particles[j]
-                r_vec = p2.r - p1.r
-                r_mag = r_vec.magnitude()
+                r1, r2 = p1.r.data, p2.r.data
+                dx, dy, dz = r2[0] - r1[0], r2[1] - r1[1], r2[2] - r1[2]
+                r_mag = (dx * dx + dy * dy + dz * dz) ** 0.5
                 if r_mag > 0.1: # Softening to prevent explosions
                     f_mag = G * p1.mass * p2.mass / r_mag**2
-                    f_vec = r_vec.normalize() * f_mag
-                    if not getattr(p1, 'is_static', False): p1.a += f_vec / p1.mass
-                    if not getattr(p2, 'is_static', False): p2.a -= f_vec / p2.mass
+                    axis.set(dx / r_mag, dy / r_mag, dz / r_mag)
+                    if not getattr(p1, 'is_static', False): p1.a.add_scaled(axis, f_mag / p1.mass)
+                    if not getattr(p2, 'is_static', False): p2.a.add_scaled(axis, -f_mag / p2.mass)
 
     def resolve_collisions(self):
+        """Resolves every contact; returns True when any body was moved."""
+        moved = False
         for i in range(len(self.particles)):
             for j in range(i + 1, len(self.particles)):
                 if isinstance(self.particles[i], RigidBody) and isinstance(self.particles[j], RigidBody):
-                    self.particles[i].collide(self.particles[j])
+                    moved = self.particles[i].collide(self.particles[j]) or moved
+        return moved
 
     def get_total_energy(self):
         ke = sum(p.kinetic_energy() for p in self.particles)
@@ -148,38 +251,75 @@ class System:
                 # F = m * g
                 p.a += g_vector
 
-    def update(self, dt, sub_steps=4, gravity=vector(0, -G_EARTH, 0)):
-        sub_dt = dt / sub_steps
-        for _ in range(sub_steps):
+    def compute_accelerations(self, gravity=vector(0, -G_EARTH, 0)):
+        """Resets and accumulates the acceleration of every particle."""
         # 1. Reset
-            for p in self.particles: p.a = vector(0, 0, 0)
-        
-        # 2. Apply Global Gravity (Moved inside the loop)
-            if gravity:
-                self.apply_uniform_gravity(gravity)
-            
+        for p in self.particles: p.a.zero()
+
+        # 2. Apply Global Gravity
+        if gravity:
+            self.apply_uniform_gravity(gravity)
+
         # 3. Apply Internal Forces
-            self.compute_gravitational_forces()
-            for s in self.springs: s.apply()
-        
+        self.compute_gravitational_forces()
+        for s in self.springs: s.apply()
+
+    def update(self, dt, sub_steps=4, gravity=vector(0, -G_EARTH, 0), integrator='euler'):
+        """
+        Advances the system by dt.
+        integrator: 'euler' (semi-implicit Euler) or a symplectic method from
+        phimath.calculas.symplectic ('verlet', 'leapfrog', 'forest_ruth',
+        'yoshida4', 'yoshida6'), which keep energy drift bounded at larger dt.
+        """
+        sub_dt = dt / sub_steps
+        if integrator != 'euler':
+            ops = steps_for(integrator)
+            # Damping makes forces depend on velocity, so then every kick
+            # needs fresh accelerations; otherwise only drifts and collisions
+            # invalidate them, and velocity Verlet costs one force
+            # evaluation per sub-step (the closing kick's forces open the next)
+            velocity_forces = any(s.damping for s in self.springs)
+            fresh = False
+            for _ in range(sub_steps):
+                if self.resolve_collisions():
+                    fresh = False
+                for kind, c in ops:
+                    if kind == 'kick':
+                        if not fresh:
+                            self.compute_accelerations(gravity)
+                        for p in self.particles:
+                            if not getattr(p, "is_static", False):
+                                p.v.add_scaled(p.a, c * sub_dt)
+                        fresh = not velocity_forces
+                    else:
+                        for p in self.particles:
+                            if not getattr(p, "is_static", False):
+                                p.r.add_scaled(p.v, c * sub_dt)
+                        fresh = False
+            return
+
+        for _ in range(sub_steps):
+            self.compute_accelerations(gravity)
+
         # 4. Resolve and Integrate
             self.resolve_collisions()
             for p in self.particles:
                 if not getattr(p, "is_static", False):
-                    p.v += p.a * sub_dt
-                    p.r += p.v * sub_dt
+                    p.v.add_scaled(p.a, sub_dt)
+                    p.r.add_scaled(p.v, sub_dt)
 
 class Newtonian(System):
     def __init__(self, particles, springs=None):
         super().__init__(particles, springs)
 
-    def solve(self,duration,  dt, sub_steps=1000, gravity=None):
+    def solve(self,duration,  dt, sub_steps=1000, gravity=None, integrator='euler'):
         steps = int(duration / dt)
         for _ in range(steps):
-            self.update(dt, sub_steps=sub_steps, gravity=gravity)
+            self.update(dt, sub_steps=sub_steps, gravity=gravity, integrator=integrator)
 
     def get_positions(self):
-        return [p.r for p in self.particles]
+        # Snapshots: the integrator keeps updating each p.r in place
+        return [p.r.copy() for p in self.particles]
     
 from array import array
 from phimath.calculas.differentiate import differentiate
@@ -0,0 +1,9 @@
+from .scalar import brent, newton, batch_roots, RootResult
+from .systems import newton_system, broyden
+
+__all__ = [
+    #scalar equations
+    'brent', 'newton', 'batch_roots', 'RootResult',
+    #nonlinear systems
+    'newton_system', 'broyden'
+]
@@ -0,0 +1,267 @@
+"""
+Scalar root finders.
+
+brent and newton solve one equation f(x) = 0. batch_roots solves many
+independent bracketed equations at once: f is called once per iteration
+on the whole batch, so the Python call overhead is shared.
+"""
+from array import array
+from phimath.math.dual import Dual
+from phimath.control.numeric import EPSILON, MAX_ITERATIONS, CallCounter, has_converged, iteration_limit
+
+_MACHEPS = 2.220446049250313e-16
+
+class RootResult:
+    """
+    Outcome of a root solve.
+
+    root : float, array('d') or vector
+        The solution.
+    value : float or sequence of float
+        f at the solution (the residual).
+    iterations : int
+        Iterations performed.
+    nfev : int
+        Evaluations of f.
+    njev : int
+        Jacobian (or derivative) evaluations, where the method uses them.
+    """
+    __slots__ = ['root', 'value', 'iterations', 'nfev', 'njev']
+
+    def __init__(self, root, value, iterations, nfev, njev=0):
+        self.root = root
+        self.value = value
+        self.iterations = iterations
+        self.nfev = nfev
+        self.njev = njev
+
+    def __float__(self):
+        return float(self.root)
+
+    def __repr__(self):
+        return f"RootResult(root={self.root}, iterations={self.iterations}, nfev={self.nfev})"
+
+def _same_sign(a, b):
+    return (a > 0) == (b > 0)
+
+def brent(f: callable, a: float, b: float, xtol: float = EPSILON, max_iter: int = MAX_ITERATIONS) -> RootResult:
+    """
+    Brent's method: inverse quadratic interpolation and secant steps,
+    safeguarded by bisection. f(a) and f(b) must differ in sign.
+
+    f: function of one variable
+    a, b: bracket of the root
+    xtol: absolute tolerance on the root
+    max_iter: iteration limit (RuntimeError when reached)
+    """
+    f = CallCounter(f)
+    fa, fb = f(a), f(b)
+    if fa != 0.0 and fb != 0.0 and _same_sign(fa, fb):
+        raise ValueError("f(a) and f(b) must have opposite signs.")
+    x, fx, iterations = _brent_bracket(f, a, b, fa, fb, xtol, max_iter)
+    return RootResult(x, fx, iterations, f.calls)
+
+def _brent_bracket(f, a, b, fa, fb, xtol=EPSILON, max_iter=MAX_ITERATIONS):
+    """
+    Core of brent on a bracket whose end values fa, fb are already known.
+    Returns (x, f(x), iterations). Shared with the ODE event locator, which
+    has both end values from the integration step.
+    """
+    if fa == 0.0:
+        return a, fa, 0
+    if fb == 0.0:
+        return b, fb, 0
+    c, fc = a, fa
+    d = e = b - a
+    iterations = 0
+    while True:
+        iteration_limit(iterations, max_iter)
+        iterations += 1
+        if _same_sign(fb, fc):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * _MACHEPS * abs(b) + xtol / 2
+        m = (c - b) / 2
+        if abs(m) <= tol or fb == 0.0:
+            return b, fb, iterations
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secant step
+                p = 2 * m * s
+                q = 1 - s
+            else:
+                # Inverse quadratic interpolation
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = f(b)
+
+def _value_and_slope(f, df, x):
+    if df is not None:
+        return f(x), df(x)
+    y = f(Dual(x, 1.0))
+    if isinstance(y, Dual):
+        return y.real, y.eps[0]
+    return y, 0.0
+
+def newton(f: callable, x0: float = None, df: callable = None, bracket: tuple = None,
+           xtol: float = EPSILON, max_iter: int = MAX_ITERATIONS) -> RootResult:
+    """
+    Newton's method, optionally safeguarded by a bracket.
+
+    With a bracket (a, b) the iterate never leaves it: a Newton step that
+    would jump outside, or that shrinks the bracket too slowly, is replaced
+    by bisection, so convergence is guaranteed.
+
+    f: function of one variable
+    x0: initial guess (the bracket midpoint is used when None; one of x0
+        and bracket is required)
+    df: derivative of f; when None one dual-number evaluation of f gives both
+        the value and the exact slope, so f must be built from phimath.math functions
+    bracket: (a, b) with f(a) and f(b) of opposite sign
+    xtol: absolute tolerance on the step
+    max_iter: iteration limit (RuntimeError when reached)
+    """
+    if x0 is None and bracket is None:
+        raise ValueError("newton needs an initial guess x0 or a bracket.")
+    f = CallCounter(f)
+    njev = 0
+    if bracket is not None:
+        a, b = bracket
+        fa, fb = f(a), f(b)
+        if fa == 0.0:
+            return RootResult(a, fa, 0, f.calls)
+        if fb == 0.0:
+            return RootResult(b, fb, 0, f.calls)
+        if _same_sign(fa, fb):
+            raise ValueError("f(a) and f(b) must have opposite signs.")
+        if x0 is None or not min(a, b) < x0 < max(a, b):
+            x0 = (a + b) / 2
+        dx_old = abs(b - a)
+
+    x = x0
+    iterations = 0
+    while True:
+        iteration_limit(iterations, max_iter)
+        iterations += 1
+        fx, slope = _value_and_slope(f, df, x)
+        if df is not None:
+            njev += 1
+        if fx == 0.0:
+            return RootResult(x, fx, iterations, f.calls, njev)
+
+        if bracket is None:
+            if slope == 0.0:
+                raise ValueError(f"Zero derivative at x = {x}.")
+            dx = fx / slope
+        else:
+            if _same_sign(fx, fa):
+                a, fa = x, fx
+            else:
+                b, fb = x, fx
+            newton_ok = slope != 0.0
+            if newton_ok:
+                dx = fx / slope
+                x_new = x - dx
+                newton_ok = min(a, b) < x_new < max(a, b) and abs(2 * dx) <= dx_old
+            if not newton_ok:
+                dx = x - (a + b) / 2
+            dx_old = abs(dx)
+        x -= dx
+        if has_converged(dx, xtol):
+            fx = f(x)
+            return RootResult(x, fx, iterations, f.calls, njev)
+
+def batch_roots(f: callable, a, b, xtol: float = EPSILON, max_iter: int = MAX_ITERATIONS) -> RootResult:
+    """
+    Solves many independent bracketed problems f_m(x_m) = 0 at once with
+    Chandrupatla's method (inverse quadratic interpolation with a
+    bisection safeguard, like Brent's method but without branching state).
+
+    f: function taking an array('d') of length M (one x per problem) and
+        returning a sequence of the M values. It is called once per iteration.
+    a, b: sequences of length M bracketing each root
+    xtol: absolute tolerance on every root
+    max_iter: iteration limit (RuntimeError when reached)
+    Returns: RootResult whose root and value are array('d') of length M
+    """
+    x1 = array('d', a)
+    x2 = array('d', b)
+    M = len(x1)
+    if len(x2) != M:
+        raise ValueError("a and b must have the same length.")
+    f = CallCounter(f)
+    f1 = array('d', f(x1))
+    f2 = array('d', f(x2))
+    for m in range(M):
+        if _same_sign(f1[m], f2[m]) and f1[m] != 0.0 and f2[m] != 0.0:
+            raise ValueError(f"Problem {m} is not bracketed.")
+    x3, f3 = array('d', x1), array('d', f1)
+    xt = array('d', x1)
+    t = array('d', [0.5] * M)
+    root = array('d', x1)
+    value = array('d', f1)
+    active = []
+    for m in range(M):
+        if f2[m] == 0.0:
+            root[m], value[m] = x2[m], 0.0
+        elif f1[m] != 0.0:
+            active.append(m)
+
+    iterations = 0
+    while active:
+        iteration_limit(iterations, max_iter)
+        iterations += 1
+        for m in active:
+            xt[m] = x1[m] + t[m] * (x2[m] - x1[m])
+        ft = f(xt)
+        still = []
+        for m in active:
+            fm_t = ft[m]
+            if _same_sign(fm_t, f1[m]):
+                x3[m], f3[m] = x1[m], f1[m]
+            else:
+                x3[m], f3[m] = x2[m], f2[m]
+                x2[m], f2[m] = x1[m], f1[m]
+            x1[m], f1[m] = xt[m], fm_t
+
+            if abs(f2[m]) < abs(f1[m]):
+                root[m], value[m] = x2[m], f2[m]
+            else:
+                root[m], value[m] = x1[m], f1[m]
+            width = abs(x2[m] - x1[m])
+            tl = (4 * _MACHEPS * abs(root[m]) + xtol / 2) / width if width > 0 else 1.0
+            if tl > 0.5 or value[m] == 0.0:
+                xt[m] = root[m]
+                continue
+
+            xi = (x1[m] - x2[m]) / (x3[m] - x2[m])
+            phi = (f1[m] - f2[m]) / (f3[m] - f2[m])
+            if phi * phi < xi and (1 - phi) * (1 - phi) < 1 - xi:
+                tm = (f1[m] / (f2[m] - f1[m]) * f3[m] / (f2[m] - f3[m])
+                      + (x3[m] - x1[m]) / (x2[m] - x1[m]) * f1[m] / (f3[m] - f1[m]) * f2[m] / (f3[m] - f2[m]))
+            else:
+                tm = 0.5
+            t[m] = min(1 - tl, max(tl, tm))
+            still.append(m)
+        active = still
+    return RootResult(root, value, iterations, f.calls)
@@ -0,0 +1,143 @@
+"""
+Nonlinear systems F(x) = 0.
+
+newton_system takes full Newton steps with a backtracking line search on
+||F||^2; broyden replaces the Jacobian after the first iteration by rank-one
+updates of its inverse, trading Jacobian evaluations for iterations.
+Jacobians default to one exact dual-number evaluation of F.
+"""
+from array import array
+from phimath.linalg.matrix import matrix
+from phimath.linalg.solvers import gaussian_eleminator
+from phimath.calculas.autodiff import jacobian, _components, _rebuild
+from phimath.linalg.lu import LU
+from phimath.control.numeric import EPSILON, MAX_ITERATIONS, CallCounter, has_converged, iteration_limit
+from phimath.roots.scalar import RootResult
+
+_ARMIJO = 1e-4
+_MIN_LAMBDA = 1.0 / 1024
+
+def _sumsq(values):
+    return sum(v * v for v in values)
+
+def _jacobian_rows(jac, F, x0, x):
+    J = jac(_rebuild(x0, list(x))) if jac is not None else jacobian(F, _rebuild(x0, list(x)))
+    return J.tolist() if isinstance(J, matrix) else [list(row) for row in J]
+
+def _linear_solve(rows, rhs, linear):
+    if linear == 'lu':
+        return LU(rows).solve(rhs)
+    if linear == 'gauss':
+        res = gaussian_eleminator(matrix(rows), matrix([[v] for v in rhs]))
+        return [res[i, 0] for i in range(len(rhs))]
+    raise ValueError(f"Unknown linear solver: {linear}")
+
+def _line_search(F, x0, x, phi, direction):
+    """
+    Backtracks along direction until ||F||^2 decreases sufficiently.
+    Returns (x_new, f_new, phi_new, step) or None when no decrease is found.
+    """
+    n = len(x)
+    lam = 1.0
+    while lam >= _MIN_LAMBDA:
+        x_new = array('d', (x[j] + lam * direction[j] for j in range(n)))
+        f_new = _components(F(_rebuild(x0, list(x_new))))
+        phi_new = _sumsq(f_new)
+        if phi_new <= (1 - 2 * _ARMIJO * lam) * phi:
+            return x_new, f_new, phi_new, [lam * d for d in direction]
+        lam /= 2
+    return None
+
+def _result(x0, x, fx, iterations, F, njev):
+    return RootResult(_rebuild(x0, list(x)) if not isinstance(x0, array) else x, fx, iterations, F.calls, njev)
+
+def newton_system(F: callable, x0, jac: callable = None, tol: float = EPSILON, xtol: float = EPSILON,
+                  max_iter: int = MAX_ITERATIONS, linear: str = 'lu') -> RootResult:
+    """
+    Damped Newton's method for a system of n equations in n unknowns.
+
+    F: function taking a sequence (list, array or vector) and returning a sequence or vector
+    x0: initial guess
+    jac: jac(x) returning the Jacobian as a matrix or list of rows;
+        exact forward-mode AD of F when None
+    tol: stop when every |F_i(x)| < tol
+    xtol: stop when every step component is below xtol * (1 + |x_j|)
+    max_iter: iteration limit (RuntimeError when reached)
+    linear: 'lu' (partial-pivoting LU) or 'gauss' (gaussian_eleminator)
+    Returns: RootResult with root in the container kind of x0
+    """
+    F = CallCounter(F)
+    x = array('d', _components(x0))
+    fx = _components(F(_rebuild(x0, list(x))))
+    phi = _sumsq(fx)
+    njev = 0
+    iterations = 0
+    while not all(has_converged(v, tol) for v in fx):
+        iteration_limit(iterations, max_iter)
+        iterations += 1
+        rows = _jacobian_rows(jac, F, x0, x)
+        njev += 1
+        dx = _linear_solve(rows, [-v for v in fx], linear)
+        found = _line_search(F, x0, x, phi, dx)
+        if found is None:
+            raise RuntimeError("Line search failed to reduce the residual.")
+        x, fx, phi, step = found
+        if all(abs(step[j]) < xtol * (1 + abs(x[j])) for j in range(len(x))):
+            break
+    return _result(x0, x, fx, iterations, F, njev)
+
+def broyden(F: callable, x0, jac: callable = None, tol: float = EPSILON, xtol: float = EPSILON,
+            max_iter: int = MAX_ITERATIONS) -> RootResult:
+    """
+    Broyden's ("good") quasi-Newton method with a line search.
+
+    The Jacobian is evaluated and inverted through an LU factorization once;
+    afterwards its inverse is updated with Sherman-Morrison rank-one
+    corrections, so each iteration costs O(n^2) and a single evaluation of F.
+    When the line search fails, the Jacobian is re-evaluated.
+
+    Parameters are as for newton_system.
+    """
+    F = CallCounter(F)
+    x = array('d', _components(x0))
+    n = len(x)
+    fx = _components(F(_rebuild(x0, list(x))))
+    phi = _sumsq(fx)
+    H = None
+    njev = 0
+    iterations = 0
+    while not all(has_converged(v, tol) for v in fx):
+        iteration_limit(iterations, max_iter)
+        iterations += 1
+        if H is None:
+            H = LU(_jacobian_rows(jac, F, x0, x)).inverse().tolist()
+            njev += 1
+            fresh = True
+        dx = [-sum(H[i][k] * fx[k] for k in range(n)) for i in range(n)]
+        found = _line_search(F, x0, x, phi, dx)
+        if found is None:
+            if fresh:
+                raise RuntimeError("Line search failed to reduce the residual.")
+            H = None
+            continue
+        fresh = False
+        x, f_new, phi, s = found
+        y = [f_new[i] - fx[i] for i in range(n)]
+        fx = f_new
+        if all(abs(s[j]) < xtol * (1 + abs(x[j])) for j in range(n)):
+            break
+
+        # H += (s - H y) (s^T H) / (s^T H y)
+        Hy = [sum(H[i][k] * y[k] for k in range(n)) for i in range(n)]
+        sH = [sum(s[k] * H[k][j] for k in range(n)) for j in range(n)]
+        denom = sum(s[i] * Hy[i] for i in range(n))
+        if denom == 0.0:
+            H = None
+            continue
+        u = [(s[i] - Hy[i]) / denom for i in range(n)]
+        for i in range(n):
+            ui = u[i]
+            row = H[i]
+            for j in range(n):
+                row[j] += ui * sH[j]
+    return _result(x0, x, fx, iterations, F, njev)
@@ -0,0 +1,114 @@
+import sys
+import os
+import math
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import phimath as pm
+
+def print_header(title):
+    print(f"\n{'='*20} {title} {'='*20}")
+
+def test_dual_derivatives():
+    print_header("DUAL NUMBER DERIVATIVES")
+    f = lambda x: pm.sin(x) * pm.exp(x) + pm.sqrt(x) - pm.ln(x) + pm.pow(x, 3)
+    x0 = 1.3
+    exact = math.cos(x0) * math.exp(x0) + math.sin(x0) * math.exp(x0) + 0.5 / math.sqrt(x0) - 1 / x0 + 3 * x0 ** 2
+    d = pm.derivative(f, x0)
+    print(f"f'({x0}) = {d} (exact {exact})")
+    assert abs(d - exact) < 1e-13
+
+    # Second derivative through hyper-dual numbers
+    g = lambda x: pm.cos(x) * x ** 2
+    exact2 = -math.cos(x0) * x0 ** 2 - 4 * x0 * math.sin(x0) + 2 * math.cos(x0)
+    d2 = pm.derivative(g, x0, order=2)
+    print(f"g''({x0}) = {d2} (exact {exact2})")
+    assert abs(d2 - exact2) < 1e-12
+
+def test_dual_jacobian_and_fields():
+    print_header("DUAL JACOBIAN & VECTOR FIELDS")
+    F = lambda v: [v[0] * v[1], pm.sin(v[0]) + v[2] ** 2]
+    J = pm.jacobian(F, [1.0, 2.0, 3.0])
+    print(J)
+    assert abs(J[0, 0] - 2.0) < 1e-15 and abs(J[0, 1] - 1.0) < 1e-15
+    assert abs(J[1, 0] - math.cos(1.0)) < 1e-15 and abs(J[1, 2] - 6.0) < 1e-15
+
+    ops = pm.VectorOps(autodiff=True)
+    p = pm.vector(1.0, 2.0, 0.5)
+    grad = ops.gradient(lambda r: r.x ** 2 * r.y + pm.sin(r.z), p)
+    assert abs(grad.x - 4.0) < 1e-14 and abs(grad.y - 1.0) < 1e-14
+    assert abs(grad.z - math.cos(0.5)) < 1e-14
+
+    rotating = lambda r: pm.vector(-r.y, r.x, 0)
+    curl = ops.curl(rotating, p)
+    print(f"curl = {curl}")
+    assert abs(curl.z - 2.0) < 1e-14
+    assert abs(ops.divergence(lambda r: r * 2.0, p) - 6.0) < 1e-14
+
+def test_complex_step():
+    print_header("COMPLEX-STEP DIFFERENTIATION")
+    f = lambda x: pm.exp(x) / pm.sqrt(pm.sin(x) ** 3 + pm.cos(x) ** 3)
+    x0 = 1.5
+    reference = pm.derivative(f, x0)
+    d_complex = pm.differentiate(f, x0, method='complex')
+    d_central = pm.differentiate(f, x0)
+    print(f"complex: {d_complex} | central: {d_central} | dual: {reference}")
+    assert abs(d_complex - reference) < 1e-12 * abs(reference)
+    assert abs(d_central - reference) > abs(d_complex - reference)
+    assert pm.sqrt(-4) == 2j
+    # cbrt stays on the real branch for negative points
+    assert abs(pm.cbrt(-8 + 0j) - pm.cbrt(-8.0)) < 1e-15
+    assert abs(pm.differentiate(pm.cbrt, -8.0, method='complex') - 1 / 12) < 1e-15
+    # abs is the modulus for complex input, but differentiates like |x| under the complex step
+    from phimath.math import abs as pm_abs
+    assert pm_abs(3 + 4j) == 5.0
+    assert pm.differentiate(lambda x: pm_abs(x) ** 3, -2.0, method='complex') == -12.0
+    assert pm_abs(-3 + 4j) == 5.0
+
+def test_sparse_jacobian():
+    print_header("SPARSE JACOBIAN (COLUMN COLORING)")
+    n = 50
+    calls = [0]
+    # Chain of springs: each output couples only to its neighbours
+    def F(x):
+        calls[0] += 1
+        out = []
+        for i in range(n):
+            left = x[i - 1] if i > 0 else 0.0
+            right = x[i + 1] if i < n - 1 else 0.0
+            out.append(left - 2 * x[i] + right + 0.1 * x[i] ** 3)
+        return out
+    x0 = [0.01 * (i + 1) for i in range(n)]
+    pattern = [[j for j in (i - 1, i, i + 1) if 0 <= j < n] for i in range(n)]
+
+    J = pm.jacobian(F, x0, sparsity=pattern, method='central')
+    print(f"Central-difference evaluations: {calls[0]} for n = {n}")
+    assert calls[0] == 6
+    exact = pm.jacobian(F, x0)
+    assert isinstance(J, pm.CSR) and J.shape() == (n, n) and J.nnz == 3 * n - 2
+    for i, cols in enumerate(pattern):
+        for j in cols:
+            assert abs(J[i, j] - exact[i, j]) < 1e-7
+
+    # Detected once, then reused: only the colored evaluation per call
+    detected = pm.sparsity_pattern(F, x0)
+    assert detected == pattern
+    calls[0] = 0
+    J_dual = pm.jacobian(F, x0, sparsity=detected)
+    assert calls[0] == 1 and all(abs(J_dual[i, j] - exact[i, j]) < 1e-14 for i, cols in enumerate(pattern) for j in cols)
+    # The CSR result goes straight into the Krylov solvers: one Newton step J dx = -F(x0)
+    rhs = [-v for v in F(x0)]
+    step = pm.gmres(J_dual, rhs, tol=1e-12)
+    residual = [a - b for a, b in zip(J_dual.matvec(step.x), rhs)]
+    assert max(abs(r) for r in residual) < 1e-10
+    dense_step = exact.solve(rhs)
+    assert max(abs(a - b) for a, b in zip(step.x, dense_step.data)) < 1e-8
+    # Entries that vanish at x0 (here d(x0 x1)/dx0 = x1 = 0) stay in the pattern
+    G = lambda x: [x[0] * x[1], x[2] ** 2]
+    assert pm.sparsity_pattern(G, [2.0, 0.0, 0.0]) == [[0, 1], [2]]
+
+if __name__ == "__main__":
+    test_dual_derivatives()
+    test_dual_jacobian_and_fields()
+    test_complex_step()
+    test_sparse_jacobian()
+    print("\nALL CALCULUS TESTS PASSED!")
@@ -0,0 +1,509 @@
+import sys
+import os
+from array import array
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import phimath as pm
+
+def print_header(title):
+    print(f"\n{'='*20} {title} {'='*20}")
+
+def test_flat_storage_and_views():
+    print_header("FLAT MATRIX STORAGE")
+    m = pm.matrix([[1, 2, 3], [4, 5, 6]])
+    assert isinstance(m.data, array) and list(m.data) == [1, 2, 3, 4, 5, 6]
+    assert m.shape() == (2, 3) and m[1, 2] == 6 and m[-1, -1] == 6
+    assert m[-1, :].tolist() == [[4, 5, 6]] and m[:, -2].tolist() == [[2], [5]]
+    for bad in ((0, 3), (2, 0), (-3, 0), (0, -4), (5, slice(None)), (slice(None), 3)):
+        try:
+            m[bad]
+            assert False, f"m[{bad}] did not raise"
+        except IndexError:
+            pass
+    try:
+        m[0, 3] = 1.0
+        assert False, "out-of-range assignment accepted"
+    except IndexError:
+        pass
+
+    # Views share storage with their parent
+    t = m.transpose()
+    assert t.shape() == (3, 2) and t.data is m.data
+    assert t.tolist() == [[1, 4], [2, 5], [3, 6]]
+    t[2, 0] = 30
+    assert m[0, 2] == 30
+    assert m.row(1).tolist() == [[4, 5, 6]]
+    assert m.col(1).tolist() == [[2], [5]]
+    assert m[:, 1:].tolist() == [[2, 30], [5, 6]]
+    assert t.block(1, 3, 0, 2).T.tolist() == [[2, 30], [5, 6]]
+    m[:, 0] = [7, 8]
+    assert m.tolist() == [[7, 2, 30], [8, 5, 6]]
+
+    # Arithmetic works on views as well as contiguous matrices
+    assert (m * m.T).tolist() == [[953, 246], [246, 125]]
+    assert (m.T + m.T).tolist() == [[14, 16], [4, 10], [60, 12]]
+    c = t.copy()
+    c[0, 0] = 0
+    assert m[0, 0] == 7 and c.is_contiguous()
+
+def test_bulk_constructors():
+    print_header("BULK CONSTRUCTORS")
+    assert pm.matrix.zeros(2, 3).tolist() == [[0, 0, 0], [0, 0, 0]]
+    assert pm.matrix.identity(3).tolist() == [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    assert pm.matrix.diag([1, 2]).tolist() == [[1, 0], [0, 2]]
+    assert pm.matrix.full(1, 2, 5.0).tolist() == [[5, 5]]
+    assert pm.matrix.from_function(2, 2, lambda i, j: 10 * i + j).tolist() == [[0, 1], [10, 11]]
+    assert pm.matrix.from_columns([[1, 2], [3, 4]]).tolist() == [[1, 3], [2, 4]]
+    buf = array('d', range(6))
+    flat = pm.matrix.from_flat(buf, 3, 2)
+    assert flat.data is buf and flat[2, 1] == 5
+
+def test_matmul_kernel():
+    print_header("MATRIX MULTIPLICATION KERNEL")
+    A = pm.matrix.from_function(37, 23, lambda i, j: (i * 7 + j * 3) % 11 - 5)
+    B = pm.matrix.from_function(23, 41, lambda i, j: (i * 5 + j) % 13 - 6)
+    ref = [[sum(A[i, k] * B[k, j] for k in range(23)) for j in range(41)] for i in range(37)]
+    # Integer-valued entries keep every variant exact
+    assert (A * B).tolist() == ref
+    assert A.matmul(B, tile=8).tolist() == ref
+    assert A.matmul(B, strassen=4).tolist() == ref
+
+    out = pm.matrix.zeros(37, 41)
+    assert A.matmul(B, out=out) is out and out.tolist() == ref
+    # Strided output views are filled in place as well
+    outT = pm.matrix.zeros(41, 37)
+    A.matmul(B, out=outT.T)
+    assert outT.T.tolist() == ref
+
+def test_lu_factorization():
+    print_header("LU FACTORIZATION")
+    A = pm.matrix([[0, 2, 1], [1, 1, 0], [3, 0, 1]])
+    lu = A.lu()
+    # A zero leading pivot needs pivoting
+    assert abs(lu.det() - (-5)) < 1e-12 and abs(A.determinant() + 5) < 1e-12
+    L, U = A.lu_decomposition()
+    assert all(abs(a - b) < 1e-12 for a, b in zip((L * U).data, A.data))
+
+    # Factor once, solve many right-hand sides
+    x = lu.solve([3, 2, 4])
+    assert all(abs(v - 1) < 1e-12 for v in x)
+    B = pm.matrix([[3, 1], [2, 0], [4, 2]])
+    X = lu.solve(B)
+    assert all(abs(a - b) < 1e-12 for a, b in zip((A * X).data, B.data))
+    I = A * lu.inverse()
+    assert all(abs(a - b) < 1e-12 for a, b in zip(I.data, pm.matrix.identity(3).data))
+    assert all(abs(v - 1) < 1e-12 for v in A.solve([3, 2, 4]).data)
+    assert all(abs(a - b) < 1e-12 for a, b in zip(lu.solve_transpose([1, 2, 3]), A.T.solve([1, 2, 3]).data))
+
+    # Hager's estimate of the Hilbert matrix condition number matches the exact value
+    H = pm.matrix.from_function(8, 8, lambda i, j: 1 / (i + j + 1))
+    lu = H.lu()
+    exact, estimate = lu.cond(exact=True), lu.cond()
+    print(f"cond(H8) = {exact:.4e}, estimate {estimate:.4e}")
+    assert exact > 1e10 and estimate / exact > 0.1
+
+    # O(n^3) determinant past the old cofactor limit
+    D = pm.matrix.from_function(60, 60, lambda i, j: 2.0 if i == j else (1.0 if j == i + 1 else 0.0))
+    assert abs(D.determinant() - 2.0 ** 60) < 1e-3
+    assert pm.matrix([[1, 2], [2, 4]]).determinant() == 0.0
+
+    # Singular up to rounding: the last pivot is 1e-16, reported by rcond()
+    N = pm.matrix([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 0.9]])
+    assert not N.lu().singular and N.lu().rcond() < 1e-14
+    # Badly scaled but well-posed: every pivot is real
+    W = pm.LU([[1e20, 0], [0, 1]])
+    assert not W.singular and W.det() == 1e20 and list(W.solve([1, 1])) == [1e-20, 1.0]
+
+def test_sparse_formats():
+    print_header("SPARSE MATRICES")
+    n = 200
+    # Incremental assembly of a 1-D Laplacian; duplicates are summed
+    A = pm.COO(n)
+    for i in range(n):
+        A.add(i, i, 1.0)
+        A.add(i, i, 1.0)
+        if i > 0:
+            A.add(i, i - 1, -1.0)
+        if i < n - 1:
+            A.add(i, i + 1, -1.0)
+    csr = A.tocsr()
+    print(csr)
+    assert csr.nnz == 3 * n - 2 and csr[5, 5] == 2.0 and csr[5, 7] == 0.0
+
+    x = array('d', [i * 0.01 for i in range(n)])
+    dense = csr.to_matrix()
+    y_dense = (dense * pm.matrix([[v] for v in x])).data
+    assert list(csr * x) == list(y_dense)
+    assert list(A.tocsc().matvec(x)) == list(y_dense)
+    assert csr.T.shape() == (n, n) and csr.T.data is csr.data
+    assert list(csr.rmatvec(x)) == list(csr.tocsc().T.matvec(x))
+
+    B = pm.matrix([[0, 2, 0], [1, 0, 0], [0, 0, 3], [4, 0, 5]])
+    for fmt in (pm.CSR, pm.CSC):
+        S = fmt.from_matrix(B)
+        assert S.nnz == 5 and S.to_matrix().tolist() == B.tolist()
+        assert S.T.to_matrix().tolist() == B.T.tolist()
+    assert pm.CSR.from_matrix(B).tocsc().tocsr().to_matrix().tolist() == B.tolist()
+    assert list(pm.CSC.from_matrix(B) * [1, 1, 1]) == [2, 1, 3, 9]
+    assert pm.COO.from_dict({(0, 1): 2.0, (2, 0): 1.0}, (3, 2)).tocsr().to_matrix().tolist() == [[0, 2], [0, 0], [1, 0]]
+
+    # extend checks its indices like add, and leaves the matrix unchanged on error
+    C = pm.COO(3, 2)
+    C.extend([0, 2], [1, 0], [2.0, 1.0])
+    for rows, cols in (([1, -1], [0, 0]), ([1, 3], [0, 0]), ([1, 0], [0, 2])):
+        try:
+            C.extend(rows, cols, [1.0, 1.0])
+            assert False, f"entries {list(zip(rows, cols))} accepted"
+        except IndexError:
+            pass
+    assert C.nnz == 2 and C.tocsr().to_matrix().tolist() == [[0, 2], [0, 0], [1, 0]]
+
+def laplacian_2d(m, convection=0.0):
+    A = pm.COO(m * m)
+    for i in range(m):
+        for j in range(m):
+            k = i * m + j
+            A.add(k, k, 4.0)
+            for di, dj, c in ((1, 0, -1 + convection), (-1, 0, -1 - convection), (0, 1, -1), (0, -1, -1)):
+                if 0 <= i + di < m and 0 <= j + dj < m:
+                    A.add(k, (i + di) * m + j + dj, c)
+    return A.tocsr()
+
+def test_krylov_solvers():
+    print_header("KRYLOV SOLVERS")
+    A = laplacian_2d(12)
+    N = laplacian_2d(12, convection=0.5)
+    b = [1.0 + 0.1 * (i % 7) for i in range(144)]
+
+    def check(op, res):
+        r = max(abs(u - v) for u, v in zip(op * res.x, b))
+        assert r < 1e-6 and res.residuals[0] > res.residual
+        assert len(res.residuals) == res.iterations + 1
+        return res
+
+    plain = check(A, pm.cg(A, b))
+    for M in ('jacobi', 'ssor', 'ilu'):
+        res = check(A, pm.cg(A, b, M=M))
+        print(f"cg + {M}: {res}")
+    assert check(A, pm.cg(A, b, M=pm.ILU(A))).iterations < plain.iterations
+
+    for solver in (pm.bicgstab, pm.gmres):
+        print(solver.__name__, check(N, solver(N, b)), check(N, solver(N, b, M='ilu')))
+    # Dense matrices and bare matvec functions are accepted too
+    check(N, pm.gmres(N.to_matrix(), b, restart=10))
+    check(N, pm.bicgstab(lambda x: N * x, b, x0=[1.0] * 144))
+
+    # Breakdown: b in an invariant subspace converges in one step; on a
+    # singular A the least-squares iterate is returned instead of dividing by zero
+    D = pm.CSR.from_matrix(pm.matrix([[2, 0, 0], [0, 3, 0], [0, 0, 5]]))
+    res = pm.gmres(D, [1, 0, 0])
+    assert list(res.x) == [0.5, 0.0, 0.0] and res.iterations == 1
+    S = pm.CSR.from_matrix(pm.matrix([[1, 0], [0, 0]]))
+    res = pm.gmres(S, [1, 1])
+    assert max(abs(u - v) for u, v in zip(res.x, [1.0, 1.0])) < 1e-12
+    assert abs(res.residuals[-1] - 1.0) < 1e-12 and res.iterations == 2
+
+def test_banded_solvers():
+    print_header("BANDED AND TRIDIAGONAL SOLVERS")
+    n = 40
+    diagonals = {k: [((i * 7 + k * 3) % 11 - 5) / 4 for i in range(n - abs(k))] for k in range(-2, 4)}
+    diagonals[0] = [3.0 + (i % 5) for i in range(n)]
+    B = pm.Banded.from_diagonals(diagonals)
+    D = B.to_matrix()
+    assert pm.Banded.from_matrix(D).to_matrix().tolist() == D.tolist()
+    assert B[5, 3] == D[5, 3] and B[0, 10] == 0.0
+
+    x = [((i * 5) % 9 - 4) / 3 for i in range(n)]
+    b = B.matvec(x)
+    assert max(abs(u - v) for u, v in zip(b, (D * pm.matrix([[v] for v in x])).data)) < 1e-12
+    lu = B.lu()
+    assert max(abs(u - v) for u, v in zip(lu.solve(b), x)) < 1e-10
+    assert abs(lu.det() - D.determinant()) < 1e-9 * abs(D.determinant())
+    # Several right-hand sides in one solve
+    R = pm.matrix.from_function(n, 3, lambda i, j: (i + j) % 4)
+    assert max(abs(v) for v in (D * lu.solve(R) - R).data) < 1e-10
+
+    # A 1-D diffusion step and a periodic ring of springs
+    T = pm.Tridiagonal([-1.0] * (n - 1), [2.5] * n, [-1.0] * (n - 1))
+    assert max(abs(u - v) for u, v in zip(T.matvec(T.solve(b)), b)) < 1e-12
+    assert max(abs(v) for v in (T.to_matrix() * T.solve(R) - R).data) < 1e-12
+    C = pm.CyclicTridiagonal([-1.0] * n, [2.5] * n, [-1.0] * n)
+    Cm = C.to_matrix()
+    assert Cm[0, n - 1] == -1.0 and Cm[n - 1, 0] == -1.0
+    assert max(abs(v) for v in (Cm * C.solve(R) - R).data) < 1e-12
+    y = C.solve(b)
+    assert max(abs(u - v) for u, v in zip((Cm * pm.matrix([[v] for v in y])).data, b)) < 1e-12
+
+def test_symmetric_eigen():
+    print_header("SYMMETRIC EIGENSOLVERS")
+    for n in (4, 25):
+        A = pm.matrix.from_function(n, n, lambda i, j: 1.0 / (1 + i + j) + (n if i == j else 0))
+        for method in ('jacobi', 'qr'):
+            values, V = pm.eigh(A, method=method)
+            assert list(values) == sorted(values)
+            assert max(abs(v) for v in (A * V - V * pm.matrix.diag(list(values))).data) < 1e-12
+            assert max(abs(v) for v in (V.T * V - pm.matrix.identity(n)).data) < 1e-13
+        assert abs(sum(pm.eigvalsh(A)) - sum(A[i, i] for i in range(n))) < 1e-12
+
+    # Sparse operator with a spread spectrum, checked against the dense solver
+    n = 120
+    B = pm.Tridiagonal([0.5] * (n - 1), [float(j + 1) for j in range(n)], [0.5] * (n - 1))
+    exact = pm.eigvalsh(B.to_matrix())
+    top = pm.lanczos(B.matvec, k=3, n=n)
+    print(top)
+    assert top.iterations < n and all(abs(a - b) < 1e-8 for a, b in zip(top.values, exact[-3:]))
+    X = top.vectors
+    BX = pm.matrix.from_columns([B.matvec(X._col_seq(j)) for j in range(3)])
+    assert max(abs(v) for v in (BX - X * pm.matrix.diag(list(top.values))).data) < 1e-6
+    bottom = pm.lanczos(pm.CSR.from_matrix(B.to_matrix()), k=2, which='smallest', tol=1e-10)
+    assert all(abs(a - b) < 1e-9 for a, b in zip(bottom.values, exact[:2]))
+
+def test_qr_cholesky_lstsq():
+    print_header("QR, CHOLESKY AND LEAST SQUARES")
+    m, n = 40, 5
+    A = pm.matrix.from_function(m, n, lambda i, j: ((i * 7 + j * 13) % 17 - 8) / 8 + (i == j))
+    for pivoting in (False, True):
+        f = A.qr(pivoting)
+        Q, R = f.Q(), f.R()
+        AP = pm.matrix.from_columns([A._col_seq(p) for p in f.perm])
+        assert max(abs(v) for v in (Q * R - AP).data) < 1e-13
+        assert max(abs(v) for v in (Q.T * Q - pm.matrix.identity(n)).data) < 1e-14
+    pivots = [abs(A.qr(True).R()[k, k]) for k in range(n)]
+    assert pivots == sorted(pivots, reverse=True)
+
+    # Polynomial fit: exact data is recovered, streamed in blocks as well
+    ts = [i / 100 for i in range(300)]
+    rows = [[1.0, t, t * t] for t in ts]
+    b = [3 + 2 * t - t * t for t in ts]
+    for block in (None, 64):
+        fit = pm.lstsq(rows, b, block=block)
+        assert fit.rank == 3 and fit.rows == 300 and fit.residual < 1e-20
+        assert max(abs(u - v) for u, v in zip(fit.x, [3, 2, -1])) < 1e-10
+    stream = pm.lstsq(([1.0, t, t * t] for t in ts), iter(b), block=50)
+    assert max(abs(u - v) for u, v in zip(stream.x, [3, 2, -1])) < 1e-10
+
+    # Noisy fit agrees with QR.solve; a repeated column is detected as rank loss
+    noisy = [v + 0.01 * ((i * 37) % 11 - 5) for i, v in enumerate(b)]
+    fit = pm.lstsq(rows, noisy)
+    assert max(abs(u - v) for u, v in zip(fit.x, pm.QR(rows).solve(noisy))) < 1e-12
+    residual = sum((r[0] * fit.x[0] + r[1] * fit.x[1] + r[2] * fit.x[2] - y) ** 2 for r, y in zip(rows, noisy))
+    assert abs(residual - fit.residual) < 1e-12
+    deficient = pm.lstsq([r + [2 * r[1]] for r in rows], noisy)
+    assert deficient.rank == 3 and abs(deficient.residual - fit.residual) < 1e-12
+
+    S = A.T * A
+    C = S.cholesky()
+    assert max(abs(v) for v in (C.L() * C.L().T - S).data) < 1e-12
+    rhs = [1.0, -2.0, 0.5, 0.0, 3.0]
+    assert max(abs(u - v) for u, v in zip(C.solve(rhs), S.lu().solve(rhs))) < 1e-12
+    assert abs(C.det() - S.determinant()) < 1e-9 * abs(S.determinant())
+    try:
+        pm.Cholesky([[1, 2], [2, 1]])
+        assert False, "indefinite matrix accepted"
+    except ValueError:
+        pass
+
+def test_parallel_kernels():
+    print_header("SHARED-MEMORY PARALLEL KERNELS")
+    from phimath.linalg import parallel
+    n = 130     # just above PARALLEL_THRESHOLD, so the pool is used
+    A = pm.matrix.from_function(n, n, lambda i, j: (i * 7 + j * 3) % 11 - 5)
+    B = pm.matrix.from_function(n, 20, lambda i, j: (i + 2 * j) % 7 - 3)
+    C = pm.matrix.from_function(20, n, lambda i, j: (i * j) % 5 - 2)
+    try:
+        assert pm.parallel_matmul(A, A, processes=2).tolist() == (A * A).tolist()
+        assert pm.parallel_matmul(B, C, processes=2, partition='cols').tolist() == (B * C).tolist()
+        # Small products stay serial
+        assert pm.parallel_matmul(B.T, B, processes=2).tolist() == (B.T * B).tolist()
+
+        M = A + pm.matrix.identity(n) * 40
+        lu = pm.parallel_lu(M, processes=2, panel=16)
+        ref = pm.LU(M)
+        assert lu.piv == ref.piv and abs(lu.det() - ref.det()) < 1e-9 * abs(ref.det())
+        b = [float(i % 9) for i in range(n)]
+        x = pm.parallel_solve(M, b, processes=2)
+        assert max(abs(u - v) for u, v in zip(x, ref.solve(b))) < 1e-12
+
+        # Rank-deficient up to rounding: the panel pivots go through, rcond() flags it
+        S = M.tolist()
+        S[-1] = [0.1 * u + 0.3 * v for u, v in zip(S[0], S[1])]
+        lu = pm.parallel_lu(S, processes=2, panel=16)
+        assert not lu.singular and lu.rcond() < 1e-10
+    finally:
+        parallel.shutdown()
+
+def test_rotations():
+    print_header("MAT3 AND QUATERNION ROTATIONS")
+    from phimath.math.constants import PI
+    close = lambda u, v, tol=1e-12: all(abs(a - b) < tol for a, b in zip(u, v))
+    axis = pm.vector(1, 2, 2)
+    R = pm.Mat3.from_axis_angle(axis, 0.7)
+    q = pm.Quaternion.from_axis_angle(axis, 0.7)
+    assert abs(R.det() - 1) < 1e-14 and close((R * R.T), pm.Mat3.identity())
+    assert close(q.to_mat3(), R) and close(pm.Quaternion.from_mat3(R), q)
+    v = pm.vector(0.3, -1.0, 2.5)
+    assert close((R * v).data, (q * v).data)
+    # Quarter turn about z takes x to y; composition matches the matrix product
+    z90 = pm.Quaternion.from_axis_angle(pm.vector(0, 0, 1), PI / 2)
+    assert close((z90 * pm.vector(1, 0, 0)).data, (0, 1, 0))
+    assert close((q * z90).to_mat3(), R * z90.to_mat3())
+    pts = [pm.vector(i, 2 * i, -i) for i in range(5)]
+    assert all(close(a.data, (q * b).data) for a, b in zip(q.apply_many(pts), pts))
+    # matrix.rotate applies the same rotation to every column
+    M = pm.matrix.from_function(3, 4, lambda i, j: i + j)
+    assert close(M.rotate(0.7, axis).data, (R.to_matrix() * M).data)
+
+    # Slerp: endpoints, constant speed, shortest arc
+    a, b = pm.Quaternion.identity(), pm.Quaternion.from_axis_angle(axis, 1.2)
+    assert close(a.slerp(b, 0), a) and close(a.slerp(b, 1), b)
+    half_axis, half = a.slerp(b, 0.5).to_axis_angle()
+    assert abs(half - 0.6) < 1e-12 and close(half_axis.data, axis.normalize().data)
+    assert close(a.slerp(-b, 0.5), a.slerp(b, 0.5))
+
+    # Drift from a long chain of products is removed by renormalization
+    step_q, step_R = pm.Quaternion.from_axis_angle(axis, 0.01), pm.Mat3.from_axis_angle(axis, 0.01)
+    acc_q, acc_R = pm.Quaternion(), pm.Mat3()
+    for _ in range(1000):
+        acc_q, acc_R = step_q * acc_q, step_R * acc_R
+    assert abs(acc_q.normalize().norm() - 1) < 1e-15
+    assert close(acc_R.orthonormalize(), acc_q.to_mat3(), 1e-10)
+    try:
+        pm.Mat3.from_axis_angle(pm.vector(0, 0, 0), 1.0)
+        assert False, "zero axis accepted"
+    except ValueError:
+        pass
+    M = pm.Mat3(1, 2, 3, 4, 5, 6, 7, 8, 9)
+    assert M[2, 2] == 9 and M[-1, 0] == 7 and M[0, -1] == 3
+    for idx in [(0, 3), (3, 0), (1, 5), (-4, 0), (0, -4)]:
+        try:
+            M[idx]
+            assert False, f"index {idx} accepted"
+        except IndexError:
+            pass
+
+def test_vector_array():
+    print_header("STRUCTURE-OF-ARRAYS VECTORS")
+    vs = [pm.vector(i, 2 * i - 3, 1 - i) for i in range(6)]
+    ws = [pm.vector(1, -i, 0.5 * i) for i in range(6)]
+    A, B = pm.VectorArray.from_vectors(vs), pm.VectorArray.from_vectors(ws)
+    assert len(A) == 6 and A[2].data == vs[2].data
+    same = lambda va, ref: all(abs(a - b) < 1e-12 for u, v in zip(va, ref) for a, b in zip(u.data, v.data))
+    assert same(A + B, [u + v for u, v in zip(vs, ws)])
+    assert same(A - ws[1], [u - ws[1] for u in vs])
+    assert same(2 * A, [u * 2 for u in vs]) and same(A / 4, [u / 4 for u in vs])
+    assert same(A.cross(B), [u.cross(v) for u, v in zip(vs, ws)])
+    assert list(A.dot(B)) == [u.dot(v) for u, v in zip(vs, ws)]
+    assert all(abs(a - u.magnitude()) < 1e-12 for a, u in zip(A.norm(), vs))
+    assert same(A.normalize(), [u.normalize() for u in vs])
+    assert A.sum().data == array('d', [15, 12, -9]) and A.mean().data == array('d', [2.5, 2, -1.5])
+    assert A.weighted_sum(range(6)).data == array('d', [55, 65, -40])
+
+    # Interleaved layout, slices and index gather/scatter
+    C = pm.VectorArray.from_interleaved(A.interleaved())
+    assert C.xs == A.xs and C.ys == A.ys and C.zs == A.zs
+    assert same(A.gather([4, 0]), [vs[4], vs[0]]) and same(A[1:3], vs[1:3])
+    C.scatter([0, 5], B.gather([1, 2]))
+    C[3] = pm.vector(9, 9, 9)
+    assert same(C, [ws[1], vs[1], vs[2], pm.vector(9, 9, 9), vs[4], ws[2]])
+
+    # In-place updates write straight back into existing vector objects
+    C += A
+    C *= 0.5
+    C.scatter_to(vs)
+    assert vs[3].data == array('d', [6.0, 6.0, 3.5])
+    A.gather_from(ws)
+    assert A.xs == B.xs
+    try:
+        A + pm.VectorArray.zeros(2)
+        assert False, "length mismatch accepted"
+    except ValueError:
+        pass
+
+def test_vector_in_place():
+    print_header("IN-PLACE VECTOR ARITHMETIC")
+    v = pm.vector(1, 2, 3)
+    alias, data = v, v.data
+    v += pm.vector(1, 1, 1)
+    v -= pm.vector(0, 1, 0)
+    v *= 2
+    v.add_scaled(pm.vector(1, 0, -1), 0.5)
+    assert v is alias and v.data is data and list(v.data) == [4.5, 4, 7.5]
+    v /= 0.5
+    assert list(v.zero().data) == [0, 0, 0] and list(v.set(1, 2, 3).data) == [1, 2, 3]
+    # The fast constructor and the binary operators agree with the regular path
+    f = pm.vector.from_floats(1.0, 2.0, 3.0)
+    assert type(f) is pm.vector and f.data == pm.vector(1, 2, 3).data
+    c = f.copy()
+    c += f
+    assert list(f.data) == [1, 2, 3] and list(c.data) == [2, 4, 6]
+    assert (f + c).data == array('d', [3, 6, 9]) and f.cross(c).data == array('d', [0, 0, 0])
+    try:
+        f.extra = 1
+        assert False, "vector accepted a new attribute"
+    except AttributeError:
+        pass
+    # Dual components switch the storage over instead of failing
+    d = pm.vector(1, 0, 0)
+    d.add_scaled(pm.vector(0, 1, 0), pm.Dual(2.0, 1.0))
+    assert d.y.real == 2.0 and d.y.eps == (1.0,)
+
+def test_buffer_interop():
+    print_header("ZERO-COPY BUFFER INTEROP")
+    import struct
+    # A vector and a matrix wrapping parts of one shared block of memory
+    block = bytearray(8 * (3 + 6))
+    v = pm.vector.from_buffer(block)
+    M = pm.matrix.from_buffer(block, 2, 3, offset=24)
+    v += pm.vector(1, 2, 3)
+    M[1, :] = [4, 5, 6]
+    M[0, 2] = -1
+    assert struct.unpack('9d', block) == (1, 2, 3, 0, 0, -1, 4, 5, 6)
+    struct.pack_into('d', block, 8, 7.5)
+    assert v.y == 7.5 and (M * pm.matrix([[1], [1], [1]])).tolist() == [[-1], [15]]
+    # Exports share memory; bytes round-trip through copies
+    mv = M.memoryview()
+    assert mv.shape == (2, 3) and mv.tolist() == M.tolist()
+    mv[0, 0] = 9.0
+    assert M[0, 0] == 9.0 and v.memoryview().tolist() == [1, 7.5, 3]
+    assert pm.matrix.frombytes(M.tobytes(), 2, 3).tolist() == M.tolist()
+    assert pm.vector.frombytes(v.tobytes()).data == array('d', [1, 7.5, 3])
+    assert M.T.tobytes() == M.T.copy().tobytes()
+    c = v.copy()
+    c *= 2
+    assert v.x == 1 and c.x == 2
+    try:
+        M.T.memoryview()
+        assert False, "strided view exported a memoryview"
+    except BufferError:
+        pass
+    try:
+        pm.vector.from_buffer(bytes(24)).zero()
+        assert False, "read-only buffer written"
+    except TypeError:
+        pass
+    face = M.T.__array_interface__
+    assert face['shape'] == (3, 2) and face['strides'] == (8, 24) and face['data'] is M.data
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    a = np.asarray(M.T)
+    a[2, 1] = 0.0
+    assert M[1, 2] == 0.0 and np.asarray(v).tolist() == [1, 7.5, 3]
+
+if __name__ == "__main__":
+    test_flat_storage_and_views()
+    test_bulk_constructors()
+    test_matmul_kernel()
+    test_lu_factorization()
+    test_sparse_formats()
+    test_krylov_solvers()
+    test_banded_solvers()
+    test_symmetric_eigen()
+    test_qr_cholesky_lstsq()
+    test_parallel_kernels()
+    test_rotations()
+    test_vector_array()
+    test_vector_in_place()
+    test_buffer_interop()
+    print("\nALL LINEAR ALGEBRA TESTS PASSED!")
@@ -3,7 +3,9 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
                                                 
 from phimath.linalg.vectors import vector
-from phimath.physics.mechanics import RigidBody, SpringForce, System
+from phimath.physics.mechanics import RigidBody, SpringForce, System, Newtonian
+from phimath.math.trigo import cos
+from phimath.math.constants import PI
 # Replace with your actual import paths
 # from mechanics import Particle, RigidBody, SpringForce, System 
 
@@ -43,6 +45,7 @@ def test_stage_2_collisions():
     p2 = RigidBody(mass=2, position=vector(0, 0, 0), velocity=vector(0, 0, 0), radius=0.5)
     
     sim = System(particles=[p1, p2])
+    v1, v2 = p1.v, p2.v
     
     # Run until they collide
     for _ in range(30):
@@ -54,6 +57,16 @@ def test_stage_2_collisions():
         print("SUCCESS: Perfect velocity swap detected.")
     else:
         print("WARNING: Inefficient momentum transfer.")
+    # Collisions update the velocities in place
+    assert p1.v is v1 and p2.v is v2
+
+    # Unequal masses: 1D elastic formulas, momentum conserved
+    a = RigidBody(mass=1, position=vector(0, 0, 0), velocity=vector(3, 0, 0))
+    b = RigidBody(mass=3, position=vector(0.9, 0, 0), velocity=vector(-1, 0, 0))
+    va = a.v
+    assert a.collide(b) and a.v is va
+    assert abs(a.v.x + 3) < 1e-12 and abs(b.v.x - 1) < 1e-12
+    assert abs(a.mass * a.v.x + b.mass * b.v.x) < 1e-12
 
 def test_stage_3_rope_bridge():
     """Stage 3: Multi-body Chain (Rope simulation)"""
@@ -87,11 +100,121 @@ def test_stage_3_rope_bridge():
     if nodes[2].r.y < 10:
         print("SUCCESS: Rope sagged under tension.")
 
+def test_stage_4_stiffness_matrix():
+    """Stage 4: Sparse stiffness matrix of a spring network"""
+    print_header("STAGE 4: SPARSE STIFFNESS MATRIX")
+    nodes = [RigidBody(mass=1.0, position=vector(i * 1.3, (i % 3) * 0.7, (i % 2) * 0.4)) for i in range(6)]
+    springs = [SpringForce(k=50 + i, rest_length=1.0, particle1=nodes[i], particle2=nodes[i + 1]) for i in range(5)]
+    springs.append(SpringForce(k=20, rest_length=2.0, particle1=nodes[0], particle2=nodes[5]))
+    sim = System(particles=nodes, springs=springs)
+    K = sim.stiffness_matrix()
+    print(K)
+
+    def forces():
+        for p in nodes:
+            p.a = vector(0, 0, 0)
+        for sp in springs:
+            sp.apply()
+        return [c * p.mass for p in nodes for c in (p.a.x, p.a.y, p.a.z)]
+
+    # K is minus the Jacobian of the spring forces with respect to the positions
+    h = 1e-6
+    for col in range(18):
+        p, axis = nodes[col // 3], 'xyz'[col % 3]
+        setattr(p.r, axis, getattr(p.r, axis) + h)
+        f_plus = forces()
+        setattr(p.r, axis, getattr(p.r, axis) - 2 * h)
+        f_minus = forces()
+        setattr(p.r, axis, getattr(p.r, axis) + h)
+        for row in range(18):
+            assert abs(K[row, col] + (f_plus[row] - f_minus[row]) / (2 * h)) < 1e-4
+    # A ring of six nodes touches 6 diagonal and 12 off-diagonal 3x3 blocks
+    assert K.nnz <= 18 * 9
+
+def test_stage_5_modes_and_axes():
+    """Stage 5: Normal modes of a spring chain and principal axes"""
+    print_header("STAGE 5: NORMAL MODES AND PRINCIPAL AXES")
+    # Relaxed chain of 5 unit masses along x: only axial modes are stiff
+    nodes = [RigidBody(mass=1.0, position=vector(float(i), 0, 0)) for i in range(5)]
+    springs = [SpringForce(k=4.0, rest_length=1.0, particle1=nodes[i], particle2=nodes[i + 1]) for i in range(4)]
+    sim = System(particles=nodes, springs=springs)
+    modes = sim.normal_modes()
+    # Free-free chain: omega^2 = 2k (1 - cos(j pi / n)) for j = 0..n-1
+    expected = sorted([2 * 4.0 * (1 - cos(j * PI / 5)) for j in range(5)] + [0.0] * 10)
+    print("omega^2:", [round(v, 6) for v in modes.values])
+    assert all(abs(a - b) < 1e-9 for a, b in zip(modes.values, expected))
+    top = sim.normal_modes(k=2, which='largest')
+    assert all(abs(a - b) < 1e-8 for a, b in zip(top.values, expected[-2:]))
+
+    # Four unequal masses in the xy-plane: the z axis is principal
+    body = System(particles=[RigidBody(mass=m, position=vector(x, y, 0)) for m, x, y in
+                             ((1.0, 1, 0), (2.0, -1, 0), (1.0, 0, 2), (3.0, 0, -1))])
+    moments, axes = body.principal_axes()
+    I = body.inertia_tensor()
+    assert abs(moments[2] - moments[0] - moments[1]) < 1e-9    # perpendicular axis theorem
+    assert abs(abs(axes[2, 2]) - 1.0) < 1e-12
+    for j in range(3):
+        col = axes.col(j)
+        assert max(abs(v) for v in (I * col - col * moments[j]).data) < 1e-9
+
+def test_stage_6_in_place_integration():
+    """Stage 6: the integrator updates particle state in place"""
+    print_header("STAGE 6: ALLOCATION-FREE INTEGRATION")
+    start = vector(0, 5, 0)
+    nodes = [RigidBody(mass=1.0, position=start, is_static=True),
+             RigidBody(mass=1.0, position=vector(1.5, 5, 0), velocity=vector(0, 1, 0))]
+    sim = Newtonian(particles=nodes, springs=[SpringForce(k=10, rest_length=1.0, particle1=nodes[0],
+                                                          particle2=nodes[1], damping=0.2)])
+    state = [(id(p.r), id(p.v), id(p.a)) for p in nodes]
+    before = sim.get_positions()
+    for integrator in ('euler', 'verlet'):
+        for _ in range(20):
+            sim.update(0.01, integrator=integrator)
+    assert [(id(p.r), id(p.v), id(p.a)) for p in nodes] == state
+    # Particles own their vectors; snapshots do not move with the simulation
+    assert start.data.tolist() == [0, 5, 0] and before[1].data.tolist() == [1.5, 5, 0]
+    print(f"Bob: {nodes[1].r}")
+    assert nodes[1].r.x < 1.5 and nodes[0].r.data.tolist() == [0, 5, 0]
+
+def test_stage_7_force_evaluations():
+    """Stage 7: symplectic updates evaluate forces once per Verlet sub-step"""
+    print_header("STAGE 7: FORCE EVALUATIONS PER STEP")
+    def build(damping):
+        nodes = [RigidBody(mass=1.0, position=vector(0, 5, 0), is_static=True),
+                 RigidBody(mass=2.0, position=vector(1.5, 5, 0), velocity=vector(0, 1, 0))]
+        sim = System(particles=nodes, springs=[SpringForce(k=10, rest_length=1.0, particle1=nodes[0],
+                                                           particle2=nodes[1], damping=damping)])
+        calls = [0]
+        evaluate = sim.compute_accelerations
+        def counted(gravity):
+            calls[0] += 1
+            evaluate(gravity)
+        sim.compute_accelerations = counted
+        return sim, nodes[1], calls
+
+    sim, bob, calls = build(0.0)
+    sim.update(0.04, sub_steps=4, integrator='verlet')
+    print(f"verlet, 4 sub-steps: {calls[0]} force evaluations")
+    assert calls[0] == 5    # one to start, then one per sub-step
+    # Reusing the closing kick's forces changes nothing for position-only forces
+    ref, ref_bob, _ = build(0.0)
+    for _ in range(4):
+        ref.update(0.01, sub_steps=1, integrator='verlet')
+    assert bob.r.data == ref_bob.r.data and bob.v.data == ref_bob.v.data
+    # Damping depends on velocity, so every kick re-evaluates
+    sim, bob, calls = build(0.5)
+    sim.update(0.04, sub_steps=4, integrator='verlet')
+    assert calls[0] == 8
+
 if __name__ == "__main__":
     try:
         test_stage_1_oscillation()
         test_stage_2_collisions()
         test_stage_3_rope_bridge()
+        test_stage_4_stiffness_matrix()
+        test_stage_5_modes_and_axes()
+        test_stage_6_in_place_integration()
+        test_stage_7_force_evaluations()
         print("\nALL MECHANICS TESTS PASSED!")
     except Exception as e:
         print(f"\nTEST FAILED: {e}")
\ No newline at end of file
@@ -0,0 +1,252 @@
+import sys
+import os
+import math
+import tempfile
+from array import array
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import phimath as pm
+from phimath.control.numeric import MAX_ITERATIONS
+
+def print_header(title):
+    print(f"\n{'='*20} {title} {'='*20}")
+
+def oscillator(t, y, dydt):
+    # Simple harmonic oscillator: y = (position, velocity)
+    dydt[0] = y[1]
+    dydt[1] = -y[0]
+
+def oscillator_columns(t, Y, dY):
+    # Batched oscillator: Y[0] and Y[1] hold every member's position and velocity
+    pos, vel = Y
+    dY[0][:] = vel
+    dpos = dY[1]
+    for m in range(len(pos)):
+        dpos[m] = -pos[m]
+
+def test_array_systems():
+    print_header("ARRAY-BACKED ODE SYSTEMS")
+    y0 = array('d', [1.0, 0.0])
+    h, n = 0.01, 628
+    for method, tol in (("euler", 5e-2), ("rk2", 1e-3), ("rk4", 1e-8)):
+        traj = pm.ode_solver(oscillator, 0.0, y0, h, n, method=method)
+        t_end = traj.t[-1]
+        err = abs(traj[-1][0] - math.cos(t_end))
+        print(f"{method:6s} | shape {traj.shape()} | error {err:.2e}")
+        assert traj.shape() == (n, 2)
+        assert err < tol
+    assert list(y0) == [1.0, 0.0]
+
+    # Adaptive rkf45 records only accepted steps; each matches (cos t, -sin t)
+    traj = pm.rkf45(oscillator, 0.0, y0, h, n)
+    worst = max(max(abs(traj[i][0] - math.cos(t)), abs(traj[i][1] + math.sin(t))) for i, t in enumerate(traj.t))
+    print(f"rkf45  | shape {traj.shape()} | t_end {traj.t[-1]:.2f} | max error {worst:.2e}")
+    assert 0 < len(traj) <= n and traj.shape()[1] == 2
+    assert all(b > a for a, b in zip(traj.t, traj.t[1:]))
+    assert worst < 1e-4
+    assert list(y0) == [1.0, 0.0]
+
+    # Scalar problems keep returning an interpolating function
+    f = pm.rk4(lambda t, y: y, 0.0, 1.0, 0.01, 100)
+    assert abs(f(1.0) - math.e) < 1e-6
+
+def test_dopri5_dense_output():
+    print_header("DORMAND-PRINCE 5(4)")
+    sol = pm.dopri5(oscillator, 0.0, [1.0, 0.0], 20.0, rtol=1e-9, atol=1e-12)
+    print(f"{sol} | accepted {sol.n_accepted} | rejected {sol.n_rejected}")
+    assert sol.t[-1] == 20.0
+    assert abs(sol[-1][0] - math.cos(20.0)) < 1e-8
+    # Dense output between steps keeps the method's accuracy
+    worst = max(abs(sol(0.05 * i)[0] - math.cos(0.05 * i)) for i in range(400))
+    print(f"Dense output max error: {worst:.2e}")
+    assert worst < 1e-8
+
+    # rk4 needs far more evaluations for the same accuracy
+    rk4_traj = pm.rk4(oscillator, 0.0, array('d', [1.0, 0.0]), 0.01, 2000)
+    assert sol.nfev < 4 * len(rk4_traj)
+
+    # Scalar problems evaluate to floats
+    decay = pm.dopri5(lambda t, y: -2 * y, 0.0, 1.0, 3.0)
+    assert abs(decay(1.5) - math.exp(-3.0)) < 1e-6
+
+    # An empty interval returns the initial point without stepping
+    for solve in (pm.dopri5, pm.bdf):
+        point = solve(oscillator, 1.0, [1.0, 0.0], 1.0)
+        assert list(point.t) == [1.0] and list(point[-1]) == [1.0, 0.0]
+
+def test_bdf_stiff_robertson():
+    print_header("BDF ON A STIFF CHEMICAL SYSTEM")
+    # Robertson's problem: rate constants span nine orders of magnitude
+    def robertson(t, y, dydt):
+        dydt[0] = -0.04 * y[0] + 1e4 * y[1] * y[2]
+        dydt[1] = 0.04 * y[0] - 1e4 * y[1] * y[2] - 3e7 * y[1] ** 2
+        dydt[2] = 3e7 * y[1] ** 2
+
+    sol = pm.bdf(robertson, 0.0, [1.0, 0.0, 0.0], 40.0, rtol=1e-4, atol=1e-8)
+    y_end = sol[-1]
+    print(f"{sol} | y(40) = {list(y_end)}")
+    assert abs(y_end[0] - 0.7158) < 1e-3
+    assert abs(y_end[2] - 0.2842) < 1e-3
+    assert abs(sum(y_end) - 1.0) < 1e-8
+    # The Jacobian is reused across many steps
+    assert sol.njev < sol.n_accepted / 5
+    assert sol.n_accepted < 200
+
+def test_symplectic_kepler_energy():
+    print_header("SYMPLECTIC KEPLER ORBIT")
+    def grad_T(p, out):
+        out[0] = p[0]
+        out[1] = p[1]
+    def grad_V(q, out):
+        r3 = (q[0] ** 2 + q[1] ** 2) ** 1.5
+        out[0] = q[0] / r3
+        out[1] = q[1] / r3
+    def energy(row):
+        return 0.5 * (row[2] ** 2 + row[3] ** 2) - 1 / math.hypot(row[0], row[1])
+
+    e = 0.5
+    q0, p0 = [1 - e, 0.0], [0.0, math.sqrt((1 + e) / (1 - e))]
+    h0 = energy(q0 + p0)
+    # 50 orbits with a large step: energy error stays bounded, no drift
+    drifts = {}
+    for method in ("verlet", "yoshida4", "yoshida6"):
+        traj = pm.symplectic(grad_T, grad_V, q0, p0, 0.05, 6283, method=method)
+        drifts[method] = max(abs(energy(traj[i]) - h0) for i in range(0, len(traj), 25))
+        print(f"{method:9s} | max energy error {drifts[method]:.2e}")
+    assert drifts["verlet"] < 1e-2
+    assert drifts["yoshida6"] < drifts["yoshida4"] < drifts["verlet"]
+
+def test_streaming_rk4():
+    print_header("STREAMING RK4")
+    y0 = array('d', [1.0, 0.0])
+    batch = pm.rk4(oscillator, 0.0, y0, 0.01, 1000)
+
+    # Decimated stream matches the batch solver sample for sample
+    samples = list(pm.rk4_stream(oscillator, 0.0, y0, 0.01, 1000, every=100))
+    assert len(samples) == 10
+    for k, (t, y) in enumerate(samples):
+        row = batch[(k + 1) * 100 - 1]
+        assert t == batch.t[(k + 1) * 100 - 1]
+        assert list(y) == list(row)
+
+    # An unbounded stream stopped by the callback at the first sign change
+    stop = lambda t, y: y[0] < 0
+    t_cross, _ = list(pm.rk4_stream(oscillator, 0.0, y0, 0.001, callback=stop))[-1]
+    print(f"First zero crossing near t = {t_cross:.3f}")
+    assert abs(t_cross - pm.HALF_PI) < 1e-3
+
+def test_events_projectile():
+    print_header("EVENT DETECTION")
+    g = 9.81
+    def projectile(t, y, dydt):
+        dydt[0] = y[2]
+        dydt[1] = y[3]
+        dydt[2] = 0.0
+        dydt[3] = -g
+
+    ground = pm.Event(lambda t, y: y[1], terminal=True, direction=-1)
+    apex = pm.Event(lambda t, y: y[3])
+    # t_end is only an upper bound: the ground event ends the solve
+    sol = pm.dopri5(projectile, 0.0, [0.0, 0.0, 10.0, 20.0], 1e3, events=[ground, apex])
+    print(f"Apex at t = {sol.t_events[1][0]:.6f}, impact at t = {sol.t[-1]:.6f}")
+    assert abs(sol.t[-1] - 40 / g) < 1e-10
+    assert abs(sol.t_events[1][0] - 20 / g) < 1e-10
+    assert abs(sol[-1][0] - 400 / g) < 1e-9
+    assert sol.n_accepted < 10
+
+def test_ensemble_lockstep():
+    print_header("ENSEMBLE INTEGRATION")
+    Y0 = [(math.cos(0.1 * m), math.sin(0.1 * m)) for m in range(40)]
+    ens = pm.ensemble(oscillator_columns, 0.0, Y0, 0.01, 500, every=100)
+    print(ens)
+    assert len(ens) == 5 and ens.members == 40
+    for m in (0, 17, 39):
+        single = pm.rk4(oscillator, 0.0, array('d', Y0[m]), 0.01, 500)
+        assert all(abs(a - b) < 1e-12 for a, b in zip(ens.final(m), single[-1]))
+
+    # Chunked process-pool runs reproduce the serial layout exactly
+    pooled = pm.ensemble(oscillator_columns, 0.0, Y0, 0.01, 500, every=100, processes=2, chunk_size=15)
+    assert list(pooled.y) == list(ens.y)
+
+def test_checkpoint_resume():
+    print_header("TRAJECTORY FILES AND CHECKPOINTS")
+    class Crash(Exception):
+        pass
+    calls = [0]
+    def flaky(t, y, dydt):
+        calls[0] += 1
+        if calls[0] == 700:
+            raise Crash
+        oscillator(t, y, dydt)
+
+    ref = pm.dopri5(oscillator, 0.0, [1.0, 0.0], 50.0, rtol=1e-8, dense_output=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'run.trj')
+        ck = pm.Checkpoint(os.path.join(tmp, 'run.ck'), every=25)
+        with pm.TrajectoryFile(path, 2, 'w', capacity=8) as sink:
+            try:
+                pm.dopri5(flaky, 0.0, [1.0, 0.0], 50.0, rtol=1e-8, sink=sink, checkpoint=ck)
+            except Crash:
+                print(f"Interrupted after {len(sink)} rows")
+        # Resuming from the last checkpoint reproduces the uninterrupted run exactly
+        with pm.TrajectoryFile(path, 2, 'a') as sink:
+            sol = pm.dopri5(oscillator, 0.0, [1.0, 0.0], 50.0, rtol=1e-8, sink=sink, checkpoint=ck)
+        assert sol.nfev == ref.nfev and sol.n_accepted == ref.n_accepted
+        with pm.TrajectoryFile(path) as run:
+            assert len(run) == len(ref)
+            assert list(run.t) == list(ref.t)
+            assert list(run.to_trajectory().y) == list(ref.y)
+
+        path = os.path.join(tmp, 'rk4.trj')
+        with pm.TrajectoryFile(path, 2, 'w') as sink:
+            pm.solve_to_file(oscillator, 0.0, [1.0, 0.0], 0.01, 1000, sink, every=10)
+        batch = pm.rk4(oscillator, 0.0, array('d', [1.0, 0.0]), 0.01, 1000)
+        with pm.TrajectoryFile(path) as run:
+            assert len(run) == 100
+            assert list(run[-1]) == list(batch[-1])
+            assert list(run.column(1)) == list(batch.column(1)[9::10])
+
+        # An empty file closes with zero capacity and must still grow on append
+        path = os.path.join(tmp, 'empty.trj')
+        pm.TrajectoryFile(path, 2, 'w').close()
+        with pm.TrajectoryFile(path, 2, 'a') as sink:
+            sink.append(0.5, [1.0, 2.0])
+        with pm.TrajectoryFile(path) as run:
+            assert len(run) == 1 and list(run.t) == [0.5] and list(run[0]) == [1.0, 2.0]
+
+        # max_steps budgets each call: a resumed run gets a fresh allowance
+        ck = pm.Checkpoint(os.path.join(tmp, 'budget.ck'), every=25)
+        try:
+            pm.dopri5(oscillator, 0.0, [1.0, 0.0], 50.0, rtol=1e-8, checkpoint=ck, max_steps=400)
+            assert False, "step limit ignored"
+        except RuntimeError:
+            pass
+        sol = pm.dopri5(oscillator, 0.0, [1.0, 0.0], 50.0, rtol=1e-8, checkpoint=ck, max_steps=400)
+        assert sol.n_accepted == ref.n_accepted and sol.t[-1] == 50.0
+        # Checkpointed runs have no default step limit
+        ck = pm.Checkpoint(os.path.join(tmp, 'long.ck'), every=5000)
+        sol = pm.dopri5(oscillator, 0.0, [1.0, 0.0], 900.0, rtol=1e-8, checkpoint=ck)
+        assert sol.n_accepted > MAX_ITERATIONS
+
+        # A terminal event is checkpointed with the derivative at the event,
+        # and resuming a finished run does not continue past it
+        ck = pm.Checkpoint(os.path.join(tmp, 'event.ck'), every=1000)
+        crossing = pm.Event(lambda t, y: y[0], terminal=True)
+        sol = pm.dopri5(oscillator, 0.0, [1.0, 0.0], 10.0, rtol=1e-10, events=crossing, checkpoint=ck)
+        state = ck.load()
+        assert state['terminated'] and state['t'] == sol.t[-1]
+        assert abs(state['t'] - math.pi / 2) < 1e-9
+        assert state['k1'] == [state['y'][1], -state['y'][0]]
+        again = pm.dopri5(oscillator, 0.0, [1.0, 0.0], 10.0, rtol=1e-10, events=crossing, checkpoint=ck)
+        assert list(again.t) == [sol.t[-1]] and list(again.t_events[0]) == list(sol.t_events[0])
+
+if __name__ == "__main__":
+    test_array_systems()
+    test_dopri5_dense_output()
+    test_bdf_stiff_robertson()
+    test_symplectic_kepler_energy()
+    test_streaming_rk4()
+    test_events_projectile()
+    test_ensemble_lockstep()
+    test_checkpoint_resume()
+    print("\nALL ODE TESTS PASSED!")
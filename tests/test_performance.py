@@ -2,6 +2,7 @@ import sys
 import os
 import time
 import tracemalloc
+import random
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import phimath as pm
@@ -53,5 +54,168 @@ def run_performance_test():
     else:
         print("RESULT: WARNING (Exceeded 1 MB Target)")
 
+def _legacy_mul(a, b):
+    # The list-of-lists product matrix.__mul__ used before flat storage,
+    # including its per-element shape() calls
+    shape = lambda d: (len(d), len(d[0]) if d else 0)
+    return [
+        [sum(a[i][k] * b[k][j] for k in range(shape(a)[1])) for j in range(shape(b)[1])]
+        for i in range(shape(a)[0])
+    ]
+
+# CI runs this script on every push, so the larger sizes and the 1..N-core
+# scaling run are opt-in:
+# PHIMATH_LARGE_BENCHMARKS=1 PHIMATH_PARALLEL_BENCHMARKS=1 python tests/test_performance.py
+LARGE_SIZES = (500, 1000)
+
+def run_matmul_benchmark(sizes=(3, 10, 50, 100, 200), legacy_limit=200, strassen=128, large=False):
+    if large:
+        sizes = tuple(sizes) + LARGE_SIZES
+    print("========================================")
+    print("   MATRIX MULTIPLICATION BENCHMARK      ")
+    print("========================================")
+    print(f"{'n':>6} {'legacy':>12} {'blocked':>12} {'strassen':>12} {'speedup':>9}")
+    random.seed(0)
+    for n in sizes:
+        A = pm.matrix.from_function(n, n, lambda i, j: random.random())
+        B = pm.matrix.from_function(n, n, lambda i, j: random.random())
+        out = pm.matrix.zeros(n, n)
+        reps = max(1, 20000 // (n * n))
+
+        start = time.perf_counter()
+        for _ in range(reps):
+            A.matmul(B, out=out)
+        blocked = (time.perf_counter() - start) / reps
+
+        fast = None
+        if n >= strassen:
+            start = time.perf_counter()
+            A.matmul(B, strassen=strassen)
+            fast = time.perf_counter() - start
+
+        legacy = None
+        if n <= legacy_limit:
+            a, b = A.tolist(), B.tolist()
+            start = time.perf_counter()
+            for _ in range(reps):
+                _legacy_mul(a, b)
+            legacy = (time.perf_counter() - start) / reps
+
+        fmt = lambda t: f"{t * 1e3:10.3f}ms" if t is not None else f"{'-':>12}"
+        speedup = f"{legacy / blocked:8.1f}x" if legacy is not None else f"{'-':>9}"
+        print(f"{n:>6} {fmt(legacy)} {fmt(blocked)} {fmt(fast)} {speedup}")
+
+def run_parallel_benchmark(n=400, max_processes=None):
+    print("========================================")
+    print("   PARALLEL DENSE KERNELS (1..N CORES)  ")
+    print("========================================")
+    from phimath.linalg import parallel
+    max_processes = max_processes or os.cpu_count() or 1
+    random.seed(0)
+    A = pm.matrix.from_function(n, n, lambda i, j: random.random())
+    B = pm.matrix.from_function(n, n, lambda i, j: random.random())
+    print(f"n = {n}, {os.cpu_count()} cores available")
+    print(f"{'procs':>6} {'matmul':>12} {'speedup':>9} {'lu':>12} {'speedup':>9}")
+    base = None
+    for p in range(1, max_processes + 1):
+        # Warm the persistent pool so start-up is not timed
+        parallel.parallel_matmul(A.block(0, 200, 0, 200), B.block(0, 200, 0, 200), processes=p)
+        start = time.perf_counter()
+        parallel.parallel_matmul(A, B, processes=p)
+        t_mul = time.perf_counter() - start
+        start = time.perf_counter()
+        parallel.parallel_lu(A, processes=p)
+        t_lu = time.perf_counter() - start
+        if base is None:
+            base = (t_mul, t_lu)
+        print(f"{p:>6} {t_mul * 1e3:10.1f}ms {base[0] / t_mul:8.2f}x {t_lu * 1e3:10.1f}ms {base[1] / t_lu:8.2f}x")
+    parallel.shutdown()
+
+def _legacy_rotate(m, angle, axis):
+    # The path matrix.rotate took before Mat3: a general 3x3 matrix built
+    # per call and multiplied through the generic matrix product
+    c, s = pm.cos(angle), pm.sin(angle)
+    t = 1 - c
+    axis = axis.normalize()
+    x, y, z = axis.x, axis.y, axis.z
+    R = pm.matrix([
+        [t*x*x + c,   t*x*y - s*z, t*x*z + s*y],
+        [t*x*y + s*z, t*y*y + c,   t*y*z - s*x],
+        [t*x*z - s*y, t*y*z + s*x, t*z*z + c]
+    ])
+    return R * m
+
+def run_rotation_benchmark(n=10000):
+    print("========================================")
+    print("   3-D ROTATION BENCHMARK               ")
+    print("========================================")
+    axis = pm.vector(0, 1, 0)
+    angle = 0.01
+    timings = []
+
+    start = time.perf_counter()
+    m = pm.matrix.identity(3)
+    for _ in range(n):
+        m = _legacy_rotate(m, angle, axis)
+    timings.append(("general matrix", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    m = pm.matrix.identity(3)
+    for _ in range(n):
+        m = m.rotate(angle, axis)
+    timings.append(("matrix.rotate", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    step = pm.Mat3.from_axis_angle(axis, angle)
+    R = pm.Mat3()
+    for _ in range(n):
+        R = step * R
+    timings.append(("Mat3 compose", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    step = pm.Quaternion.from_axis_angle(axis, angle)
+    q = pm.Quaternion()
+    for _ in range(n):
+        q = step * q
+    timings.append(("Quaternion", time.perf_counter() - start))
+
+    base = timings[0][1]
+    print(f"{n} cumulative rotations")
+    for name, t in timings:
+        print(f"{name:>16} {t * 1e3:10.2f}ms {base / t:8.1f}x")
+    drift = max(abs(a - b) for a, b in zip(R.orthonormalize(), q.normalize().to_mat3()))
+    print(f"Mat3 vs Quaternion after renormalization: {drift:.2e}")
+
+def run_vector_array_benchmark(n=200000):
+    print("========================================")
+    print("   VECTOR OBJECTS VS VECTORARRAY        ")
+    print("========================================")
+    random.seed(0)
+    vs = [pm.vector(random.random(), random.random(), random.random()) for _ in range(n)]
+    ws = [pm.vector(random.random(), random.random(), random.random()) for _ in range(n)]
+    A, B = pm.VectorArray.from_vectors(vs), pm.VectorArray.from_vectors(ws)
+    cases = [
+        ("add", lambda: [u + v for u, v in zip(vs, ws)], lambda: A + B),
+        ("scale", lambda: [u * 0.5 for u in vs], lambda: A * 0.5),
+        ("dot", lambda: [u.dot(v) for u, v in zip(vs, ws)], lambda: A.dot(B)),
+        ("cross", lambda: [u.cross(v) for u, v in zip(vs, ws)], lambda: A.cross(B)),
+        ("normalize", lambda: [u.normalize() for u in vs], lambda: A.normalize()),
+    ]
+    print(f"{n} vectors")
+    print(f"{'op':>10} {'vector':>12} {'VectorArray':>12} {'speedup':>9}")
+    for name, objects, batch in cases:
+        start = time.perf_counter()
+        objects()
+        t_obj = time.perf_counter() - start
+        start = time.perf_counter()
+        batch()
+        t_arr = time.perf_counter() - start
+        print(f"{name:>10} {t_obj * 1e3:10.1f}ms {t_arr * 1e3:10.1f}ms {t_obj / t_arr:8.1f}x")
+
 if __name__ == "__main__":
-    run_performance_test()
\ No newline at end of file
+    run_performance_test()
+    run_rotation_benchmark()
+    run_vector_array_benchmark()
+    run_matmul_benchmark(large=bool(os.environ.get("PHIMATH_LARGE_BENCHMARKS")))
+    if os.environ.get("PHIMATH_PARALLEL_BENCHMARKS"):
+        run_parallel_benchmark()
\ No newline at end of file
@@ -0,0 +1,68 @@
+import sys
+import os
+import math
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import phimath as pm
+
+def print_header(title):
+    print(f"\n{'='*20} {title} {'='*20}")
+
+def test_scalar_roots():
+    print_header("SCALAR ROOTS")
+    r = pm.brent(lambda x: x**3 - 2*x - 5, 2, 3, xtol=1e-14)
+    print(r)
+    assert abs(r.root - 2.0945514815423265) < 1e-14
+    assert r.nfev == r.iterations + 1
+
+    # Without df the slope comes from a dual-number evaluation
+    r = pm.newton(lambda x: pm.cos(x) - x, 1.0)
+    assert abs(r.root - 0.7390851332151607) < 1e-12
+    assert r.njev == 0
+
+    # atan overshoots wildly from x = 5; the bracket keeps Newton safe
+    r = pm.newton(math.atan, 5.0, df=lambda x: 1 / (1 + x*x), bracket=(-1, 6))
+    assert abs(r.root) < 1e-12
+    # Without x0 the bracket midpoint is the start; one of the two is required
+    assert abs(pm.newton(math.atan, df=lambda x: 1 / (1 + x*x), bracket=(-1, 6)).root) < 1e-12
+    try:
+        pm.newton(math.atan)
+        assert False, "newton ran without x0 or bracket"
+    except ValueError:
+        pass
+
+def test_batch_kepler():
+    print_header("BATCH ROOTS (KEPLER'S EQUATION)")
+    e = 0.7
+    mean = [0.1 * k for k in range(1, 30)]
+    def kepler(E):
+        return [E[m] - e * math.sin(E[m]) - mean[m] for m in range(len(mean))]
+    r = pm.batch_roots(kepler, [0.0] * len(mean), [math.pi] * len(mean), xtol=1e-14)
+    print(f"{len(mean)} problems in {r.iterations} iterations, {r.nfev} batch evaluations")
+    assert r.nfev == r.iterations + 2
+    for m, E in enumerate(r.root):
+        single = pm.brent(lambda x: x - e * math.sin(x) - mean[m], 0.0, math.pi, xtol=1e-14).root
+        assert abs(E - single) < 1e-12
+
+def test_nonlinear_systems():
+    print_header("NONLINEAR SYSTEMS")
+    F = lambda x: [x[0]**2 + x[1]**2 - 4, pm.exp(x[0]) + x[1] - 1]
+    newton = pm.newton_system(F, [1.0, -1.0])
+    gauss = pm.newton_system(F, [1.0, -1.0], linear='gauss')
+    broyden = pm.broyden(F, [1.0, -1.0], tol=1e-11)
+    print(newton, broyden)
+    for r in (newton, gauss, broyden):
+        assert all(abs(v) < 1e-8 for v in r.value)
+        assert abs(r.root[0] - 1.0041687384746) < 1e-8
+    assert broyden.njev == 1
+
+    # Vector in, vector out
+    r = pm.newton_system(lambda v: v - pm.vector(1, 2, 3) * (0.1 * v.x) - pm.vector(1, 1, 1), pm.vector(0, 0, 0))
+    assert isinstance(r.root, pm.vector)
+    assert abs(r.root.x - 1 / 0.9) < 1e-12
+
+if __name__ == "__main__":
+    test_scalar_roots()
+    test_batch_kepler()
+    test_nonlinear_systems()
+    print("\nALL ROOT-FINDING TESTS PASSED!")